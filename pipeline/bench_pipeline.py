@@ -0,0 +1,487 @@
+import argparse
+import html
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+import head_to_head
+import leaderboard_views
+import model_stats
+import search_index
+import sync_aa_data
+import sync_swe_data
+import sync_tau_data
+from content_index import ContentIndex, alias_key
+from content_writer import ContentWriter
+from json_stream import iter_file_array
+from score_history import record_history
+from scraper import html_rows
+
+CURRENT_SCRIPT_PATH = Path(__file__).resolve()
+AGENT_DIR = CURRENT_SCRIPT_PATH.parent
+BASELINE_FILE = AGENT_DIR / "bench_baseline.json"
+
+# 100000 is opt-in (--sizes 1000 10000 100000): every stage scales with the
+# model files it writes and rereads, so its repeats take tens of minutes, too
+# slow for a check run before every change
+DEFAULT_SIZES = [1000, 10000]
+# The head-to-head matrix grows with models squared, 10 bytes per pair, so
+# larger sizes skip it: 100000 models would be a 100 GB rows.bin
+HEAD_TO_HEAD_MAX_MODELS = 10000
+# Each size runs this many times and keeps the fastest time of every stage
+DEFAULT_REPEAT = 3
+# A stage regresses when its time or peak memory grows past this ratio
+TOLERANCE = 1.25
+# Stages faster than this are too noisy to compare
+MIN_SECONDS = 0.05
+
+# Quick benchai.py commands, run on the real content tree, have to finish
+# within STARTUP_BUDGET seconds without importing any of HEAVY_MODULES
+STARTUP_COMMANDS = [["--help"], ["validate"], ["diff"], ["sync", "all", "--help"]]
+STARTUP_BUDGET = 0.5
+HEAVY_MODULES = {"requests", "playwright", "bs4", "numpy"}
+
+# Share of synthetic leaderboard rows whose name is a variant the resolver has
+# to match fuzzily, and of rows naming models that don't exist at all
+VARIANT_SHARE = 0.1
+UNKNOWN_SHARE = 0.05
+# Real leaderboards list a few hundred models, whatever the size of the AA payload
+LEADERBOARD_ROWS = 2000
+
+
+# Synthetic sources
+
+SYLLABLES = (
+    "ka lo mi ra ven tor qui zen dal mor sel bri nox pha ly cor dri fen gal hex".split()
+)
+VARIANTS = ["Pro", "Mini", "Flash", "Large", "Instruct"]
+
+
+def model_name(i):
+    # A unique, made-up model name, e.g. "Lomi 2.1 Flash"
+    family = ""
+    n = i + len(SYLLABLES)
+    while n:
+        n, digit = divmod(n, len(SYLLABLES))
+        family += SYLLABLES[digit]
+    return f"{family.title()} {i % 4 + 1}.{i % 10} {VARIANTS[i % len(VARIANTS)]}"
+
+
+def synthetic_payload(size, seed=0):
+    # An AA API body with `size` models spread over size / 20 publishers
+    rng = random.Random(seed)
+    publishers = [
+        {"name": f"Lab {i}", "slug": f"lab-{i}", "website": f"https://lab-{i}.example"}
+        for i in range(max(1, size // 20))
+    ]
+    fractions = {
+        bench_id
+        for bench_id in sync_aa_data.BENCHMARK_METADATA
+        if not bench_id.startswith("artificial_analysis")
+    }
+
+    models = []
+    for i in range(size):
+        creator = publishers[i % len(publishers)]
+        evaluations = {}
+        for bench_id in sync_aa_data.BENCHMARK_METADATA:
+            if rng.random() < 0.7:
+                score = rng.random() if bench_id in fractions else rng.uniform(0, 80)
+                evaluations[bench_id] = round(score, 4)
+            else:
+                evaluations[bench_id] = None
+
+        models.append(
+            {
+                "id": f"model-{i}",
+                "name": model_name(i),
+                "slug": alias_key(model_name(i)),
+                "release_date": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                "model_creator": creator,
+                "evaluations": evaluations,
+            }
+        )
+
+    return json.dumps({"data": models}).encode("utf-8")
+
+
+def leaderboard_names(size, seed):
+    # (model name, publisher name) rows of a scraped leaderboard
+    rng = random.Random(seed)
+    rows = []
+    for i in range(min(size, LEADERBOARD_ROWS)):
+        model = rng.randrange(size)
+        publisher = f"Lab {model % max(1, size // 20)}"
+        roll = rng.random()
+        if roll < UNKNOWN_SHARE:
+            name = f"Unreleased {model_name(size + i)}"
+        elif roll < UNKNOWN_SHARE + VARIANT_SHARE:
+            family, version, variant = model_name(model).split()
+            name = f"{variant} {family}-{version} (2025-10-01) preview"
+        else:
+            name = model_name(model)
+        rows.append((name, publisher))
+    return rows
+
+
+def swe_html(size, seed=1):
+    rows = [
+        f'<tr data-tags="Org:{html.escape(publisher)},Open Scaffold">'
+        f"<td>{rank + 1}</td><td>{html.escape(name)}</td>"
+        f"<td>{round(80 - rank * 60 / size, 2)}</td><td>2025-12-01</td></tr>"
+        for rank, (name, publisher) in enumerate(leaderboard_names(size, seed))
+    ]
+    return (
+        "<html><body><table><thead><tr><th>#</th><th>Model</th><th>% Resolved</th>"
+        "<th>Date</th></tr></thead><tbody>" + "".join(rows) + "</tbody></table>"
+        "</body></html>"
+    )
+
+
+def tau_html(size, seed=2):
+    rows = [
+        f"<tr><td>{rank + 1}</td><td>{html.escape(name)}</td><td>{publisher}</td>"
+        f"<td>tool-calling</td><td>{round(90 - rank * 70 / size, 1)}%</td></tr>"
+        for rank, (name, publisher) in enumerate(leaderboard_names(size, seed))
+    ]
+    return (
+        "<html><body><table><tbody>" + "".join(rows) + "</tbody></table></body></html>"
+    )
+
+
+# Measurement
+
+
+class FileCounter:
+    # Counts files opened under `root` through an audit hook, which sees both
+    # open() and os.open() without touching the code being measured
+    active = None
+
+    def __init__(self, root):
+        self.root = str(root)
+        self.read = set()
+        self.written = set()
+
+    @staticmethod
+    def hook(event, args):
+        counter = FileCounter.active
+        if counter is None or event != "open":
+            return
+        path, mode, flags = args
+        if not isinstance(path, (str, bytes, os.PathLike)):
+            return
+        path = os.fsdecode(path)
+        if not path.startswith(counter.root):
+            return
+
+        if mode is not None:
+            writing = any(c in mode for c in "wax+")
+        else:
+            writing = bool(flags & (os.O_WRONLY | os.O_RDWR | os.O_CREAT))
+        (counter.written if writing else counter.read).add(path)
+
+
+sys.addaudithook(FileCounter.hook)
+
+
+@contextmanager
+def measure(results, stage, root):
+    counter = FileCounter(root)
+    FileCounter.active = counter
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        FileCounter.active = None
+
+        results[stage] = {
+            "seconds": round(elapsed, 4),
+            "peak_mb": round(peak / 2**20, 2),
+            "files_read": len(counter.read),
+            "files_written": len(counter.written),
+        }
+
+
+@contextmanager
+def content_tree(root):
+    # Point every sync module at a throwaway content tree
+    content = Path(root) / "src" / "content"
+    paths = {
+        "MODELS_DIR": content / "models",
+        "BENCH_DIR": content / "benchmarks",
+        "PUB_DIR": content / "publishers",
+    }
+    for path in paths.values():
+        path.mkdir(parents=True, exist_ok=True)
+
+    patches = [
+        (module, name, path)
+        for name, path in paths.items()
+        for module in (sync_aa_data, sync_swe_data, sync_tau_data)
+    ]
+    patches.append((model_stats, "MODEL_STATS_FILE", content / "model-stats.json"))
+    patches.append((search_index, "MODEL_INDEX_FILE", content / "model-index.json"))
+    patches.append((leaderboard_views, "LEADERBOARDS_DIR", content / "leaderboards"))
+    patches.append(
+        (head_to_head, "HEAD_TO_HEAD_DIR", Path(root) / "public" / "head-to-head")
+    )
+
+    saved = [(module, name, getattr(module, name)) for module, name, _ in patches]
+    for module, name, path in patches:
+        setattr(module, name, path)
+    try:
+        yield paths
+    finally:
+        for module, name, value in saved:
+            setattr(module, name, value)
+
+
+def quiet():
+    return open(os.devnull, "w")
+
+
+def run_size(size):
+    payload = synthetic_payload(size)
+    swe_page = swe_html(size)
+    tau_page = tau_html(size)
+
+    results = {}
+    root = Path(tempfile.mkdtemp(prefix="bench-pipeline-"))
+    try:
+        with content_tree(root) as paths, quiet() as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                with measure(results, "aa_decode", root):
+                    llmData = json.loads(payload)["data"]
+
+                payload_path = root / "payload.json"
+                payload_path.write_bytes(payload)
+                with measure(results, "aa_stream_decode", root):
+                    for _ in iter_file_array(payload_path, "data"):
+                        pass
+
+                with measure(results, "aa_build", root):
+                    index = ContentIndex(
+                        paths["MODELS_DIR"], paths["PUB_DIR"], paths["BENCH_DIR"]
+                    )
+                    writer = ContentWriter()
+                    state = sync_aa_data.build_llm_data(llmData, index, writer)
+                    writer.commit()
+
+                with measure(results, "index_load", root):
+                    index = ContentIndex(
+                        paths["MODELS_DIR"], paths["PUB_DIR"], paths["BENCH_DIR"]
+                    )
+
+                with measure(results, "aa_rebuild_incremental", root):
+                    writer = ContentWriter()
+                    sync_aa_data.build_llm_data(llmData, index, writer, previous=state)
+                    writer.commit()
+
+                with measure(results, "swe_parse", root):
+                    swe_rows = html_rows(swe_page)
+
+                with measure(results, "swe_build", root):
+                    sync_swe_data.build_swe_data(
+                        swe_rows, index, writer, "swe_verified"
+                    )
+
+                with measure(results, "tau_parse", root):
+                    tau_rows = html_rows(tau_page)
+
+                with measure(results, "tau_build", root):
+                    sync_tau_data.build_tau_data(tau_rows, index, writer)
+
+                with measure(results, "model_stats", root):
+                    stats = model_stats.build_model_stats(index, writer)
+
+                with measure(results, "search_index", root):
+                    search_index.build_search_index(index, stats, writer)
+
+                with measure(results, "leaderboard_views", root):
+                    leaderboard_views.build_leaderboard_views(index, writer)
+
+                with measure(results, "commit", root):
+                    writer.commit()
+
+                # The rows are computed while they are written, so the stage
+                # commits them itself
+                if size <= HEAD_TO_HEAD_MAX_MODELS:
+                    with measure(results, "head_to_head", root):
+                        rows_writer = ContentWriter()
+                        head_to_head.build_head_to_head(index, rows_writer)
+                        rows_writer.commit()
+
+                with measure(results, "history", root):
+                    record_history(
+                        index, day="2026-01-01", history_dir=root / "history"
+                    )
+            finally:
+                sys.stdout = stdout
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return results
+
+
+def run_startup(repeat):
+    # {command: (best seconds, heavy modules it imported)}
+    results = {}
+    for command in STARTUP_COMMANDS:
+        cli = [sys.executable, str(AGENT_DIR / "benchai.py"), *command]
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(cli, cwd=AGENT_DIR, capture_output=True, check=True)
+            times.append(time.perf_counter() - start)
+
+        traced = subprocess.run(
+            [cli[0], "-X", "importtime", *cli[1:]],
+            cwd=AGENT_DIR,
+            capture_output=True,
+            text=True,
+        )
+        imported = {
+            line.rpartition("|")[2].strip().split(".")[0]
+            for line in traced.stderr.splitlines()
+            if line.startswith("import time:")
+        }
+        results[" ".join(command)] = (min(times), sorted(imported & HEAVY_MODULES))
+    return results
+
+
+def print_startup(results):
+    print(f"\n{'startup':<24}{'seconds':>10}  heavy imports")
+    for command, (seconds, heavy) in results.items():
+        print(f"{command:<24}{seconds:>10.3f}  {', '.join(heavy) or '-'}")
+
+
+def startup_problems(results):
+    problems = []
+    for command, (seconds, heavy) in results.items():
+        if seconds > STARTUP_BUDGET:
+            problems.append(
+                f"benchai.py {command} took {seconds:.2f}s, "
+                f"over the {STARTUP_BUDGET}s budget"
+            )
+        if heavy:
+            problems.append(f"benchai.py {command} imported {', '.join(heavy)}")
+    return problems
+
+
+# Reporting
+
+
+def best_of(runs):
+    # Fastest time of each stage, the other metrics don't vary between runs
+    return {
+        stage: {
+            **result,
+            "seconds": min(run[stage]["seconds"] for run in runs),
+        }
+        for stage, result in runs[0].items()
+    }
+
+
+def compare(current, baseline, tolerance):
+    # Returns the (size, stage, metric, ratio) pairs that got worse
+    regressions = []
+    for size, stages in current.items():
+        for stage, result in stages.items():
+            base = baseline.get(size, {}).get(stage)
+            if not base:
+                continue
+            for metric in ("seconds", "peak_mb"):
+                if metric == "seconds" and base[metric] < MIN_SECONDS:
+                    continue
+                if base[metric] and result[metric] / base[metric] > tolerance:
+                    regressions.append(
+                        (size, stage, metric, result[metric] / base[metric])
+                    )
+            for metric in ("files_read", "files_written"):
+                if result[metric] > base[metric]:
+                    regressions.append(
+                        (size, stage, metric, result[metric] / max(base[metric], 1))
+                    )
+    return regressions
+
+
+def print_report(current, baseline):
+    for size, stages in current.items():
+        print(f"\n{size} models")
+        print(
+            f"{'stage':<24}{'seconds':>10}{'vs base':>9}{'peak MB':>10}{'read':>8}{'written':>9}"
+        )
+        for stage, result in stages.items():
+            base = baseline.get(size, {}).get(stage)
+            ratio = ""
+            if base and base["seconds"]:
+                ratio = f"{result['seconds'] / base['seconds']:.2f}x"
+            print(
+                f"{stage:<24}{result['seconds']:>10.3f}{ratio:>9}{result['peak_mb']:>10.1f}"
+                f"{result['files_read']:>8}{result['files_written']:>9}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Model counts to generate, e.g. 1000 10000 100000",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store this run as the new baseline",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    current = {}
+    for size in args.sizes:
+        print(f"Running {size} models...")
+        runs = [run_size(size) for _ in range(args.repeat)]
+        current[str(size)] = best_of(runs)
+
+    try:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        baseline = {}
+
+    print_report(current, baseline)
+    startup = run_startup(args.repeat)
+    print_startup(startup)
+
+    if args.save_baseline:
+        args.baseline.write_text(
+            json.dumps({**baseline, **current}, indent=4) + "\n", encoding="utf-8"
+        )
+        print(f"\nBaseline saved to {args.baseline}")
+        sys.exit(0)
+
+    regressions = compare(current, baseline, args.tolerance)
+    for size, stage, metric, ratio in regressions:
+        print(
+            f"Regression: {stage} {metric} at {size} models is {ratio:.2f}x the baseline"
+        )
+    problems = startup_problems(startup)
+    for problem in problems:
+        print(f"Startup: {problem}")
+    sys.exit(1 if regressions or problems else 0)
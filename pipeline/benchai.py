@@ -0,0 +1,278 @@
+import argparse
+import sys
+
+# One entry point for the pipeline, e.g.
+#
+#   uv run benchai.py sync all --incremental
+#   uv run benchai.py validate
+#   uv run benchai.py diff --benchmark gpqa
+#
+# Only argparse is imported up front. Each command imports what it needs when
+# it runs, so requests, playwright, bs4 and numpy are loaded by the syncs alone
+# and quick commands stay within the startup budget of bench_pipeline.py.
+
+
+def sync_aa(args):
+    from sync_aa_data import sync_llm_data
+
+    options = {"url": args.url} if args.url else {}
+    sync_llm_data(
+        replay=args.replay,
+        force=args.force,
+        incremental=args.incremental,
+        stream=args.stream,
+        prometheus=args.prometheus,
+        **options,
+    )
+
+
+def sync_swe(args):
+    from sync_swe_data import sync_swe_data
+
+    options = {"base_url": args.base_url} if args.base_url else {}
+    sync_swe_data(prometheus=args.prometheus, **options)
+
+
+def sync_tau(args):
+    from sync_tau_data import sync_tau_data
+
+    options = {"url": args.url} if args.url else {}
+    sync_tau_data(prometheus=args.prometheus, **options)
+
+
+def sync_everything(args):
+    from sync_all import sync_all
+
+    sync_all(
+        replay=args.replay,
+        force=args.force,
+        incremental=args.incremental,
+        stream=args.stream,
+        prometheus=args.prometheus,
+    )
+
+
+def validate(args):
+    from content_validator import CONTENT_DIR, format_diagnostic, validate_tree
+
+    diagnostics, checked = validate_tree(args.content_dir or CONTENT_DIR, args.workers)
+    for d in diagnostics:
+        print(format_diagnostic(d))
+
+    errors = sum(d.severity == "error" for d in diagnostics)
+    print(
+        f"Checked {checked} files: {errors} errors, "
+        f"{len(diagnostics) - errors} warnings"
+    )
+    return 1 if errors else 0
+
+
+def stats(args):
+    from content_index import ContentIndex
+    from content_validator import check_writes
+    from content_writer import ContentWriter
+    from leaderboard_views import build_leaderboard_views
+    from model_stats import BENCH_DIR, MODELS_DIR, PUB_DIR, build_model_stats
+    from search_index import build_search_index
+
+    index = ContentIndex(MODELS_DIR, PUB_DIR, BENCH_DIR)
+    writer = ContentWriter()
+    model_stats = build_model_stats(index, writer)
+    build_search_index(index, model_stats, writer)
+    build_leaderboard_views(index, writer)
+    check_writes(writer, index)
+    writer.commit()
+
+
+def head_to_head(args):
+    # rows.bin grows with models squared, so it isn't committed with the
+    # content; the site build generates it from the content tree
+    from content_index import ContentIndex
+    from content_writer import ContentWriter
+    from head_to_head import build_head_to_head
+    from model_stats import BENCH_DIR, MODELS_DIR, PUB_DIR
+
+    index = ContentIndex(MODELS_DIR, PUB_DIR, BENCH_DIR)
+    writer = ContentWriter()
+    build_head_to_head(index, writer)
+    writer.commit()
+
+
+def diff(args):
+    # What changed on the leaderboards between two dates of the score history.
+    # Without --since, each benchmark's last recorded update is shown.
+    from score_history import HISTORY_DIR, ScoreHistory
+
+    if args.benchmark:
+        paths = [HISTORY_DIR / f"{args.benchmark}.jsonl"]
+    else:
+        paths = sorted(HISTORY_DIR.glob("*.jsonl"))
+
+    for path in paths:
+        history = ScoreHistory(path)
+        since = args.since
+        if since is None:
+            dates = history.dates()
+            since = dates[-2] if len(dates) > 1 else None
+
+        changes = history.diff(since, args.until)
+        if not changes:
+            continue
+
+        print(f"{path.stem} ({since or 'start'} -> {args.until or 'latest'})")
+        for ref, old, new in changes:
+            if old is None:
+                print(f"  + {new:>8}  {ref}")
+            elif new is None:
+                print(f"  - {old:>8}  {ref}")
+            else:
+                print(f"  ~ {old:>8} -> {new:<8}  {ref}")
+
+
+def trending(args):
+    from trending import update_trending
+
+    options = {"half_life_days": args.half_life} if args.half_life else {}
+    update_trending(args.logs, full=args.full, use_mmap=args.mmap, **options)
+
+
+def fonts(args):
+    from font_subset import update_fonts
+
+    update_fonts(force=args.force)
+
+
+def logos(args):
+    from logo_sprite import update_logos
+
+    update_logos()
+
+
+def add_sync_options(parser):
+    parser.add_argument(
+        "--prometheus", help="Also write the run metrics to this Prometheus textfile"
+    )
+
+
+def add_aa_options(parser):
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Use the cached Artificial Analysis payload instead of the API",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild AA content even if the payload has already been synced",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only process AA models and benchmarks that changed since the last run",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Decode the AA payload model by model to keep memory flat",
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="benchai")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync = commands.add_parser("sync", help="Sync content from a source")
+    sources = sync.add_subparsers(dest="source", required=True)
+
+    aa = sources.add_parser("aa", help="Artificial Analysis API")
+    add_aa_options(aa)
+    # e.g. aa/models.json served by fixture_server.py
+    aa.add_argument("--url", help="Models endpoint to fetch")
+    add_sync_options(aa)
+    aa.set_defaults(handler=sync_aa)
+
+    swe = sources.add_parser("swe", help="SWE-bench leaderboards")
+    # e.g. the swe/ folder served by fixture_server.py
+    swe.add_argument("--base-url", help="Site hosting the leaderboard pages")
+    add_sync_options(swe)
+    swe.set_defaults(handler=sync_swe)
+
+    tau = sources.add_parser("tau", help="τ-bench leaderboard")
+    # e.g. a page served by fixture_server.py
+    tau.add_argument("--url", help="Leaderboard page to scrape")
+    add_sync_options(tau)
+    tau.set_defaults(handler=sync_tau)
+
+    everything = sources.add_parser("all", help="Every source in one run")
+    add_aa_options(everything)
+    add_sync_options(everything)
+    everything.set_defaults(handler=sync_everything)
+
+    check = commands.add_parser(
+        "validate", help="Check the content tree against the site schemas"
+    )
+    check.add_argument("--content-dir", type=str)
+    check.add_argument(
+        "--workers", type=int, help="Worker processes (default: one per CPU)"
+    )
+    check.set_defaults(handler=validate)
+
+    rebuild = commands.add_parser(
+        "stats", help="Rebuild model-stats.json, the search index and leaderboard views"
+    )
+    rebuild.set_defaults(handler=stats)
+
+    matrix = commands.add_parser(
+        "head-to-head", help="Build public/head-to-head for the Model Arena"
+    )
+    matrix.set_defaults(handler=head_to_head)
+
+    changes = commands.add_parser("diff", help="Leaderboard changes between dates")
+    changes.add_argument("--benchmark", help="Only this benchmark id")
+    changes.add_argument("--since", help="Compare from this date (YYYY-MM-DD)")
+    changes.add_argument("--until", help="Compare up to this date (default: latest)")
+    changes.set_defaults(handler=diff)
+
+    views = commands.add_parser(
+        "trending", help="Fold access logs into the benchmarks' trending views"
+    )
+    views.add_argument("logs", nargs="+", help="Access logs, plain or .gz")
+    views.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the saved offsets and totals and recount from the start",
+    )
+    views.add_argument("--mmap", action="store_true", help="Memory-map plain logs")
+    views.add_argument(
+        "--half-life",
+        type=float,
+        help="Days after which a view counts half (default 7)",
+    )
+    views.set_defaults(handler=trending)
+
+    subsets = commands.add_parser(
+        "fonts", help="Subset public/fonts to the characters the site uses"
+    )
+    subsets.add_argument(
+        "--force",
+        action="store_true",
+        help="Rescan every file and subset every font again",
+    )
+    subsets.set_defaults(handler=fonts)
+
+    sprite = commands.add_parser(
+        "logos",
+        help="Minify public/logos, build the logo sprite and point publishers at it",
+    )
+    sprite.set_defaults(handler=logos)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
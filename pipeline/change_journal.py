@@ -0,0 +1,73 @@
+import hashlib
+import json
+from pathlib import Path
+
+from content_writer import atomic_write
+
+
+def fingerprint(data):
+    # Short stable digest of any JSON-serializable value
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+def load_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def save_state(path, state):
+    atomic_write(Path(path), json.dumps(state, separators=(",", ":")).encode("utf-8"))
+
+
+def diff_states(old, new):
+    # Compare the per-model state of two runs. Models are keyed by their AA id,
+    # so a changed modelRef under the same id is reported as a rename.
+    old_models = (old or {}).get("models", {})
+    new_models = new.get("models", {})
+
+    journal = {"added": [], "removed": [], "renamed": [], "score_changed": []}
+
+    for model_id, entry in new_models.items():
+        previous = old_models.get(model_id)
+        if previous is None:
+            journal["added"].append(entry["ref"])
+            continue
+
+        if previous["ref"] != entry["ref"] or previous["name"] != entry["name"]:
+            journal["renamed"].append(
+                {
+                    "from": previous["ref"],
+                    "to": entry["ref"],
+                    "fromName": previous["name"],
+                    "toName": entry["name"],
+                }
+            )
+
+        old_scores = previous.get("scores", {})
+        new_scores = entry.get("scores", {})
+        for bench_id in sorted(old_scores.keys() | new_scores.keys()):
+            before = old_scores.get(bench_id)
+            after = new_scores.get(bench_id)
+            if before != after:
+                journal["score_changed"].append(
+                    {
+                        "modelRef": entry["ref"],
+                        "benchmark": bench_id,
+                        "from": before,
+                        "to": after,
+                    }
+                )
+
+    for model_id, entry in old_models.items():
+        if model_id not in new_models:
+            journal["removed"].append(entry["ref"])
+
+    return journal
+
+
+def summarize(journal):
+    return ", ".join(f"{len(items)} {kind}" for kind, items in journal.items())
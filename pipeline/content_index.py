@@ -0,0 +1,118 @@
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+
+from content_records import Benchmark, Model, Publisher, load_record
+
+
+def alias_key(text):
+    # Same normalisation as `slugify` in the sync scripts
+    if not text:
+        return ""
+    text = re.sub(r"[^a-z0-9]+", "-", text.lower())
+    return text.strip("-").strip(".")
+
+
+def read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def read_record(cls, path):
+    # An empty, unreadable or malformed file is left out with a warning, like
+    # a missing one, so the sync writes it afresh instead of stopping
+    try:
+        return load_record(cls, read_json(path), path)
+    except ValueError as e:
+        print(f"Warning: skipping {e}")
+        return None
+
+
+class ContentIndex:
+    # Loads models, publishers and benchmarks once and keeps every lookup in a dict,
+    # so resolving a row never walks the content tree again.
+
+    def __init__(self, models_dir, pub_dir, bench_dir):
+        self.models_dir = Path(models_dir)
+        self.pub_dir = Path(pub_dir)
+        self.bench_dir = Path(bench_dir)
+
+        self.models = {}  # "publisher/slug" -> Model
+        self.publishers = {}  # publisher slug -> Publisher
+        self.benchmarks = {}  # benchmark id -> Benchmark
+
+        self._refs_by_slug = defaultdict(list)
+        self._refs_by_alias = {}
+
+        self._load()
+
+    def _load(self):
+        for path in sorted(self.pub_dir.glob("*.json")):
+            record = read_record(Publisher, path)
+            if record is not None:
+                self.publishers[path.stem] = record
+
+        for path in sorted(self.models_dir.glob("**/*.json")):
+            ref = path.relative_to(self.models_dir).with_suffix("").as_posix()
+            record = read_record(Model, path)
+            if record is not None:
+                self.add_model(ref, record)
+
+        for path in sorted(self.bench_dir.glob("*.json")):
+            record = read_record(Benchmark, path)
+            if record is not None:
+                self.benchmarks[path.stem] = record
+
+    # Keep the index in step with what a sync is about to write
+
+    def add_model(self, ref, data):
+        slug = ref.rpartition("/")[2]
+        if ref not in self.models:
+            self._refs_by_slug[slug].append(ref)
+        self.models[ref] = data
+
+        # The first model claiming an alias keeps it
+        for alias in (slug, alias_key(data.get("name"))):
+            if alias:
+                self._refs_by_alias.setdefault(alias, ref)
+
+    def add_publisher(self, slug, data):
+        self.publishers[slug] = data
+
+    def add_benchmark(self, bench_id, data):
+        self.benchmarks[bench_id] = data
+
+    # Lookups
+
+    def has_model(self, ref):
+        return ref in self.models
+
+    def get_model(self, ref):
+        return self.models.get(ref)
+
+    def get_publisher(self, slug):
+        return self.publishers.get(slug)
+
+    def get_benchmark(self, bench_id):
+        return self.benchmarks.get(bench_id)
+
+    def resolve(self, name, publisher=None):
+        # Resolve a slug or display name to a modelRef, or None when unknown
+        key = alias_key(name)
+        if not key:
+            return None
+
+        if publisher:
+            ref = f"{publisher}/{key}"
+            if ref in self.models:
+                return ref
+
+        refs = self._refs_by_slug.get(key)
+        if refs:
+            return refs[0]
+
+        return self._refs_by_alias.get(key)
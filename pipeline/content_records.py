@@ -0,0 +1,185 @@
+from numbers import Real
+
+from content_writer import encode_json
+
+# Typed records for the content collections, with the fields and order of
+# src/content/config.ts. Records answer record["field"] and record.get() like
+# the JSON dicts they replace, so score and stats code reads either one.
+
+
+def _check(record, field, value, types, optional=False):
+    if value is None and optional:
+        return value
+    if not isinstance(value, types) or isinstance(value, bool) and bool not in types:
+        expected = " or ".join(t.__name__ for t in types)
+        raise ValueError(
+            f"{type(record).__name__}.{field} must be {expected}, "
+            f"not {type(value).__name__}"
+        )
+    return value
+
+
+class Record:
+    __slots__ = ()
+    # Fields written even when None, e.g. the nullable fullName
+    ALWAYS = ()
+
+    def __getitem__(self, field):
+        try:
+            value = getattr(self, field)
+        except AttributeError:
+            value = None
+        if value is None and field not in self.ALWAYS:
+            raise KeyError(field)
+        return value
+
+    def get(self, field, default=None):
+        value = getattr(self, field, None)
+        if value is None and field not in self.ALWAYS:
+            return default
+        return value
+
+    def __contains__(self, field):
+        return self.get(field) is not None or field in self.ALWAYS
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{f: data.get(f) for f in cls.__slots__ if f in data})
+
+    def to_dict(self):
+        return {
+            f: getattr(self, f)
+            for f in self.__slots__
+            if getattr(self, f) is not None or f in self.ALWAYS
+        }
+
+    def to_json(self):
+        return encode_json(self.to_dict())
+
+
+class SnapshotEntry(Record):
+    __slots__ = ("modelRef", "score")
+
+    def __init__(self, modelRef, score):
+        self.modelRef = _check(self, "modelRef", modelRef, (str,))
+        self.score = _check(self, "score", score, (Real,))
+
+    def to_dict(self):
+        return {"modelRef": self.modelRef, "score": self.score}
+
+
+class Publisher(Record):
+    __slots__ = ("name", "color", "logo", "website")
+
+    def __init__(self, name, color, logo, website=None):
+        self.name = _check(self, "name", name, (str,))
+        self.color = _check(self, "color", color, (str,))
+        self.logo = _check(self, "logo", logo, (str,))
+        self.website = _check(self, "website", website, (str,), optional=True)
+
+
+class Model(Record):
+    # `website` is not in the schema but has always been written by the AA sync
+    __slots__ = (
+        "name",
+        "publisher",
+        "releaseDate",
+        "params",
+        "license",
+        "website",
+        "discussionId",
+    )
+
+    def __init__(
+        self,
+        name,
+        publisher,
+        releaseDate=None,
+        params=None,
+        license=None,
+        website=None,
+        discussionId=None,
+    ):
+        self.name = _check(self, "name", name, (str,))
+        self.publisher = _check(self, "publisher", publisher, (str,))
+        self.releaseDate = _check(self, "releaseDate", releaseDate, (str,), True)
+        self.params = _check(self, "params", params, (str,), True)
+        self.license = _check(self, "license", license, (str,), True)
+        self.website = _check(self, "website", website, (str,), True)
+        self.discussionId = _check(self, "discussionId", discussionId, (str,), True)
+
+
+class Benchmark(Record):
+    __slots__ = (
+        "name",
+        "fullName",
+        "publisher",
+        "description",
+        "link",
+        "tags",
+        "lastUpdated",
+        "metrics",
+        "isFromAA",
+        "AALink",
+        "trending",
+        "snapshot",
+    )
+    ALWAYS = ("fullName",)
+
+    def __init__(
+        self,
+        name,
+        fullName,
+        publisher,
+        description,
+        link,
+        tags,
+        lastUpdated,
+        metrics,
+        isFromAA=None,
+        AALink=None,
+        trending=None,
+        snapshot=(),
+    ):
+        self.name = _check(self, "name", name, (str,))
+        self.fullName = _check(self, "fullName", fullName, (str,), True)
+        self.publisher = _check(self, "publisher", publisher, (str,))
+        self.description = _check(self, "description", description, (str,))
+        self.link = _check(self, "link", link, (str,))
+        self.tags = _check(self, "tags", tags, (list,))
+        for tag in tags:
+            _check(self, "tags", tag, (str,))
+        self.lastUpdated = _check(self, "lastUpdated", lastUpdated, (str,))
+        self.metrics = _check(self, "metrics", metrics, (dict,))
+        _check(self, "metrics.unit", metrics.get("unit"), (str,))
+        self.isFromAA = _check(self, "isFromAA", isFromAA, (bool,), True)
+        self.AALink = _check(self, "AALink", AALink, (str,), True)
+        self.trending = _check(self, "trending", trending, (dict,), True)
+        self.snapshot = [
+            entry if isinstance(entry, SnapshotEntry) else SnapshotEntry(**entry)
+            for entry in snapshot
+        ]
+
+    def to_dict(self):
+        data = super().to_dict()
+        data["snapshot"] = [entry.to_dict() for entry in self.snapshot]
+        return data
+
+
+def load_record(cls, data, path=None):
+    # Decode a content file's JSON, naming the file when it doesn't fit the schema
+    try:
+        return cls.from_dict(data)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{path or cls.__name__}: {e}") from None
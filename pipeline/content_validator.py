@@ -0,0 +1,485 @@
+import json
+import math
+import os
+import re
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from difflib import get_close_matches
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlsplit
+
+CURRENT_SCRIPT_PATH = Path(__file__).resolve()
+AGENT_DIR = CURRENT_SCRIPT_PATH.parent
+PROJECT_ROOT = AGENT_DIR.parent
+CONTENT_DIR = PROJECT_ROOT / "src" / "content"
+PUBLIC_DIR = PROJECT_ROOT / "public"
+
+# Files per worker task; small trees are checked in-process
+CHUNK_SIZE = 200
+
+# `where` is the JSON path inside the file, e.g. "snapshot[3].modelRef"
+Diagnostic = namedtuple("Diagnostic", "path where message severity")
+
+
+def format_diagnostic(d):
+    where = f" {d.where}:" if d.where else ""
+    return f"{d.severity}: {d.path}:{where} {d.message}"
+
+
+class ContentValidationError(ValueError):
+    def __init__(self, diagnostics):
+        self.diagnostics = diagnostics
+        super().__init__("\n".join(format_diagnostic(d) for d in diagnostics))
+
+
+# Schema nodes, mirroring the zod builders used in src/content/config.ts. Each
+# check(value, where, report) reports problems and returns the references it
+# found as [(collection, id, where)].
+
+
+class Schema:
+    optional = False
+    nullable = False
+
+    def check(self, value, where, report):
+        if value is None:
+            if not self.nullable:
+                report(where, f"expected {self.expected}, received null")
+            return []
+        return self.check_value(value, where, report)
+
+
+class String(Schema):
+    expected = "string"
+
+    def check_value(self, value, where, report):
+        if not isinstance(value, str):
+            report(where, f"expected string, received {json_type(value)}")
+        return []
+
+
+class Url(String):
+    def check_value(self, value, where, report):
+        if not isinstance(value, str):
+            return super().check_value(value, where, report)
+        parts = urlsplit(value)
+        if not parts.scheme or not (parts.netloc or parts.path):
+            report(where, f"invalid url {value!r}")
+        return []
+
+
+class Number(Schema):
+    expected = "number"
+
+    def check_value(self, value, where, report):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            report(where, f"expected number, received {json_type(value)}")
+        elif not math.isfinite(value):
+            # Python writes NaN/Infinity, which JSON.parse rejects outright
+            report(where, f"{json.dumps(value)} is not valid JSON")
+        return []
+
+
+class Boolean(Schema):
+    expected = "boolean"
+
+    def check_value(self, value, where, report):
+        if not isinstance(value, bool):
+            report(where, f"expected boolean, received {json_type(value)}")
+        return []
+
+
+class Literal(Schema):
+    def __init__(self, literal):
+        self.literal = literal
+        self.expected = json.dumps(literal)
+
+    def check_value(self, value, where, report):
+        if value != self.literal or isinstance(value, bool):
+            report(where, f"expected {self.expected}, received {json.dumps(value)}")
+        return []
+
+
+class Reference(String):
+    # reference('models') -> an entry id of that collection
+    def __init__(self, collection):
+        self.collection = collection
+
+    def check_value(self, value, where, report):
+        if not isinstance(value, str):
+            return super().check_value(value, where, report)
+        return [(self.collection, value, where)]
+
+
+@lru_cache
+def _sprite_refs(id_map, mtime_ns):
+    with open(id_map, "r", encoding="utf-8") as f:
+        return frozenset(json.load(f).values())
+
+
+def logo_exists(logo, public_dir=PUBLIC_DIR):
+    # "/logos/openai.svg" is a file under public/, "/logos/sprite.svg#openai"
+    # an entry of that sprite, listed in the id map next to it (sprite.json)
+    if urlsplit(logo).scheme:
+        return True
+    path, _, fragment = logo.partition("#")
+    file = Path(public_dir) / path.lstrip("/")
+    if not file.is_file():
+        return False
+    if not fragment:
+        return True
+    id_map = file.with_suffix(".json")
+    try:
+        return logo in _sprite_refs(id_map, id_map.stat().st_mtime_ns)
+    except (OSError, ValueError):
+        return False
+
+
+class Logo(String):
+    # The site shows a broken image for a missing logo, the content itself is
+    # fine, so that's a warning
+    def check_value(self, value, where, report):
+        if not isinstance(value, str):
+            return super().check_value(value, where, report)
+        if not logo_exists(value):
+            report(where, f"logo {value!r} not found in public/", "warning")
+        return []
+
+
+class Array(Schema):
+    expected = "array"
+
+    def __init__(self, item):
+        self.item = item
+
+    def check_value(self, value, where, report):
+        if not isinstance(value, list):
+            report(where, f"expected array, received {json_type(value)}")
+            return []
+        refs = []
+        for i, item in enumerate(value):
+            refs.extend(self.item.check(item, f"{where}[{i}]", report))
+        return refs
+
+
+class Object(Schema):
+    expected = "object"
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def check_value(self, value, where, report):
+        if not isinstance(value, dict):
+            report(where, f"expected object, received {json_type(value)}")
+            return []
+
+        refs = []
+        for key, schema in self.fields.items():
+            at = f"{where}.{key}" if where else key
+            if key not in value:
+                if not schema.optional:
+                    report(at, "required")
+                continue
+            refs.extend(schema.check(value[key], at, report))
+
+        # zod drops unknown keys without a word, so a misspelt optional key
+        # silently falls back to its default. Flag the likely typos.
+        for key in value:
+            if key in self.fields:
+                continue
+            close = get_close_matches(key, self.fields, n=1, cutoff=0.8)
+            if close and close[0] not in value:
+                at = f"{where}.{key}" if where else key
+                report(at, f"unknown key, did you mean {close[0]!r}?", "warning")
+        return refs
+
+
+class Entries(Schema):
+    # The file() loader: one JSON object holding every entry by id
+    expected = "object"
+
+    def __init__(self, value):
+        self.value = value
+
+    def check_value(self, value, where, report):
+        if not isinstance(value, dict):
+            report(where, f"expected object, received {json_type(value)}")
+            return []
+        refs = []
+        for key, item in value.items():
+            refs.extend(self.value.check(item, f"{where}[{key!r}]", report))
+        return refs
+
+
+def optional(schema):
+    # .optional() and .default(): the key may be missing, but not null
+    schema.optional = True
+    return schema
+
+
+def nullable(schema):
+    schema.nullable = True
+    return schema
+
+
+def json_type(value):
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    return "object"
+
+
+# Keep in step with src/content/config.ts
+
+BENCHMARK_SCHEMA = Object(
+    {
+        "name": String(),
+        "fullName": nullable(String()),
+        "publisher": String(),
+        "description": String(),
+        "link": Url(),
+        "tags": Array(String()),
+        "lastUpdated": String(),
+        "metrics": Object({"unit": String(), "isBetterHigher": optional(Boolean())}),
+        "snapshot": Array(Object({"modelRef": Reference("models"), "score": Number()})),
+        "trending": optional(
+            Object({"views": optional(Number()), "initialWeight": optional(Number())})
+        ),
+        "isFromAA": optional(Boolean()),
+        "AALink": optional(String()),
+    }
+)
+
+MODEL_SCHEMA = Object(
+    {
+        "name": String(),
+        "publisher": Reference("publishers"),
+        "releaseDate": optional(String()),
+        "params": optional(String()),
+        "license": optional(String()),
+        "discussionId": optional(String()),
+    }
+)
+
+PUBLISHER_SCHEMA = Object(
+    {
+        "name": String(),
+        "color": String(),
+        "logo": Logo(),
+        "website": optional(String()),
+    }
+)
+
+MODEL_STATS_SCHEMA = Object(
+    {
+        "totalBenchmarks": Number(),
+        "averageScore": Number(),
+        "rank": nullable(Number()),
+        "radarData": Array(
+            Object({"subject": String(), "A": Number(), "fullMark": Literal(100)})
+        ),
+        "participatedBenchmarks": Array(
+            Object(
+                {
+                    "id": String(),
+                    "name": String(),
+                    "score": Number(),
+                    "tags": Array(String()),
+                    "rank": Number(),
+                }
+            )
+        ),
+    }
+)
+
+LEADERBOARD_SCHEMA = Object(
+    {
+        "inputs": String(),
+        "rows": Array(
+            Object(
+                {
+                    "rank": Number(),
+                    "modelId": String(),
+                    "model": String(),
+                    "score": Number(),
+                    "releaseDate": optional(String()),
+                    "publisherInfo": nullable(
+                        Object({"name": String(), "color": String(), "logo": String()})
+                    ),
+                }
+            )
+        ),
+    }
+)
+
+# collection -> (directory or file under src/content, glob, schema)
+COLLECTIONS = {
+    "benchmarks": ("benchmarks", "*.json", BENCHMARK_SCHEMA),
+    "models": ("models", "**/*.json", MODEL_SCHEMA),
+    "publishers": ("publishers", "*.json", PUBLISHER_SCHEMA),
+    "model-stats": ("model-stats.json", None, Entries(MODEL_STATS_SCHEMA)),
+    "leaderboards": ("leaderboards", "*.json", LEADERBOARD_SCHEMA),
+}
+
+
+def entry_id(relative):
+    # The id Astro's glob loader gives a file: every path segment slugified
+    # like github-slugger does, without the extension
+    parts = Path(relative).with_suffix("").parts
+    return "/".join(
+        re.sub(r"[^\w\- ]", "", part.lower()).replace(" ", "-") for part in parts
+    )
+
+
+def check_data(collection, data, path):
+    # -> (diagnostics, references) of one entry's JSON data
+    diagnostics = []
+
+    def report(where, message, severity="error"):
+        diagnostics.append(Diagnostic(str(path), where, message, severity))
+
+    refs = COLLECTIONS[collection][2].check(data, "", report)
+    return diagnostics, [(str(path), *ref) for ref in refs]
+
+
+def check_file(collection, path, root):
+    # -> (entry id, diagnostics, references)
+    relative = Path(path).relative_to(root)
+    try:
+        with open(path, "rb") as f:
+            data = json.loads(f.read())
+    except (OSError, ValueError) as e:
+        return None, [Diagnostic(str(path), "", f"unreadable: {e}", "error")], []
+
+    diagnostics, refs = check_data(collection, data, path)
+    ref = relative.with_suffix("").as_posix()
+    if entry_id(relative) != ref:
+        diagnostics.append(
+            Diagnostic(
+                str(path),
+                "",
+                f"Astro names this entry {entry_id(relative)!r}, so references "
+                f"to {ref!r} won't resolve",
+                "error",
+            )
+        )
+    return entry_id(relative), diagnostics, refs
+
+
+def _check_chunk(chunk):
+    results = []
+    for collection, path, root in chunk:
+        results.append((collection, *check_file(collection, path, root)))
+    return results
+
+
+def check_references(refs, ids):
+    # refs: [(path, collection, id, where)], ids: {collection: set of ids}
+    diagnostics = []
+    for path, collection, ref, where in refs:
+        if ref not in ids.get(collection, ()):
+            known = get_close_matches(ref, ids.get(collection, ()), n=1)
+            hint = f", did you mean {known[0]!r}?" if known else ""
+            diagnostics.append(
+                Diagnostic(
+                    path, where, f"{ref!r} is not in {collection}{hint}", "error"
+                )
+            )
+    return diagnostics
+
+
+def validate_tree(content_dir=CONTENT_DIR, workers=None):
+    # Check every entry of every collection, files spread over a process pool
+    content_dir = Path(content_dir)
+    jobs = []
+    for collection, (location, pattern, _) in COLLECTIONS.items():
+        if pattern is None:
+            continue
+        base = content_dir / location
+        jobs.extend((collection, path, base) for path in sorted(base.glob(pattern)))
+
+    chunks = [jobs[i : i + CHUNK_SIZE] for i in range(0, len(jobs), CHUNK_SIZE)]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            results = [r for chunk in pool.map(_check_chunk, chunks) for r in chunk]
+    else:
+        results = [r for chunk in chunks for r in _check_chunk(chunk)]
+
+    diagnostics, refs = [], []
+    ids = {collection: set() for collection in COLLECTIONS}
+    for collection, entry, file_diagnostics, file_refs in results:
+        if entry is not None:
+            ids[collection].add(entry)
+        diagnostics.extend(file_diagnostics)
+        refs.extend(file_refs)
+
+    stats_file = content_dir / COLLECTIONS["model-stats"][0]
+    if stats_file.exists():
+        _, file_diagnostics, file_refs = check_file(
+            "model-stats", stats_file, content_dir
+        )
+        diagnostics.extend(file_diagnostics)
+        refs.extend(file_refs)
+
+    diagnostics.extend(check_references(refs, ids))
+    return diagnostics, len(jobs) + stats_file.exists()
+
+
+def collection_of(path):
+    # Works for any content root, e.g. the temporary trees of bench_pipeline.py
+    path = Path(path)
+    if path.name == COLLECTIONS["model-stats"][0]:
+        return "model-stats"
+    for collection in ("benchmarks", "publishers", "leaderboards"):
+        if path.parent.name == COLLECTIONS[collection][0]:
+            return collection
+    if path.parent.parent.name == COLLECTIONS["models"][0]:
+        return "models"
+    return None
+
+
+def validate_writes(pending, index):
+    # Check what a ContentWriter is about to write. References resolve against
+    # the ContentIndex, which already includes everything this run added.
+    diagnostics, refs = [], []
+    for path, data in pending:
+        collection = collection_of(path)
+        if collection is None:
+            continue
+        if hasattr(data, "to_dict"):
+            data = data.to_dict()
+        file_diagnostics, file_refs = check_data(collection, data, path)
+        diagnostics.extend(file_diagnostics)
+        refs.extend(file_refs)
+
+    ids = {"models": index.models.keys(), "publishers": index.publishers.keys()}
+    diagnostics.extend(check_references(refs, ids))
+    return diagnostics
+
+
+def check_writes(writer, index):
+    # Run by the syncs before commit, so broken content never reaches the tree
+    diagnostics = validate_writes(writer.pending(), index)
+    errors = [d for d in diagnostics if d.severity == "error"]
+    for d in diagnostics:
+        if d.severity != "error":
+            print(format_diagnostic(d))
+    if errors:
+        raise ContentValidationError(errors)
+
+
+if __name__ == "__main__":
+    # Same as `benchai.py validate`
+    from benchai import main
+
+    sys.exit(main(["validate", *sys.argv[1:]]))
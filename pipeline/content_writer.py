@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+def encode_json(data):
+    # Keep the exact layout the sync scripts have always written
+    return json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+
+
+class CompactJson(dict):
+    # For files the browser downloads, so no indentation
+    def to_json(self):
+        return json.dumps(self, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+
+class Chunks:
+    # Content made piece by piece, e.g. a large binary file, so it is never
+    # held in memory at once. `make` returns an iterable of bytes.
+    def __init__(self, make):
+        self.make = make
+
+
+def file_digest(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def file_mode(path):
+    # mkstemp creates files owner-only; keep the mode of the file being
+    # replaced, or what a plain open() would give a new one
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write(path, content):
+    atomic_write_chunks(path, [content])
+
+
+def atomic_write_chunks(path, chunks, unless_digest=None):
+    # Like atomic_write for content that arrives piece by piece. If the content
+    # hashes to `unless_digest`, `path` is left alone and False returned.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                digest.update(chunk)
+                f.write(chunk)
+        if digest.hexdigest() == unless_digest:
+            os.unlink(tmp_path)
+            return False
+        os.chmod(tmp_path, file_mode(path))
+        os.replace(tmp_path, path)
+        return True
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class ContentWriter:
+    # Buffers every write of a run, keeps only the last one per path and only
+    # touches files whose content actually changed.
+
+    def __init__(self):
+        self._pending = {}
+
+    def write(self, path, data):
+        self._pending[Path(path)] = data
+
+    def pending(self):
+        return sorted(self._pending.items())
+
+    def commit(self):
+        stats = {"written": 0, "skipped": 0, "created": 0}
+
+        for path, data in sorted(self._pending.items()):
+            if isinstance(data, Chunks):
+                old_digest = file_digest(path)
+                if atomic_write_chunks(path, data.make(), unless_digest=old_digest):
+                    stats["created" if old_digest is None else "written"] += 1
+                else:
+                    stats["skipped"] += 1
+                continue
+
+            # Records from content_records encode themselves, bytes are written as is
+            if isinstance(data, bytes):
+                content = data
+            elif hasattr(data, "to_json"):
+                content = data.to_json()
+            else:
+                content = encode_json(data)
+            old_digest = file_digest(path)
+
+            if old_digest == hashlib.sha256(content).hexdigest():
+                stats["skipped"] += 1
+                continue
+
+            atomic_write(path, content)
+            stats["created" if old_digest is None else "written"] += 1
+
+        self._pending.clear()
+
+        print(
+            f"Content files: {stats['written']} written, "
+            f"{stats['skipped']} skipped, {stats['created']} created"
+        )
+        return stats
@@ -0,0 +1,120 @@
+import argparse
+import os
+import random
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    # Every request is logged, so blocked resources are easy to spot
+    delay = 0.0
+    jitter = 0.0
+    # Every fail_every-th request is answered with fail_status instead
+    fail_every = 0
+    fail_status = 503
+    retry_after = None
+    requests = 0
+    lock = threading.Lock()
+    etag = None
+
+    def do_GET(self):
+        self.etag = None
+        with self.lock:
+            FixtureHandler.requests += 1
+            number = FixtureHandler.requests
+
+        delay = self.delay + random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+        if self.fail_every and number % self.fail_every == 0:
+            self.send_response(self.fail_status)
+            if self.retry_after is not None:
+                self.send_header("Retry-After", str(self.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        # Files carry an ETag and If-None-Match is answered with a 304, like
+        # the real sources, so conditional requests can be tried out
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            info = os.stat(path)
+            self.etag = f'"{info.st_mtime_ns:x}-{info.st_size:x}"'
+            if self.etag in self.headers.get("If-None-Match", ""):
+                self.send_response(304)
+                self.end_headers()
+                return
+        super().do_GET()
+
+    def end_headers(self):
+        if self.etag:
+            self.send_header("ETag", self.etag)
+        super().end_headers()
+
+
+def make_server(
+    port, delay=0, jitter=0, fail_every=0, fail_status=503, retry_after=None
+):
+    # Port 0 picks a free port, see server.server_address
+    FixtureHandler.delay = delay / 1000
+    FixtureHandler.jitter = jitter / 1000
+    FixtureHandler.fail_every = fail_every
+    FixtureHandler.fail_status = fail_status
+    FixtureHandler.retry_after = retry_after
+    FixtureHandler.requests = 0
+    handler = partial(FixtureHandler, directory=str(FIXTURES_DIR))
+    return ThreadingHTTPServer(("127.0.0.1", port), handler)
+
+
+def serve(port, delay, jitter=0, fail_every=0, fail_status=503, retry_after=None):
+    server = make_server(port, delay, jitter, fail_every, fail_status, retry_after)
+
+    print(f"Serving {FIXTURES_DIR} on http://127.0.0.1:{port}/")
+    print(f"e.g. uv run sync_swe_data.py --base-url http://127.0.0.1:{port}/swe/")
+    print(f"  or uv run sync_aa_data.py --url http://127.0.0.1:{port}/aa/models.json")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--delay", type=int, default=0, help="Milliseconds added to every response"
+    )
+    parser.add_argument(
+        "--jitter",
+        type=int,
+        default=0,
+        help="Up to this many random extra milliseconds",
+    )
+    parser.add_argument(
+        "--fail-every",
+        type=int,
+        default=0,
+        help="Answer every Nth request with --fail-status, to exercise retries",
+    )
+    parser.add_argument("--fail-status", type=int, default=503)
+    parser.add_argument(
+        "--retry-after", type=int, help="Retry-After seconds sent with failures"
+    )
+    args = parser.parse_args()
+
+    serve(
+        args.port,
+        args.delay,
+        jitter=args.jitter,
+        fail_every=args.fail_every,
+        fail_status=args.fail_status,
+        retry_after=args.retry_after,
+    )
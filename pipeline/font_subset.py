@@ -0,0 +1,191 @@
+import hashlib
+import io
+import json
+from html import unescape
+from pathlib import Path
+
+import fontTools
+from fontTools import subset
+from fontTools.ttLib import TTFont
+
+from change_journal import fingerprint, load_state, save_state
+from content_writer import ContentWriter, file_digest
+from run_report import count, finish_run, stage, start_run
+
+CURRENT_SCRIPT_PATH = Path(__file__).resolve()
+AGENT_DIR = CURRENT_SCRIPT_PATH.parent
+PROJECT_ROOT = AGENT_DIR.parent
+
+# Full fonts live outside public/, only their subsets are served
+FONT_SOURCE_DIR = PROJECT_ROOT / "fonts"
+FONT_OUT_DIR = PROJECT_ROOT / "public" / "fonts"
+FONT_CSS_FILE = PROJECT_ROOT / "src" / "styles" / "fonts.css"
+STATE_FILE = AGENT_DIR / ".cache" / "font_subset_state.json"
+
+# (family, source file, style, weight), each becomes one @font-face
+FACES = [
+    ("JetBrainsMono", "JetBrainsMono-Regular.woff2", "normal", 400),
+    ("NF", "JetBrainsMonoNerdFontMono-Regular.ttf", "normal", 400),
+    ("Maple Mono", "MapleMonoNL-Regular.ttf", "normal", 400),
+    ("Maple Mono", "MapleMonoNL-Bold.ttf", "normal", 700),
+    ("Maple Mono", "MapleMonoNL-Italic.ttf", "italic", 400),
+]
+
+# Text the site can show: the pages of the last build (the vercel adapter
+# writes them under .vercel/output/static) and, so a checkout without a build
+# still gets every glyph, the pages, components and content they come from
+BUILD_DIRS = [PROJECT_ROOT / "dist", PROJECT_ROOT / ".vercel" / "output" / "static"]
+SOURCE_DIR = PROJECT_ROOT / "src"
+SOURCE_SUFFIXES = {".astro", ".ts", ".tsx", ".md", ".mdx", ".json"}
+# Printable ASCII is always kept, for search input and numbers formatted in
+# the browser
+BASE_CODEPOINTS = range(0x20, 0x7F)
+
+# Part of every fingerprint, bump it when the subsetting options change
+SUBSET_VERSION = 1
+
+
+def text_files():
+    for build_dir in BUILD_DIRS:
+        yield from build_dir.rglob("*.html")
+    for path in SOURCE_DIR.rglob("*"):
+        if path.suffix in SOURCE_SUFFIXES and path.is_file():
+            yield path
+
+
+def file_text(path):
+    text = path.read_text(encoding="utf-8", errors="ignore")
+    if path.suffix == ".html":
+        return unescape(text)
+    if path.suffix == ".json":
+        # \u escapes as the characters they stand for
+        try:
+            return json.dumps(json.loads(text), ensure_ascii=False)
+        except ValueError:
+            return text
+    return text
+
+
+def used_codepoints(cached):
+    # -> (code points, {file: [mtime_ns, size, characters]}). A file whose
+    # mtime and size match its entry in `cached` isn't read again.
+    files = {}
+    used = set(BASE_CODEPOINTS)
+    read = 0
+    for path in text_files():
+        info = path.stat()
+        key = path.relative_to(PROJECT_ROOT).as_posix()
+        entry = cached.get(key)
+        if entry is None or entry[:2] != [info.st_mtime_ns, info.st_size]:
+            chars = "".join(sorted(set(file_text(path))))
+            entry = [info.st_mtime_ns, info.st_size, chars]
+            read += 1
+        files[key] = entry
+        used.update(map(ord, entry[2]))
+    count("font_text_files_read", read)
+
+    # Control characters never need a glyph
+    used = {c for c in used if c >= 0x20 and not 0x7F <= c < 0xA0}
+    return used, files
+
+
+def unicode_range(codepoints):
+    # Sorted code points as "U+20-7E, U+B0"
+    ranges = []
+    for c in codepoints:
+        if ranges and ranges[-1][1] == c - 1:
+            ranges[-1][1] = c
+        else:
+            ranges.append([c, c])
+    return ", ".join(
+        f"U+{first:X}" if first == last else f"U+{first:X}-{last:X}"
+        for first, last in ranges
+    )
+
+
+def subset_font(path, codepoints):
+    # -> (woff2 bytes, the code points the font has a glyph for). Without a new
+    # timestamp in the head table, the output depends on the inputs alone.
+    font = TTFont(path, recalcTimestamp=False)
+    covered = sorted(set(codepoints) & set(font.getBestCmap()))
+
+    subsetter = subset.Subsetter(subset.Options())
+    subsetter.populate(unicodes=covered)
+    subsetter.subset(font)
+
+    font.flavor = "woff2"
+    out = io.BytesIO()
+    font.save(out)
+    return out.getvalue(), covered
+
+
+def font_css(faces):
+    blocks = []
+    for family, source, style, weight in FACES:
+        name = f"{Path(source).stem}.woff2"
+        blocks.append(
+            "@font-face {\n"
+            f'  font-family: "{family}";\n'
+            f'  src: url("/fonts/{name}") format("woff2");\n'
+            f"  font-style: {style};\n"
+            f"  font-weight: {weight};\n"
+            "  font-display: swap;\n"
+            f"  unicode-range: {faces[name]['unicodeRange']};\n"
+            "}\n"
+        )
+    header = "/* Generated by pipeline/font_subset.py, don't edit */\n"
+    return (header + "\n" + "\n".join(blocks)).encode("utf-8")
+
+
+def update_fonts(force=False, state_file=STATE_FILE):
+    # Subset every face in FACES to the code points the site uses. A face is
+    # only subset again when its source, the code points or SUBSET_VERSION
+    # changed, or its output went missing.
+    start_run("fonts")
+    state = (None if force else load_state(state_file)) or {}
+    with stage("font_scan"):
+        used, files = used_codepoints(state.get("files", {}))
+    text = fingerprint(sorted(used))
+
+    writer = ContentWriter()
+    faces, rebuilt = {}, 0
+    with stage("font_subset"):
+        for _, source, _, _ in FACES:
+            path = FONT_SOURCE_DIR / source
+            out = FONT_OUT_DIR / f"{path.stem}.woff2"
+            inputs = fingerprint(
+                {
+                    "version": SUBSET_VERSION,
+                    "fontTools": fontTools.version,
+                    "source": file_digest(path),
+                    "text": text,
+                }
+            )
+
+            face = state.get("faces", {}).get(out.name)
+            if (
+                face is None
+                or face["inputs"] != inputs
+                or file_digest(out) != face["digest"]
+            ):
+                content, covered = subset_font(path, used)
+                face = {
+                    "inputs": inputs,
+                    "digest": hashlib.sha256(content).hexdigest(),
+                    "unicodeRange": unicode_range(covered),
+                }
+                writer.write(out, content)
+                rebuilt += 1
+            faces[out.name] = face
+        count("fonts_subset", rebuilt)
+
+    writer.write(FONT_CSS_FILE, font_css(faces))
+    writer.commit()
+    save_state(state_file, {"files": files, "faces": faces})
+
+    size = sum((FONT_OUT_DIR / name).stat().st_size for name in faces)
+    print(
+        f"Fonts: {rebuilt} of {len(FACES)} subset, {len(used)} code points, "
+        f"{size} bytes served"
+    )
+    finish_run()
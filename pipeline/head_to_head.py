@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import numpy as np
+
+from content_writer import Chunks, CompactJson
+from run_report import stage
+from score_matrix import ScoreMatrix
+
+CURRENT_SCRIPT_PATH = Path(__file__).resolve()
+AGENT_DIR = CURRENT_SCRIPT_PATH.parent
+PROJECT_ROOT = AGENT_DIR.parent
+
+# Served as static files, the Model Arena fetches only the rows it shows
+HEAD_TO_HEAD_DIR = PROJECT_ROOT / "public" / "head-to-head"
+# Models per block of rows, each block holds a few (BLOCK_ROWS, models) arrays
+BLOCK_ROWS = 256
+
+# rows.bin holds one fixed-size row per model, in the order of models.json.
+# Row i compares model i with every model k, as little-endian arrays of
+# len(models) values laid out one after the other:
+#
+#   delta   float32  mean score of i minus k over the shared benchmarks
+#   shared  uint16   benchmarks both have a score for
+#   wins    uint16   shared benchmarks where i did better
+#   losses  uint16   shared benchmarks where k did better
+#
+# Ties are shared - wins - losses. Every section is aligned for its type
+# within the row, so a fetched row maps onto typed arrays directly.
+SECTIONS = [("delta", "<f4"), ("shared", "<u2"), ("wins", "<u2"), ("losses", "<u2")]
+
+
+def encode_rows(shared, wins, losses, deltas):
+    # Each section as (rows, bytes), side by side: one fixed-size row per model
+    columns = {"delta": deltas, "shared": shared, "wins": wins, "losses": losses}
+    n = len(shared)
+    sections = [
+        np.ascontiguousarray(columns[name], dtype=dtype).view(np.uint8).reshape(n, -1)
+        for name, dtype in SECTIONS
+    ]
+    return np.hstack(sections).tobytes() if n else b""
+
+
+def compute_head_to_head(index):
+    # -> (header, rows.bin content). The rows are computed BLOCK_ROWS models at
+    # a time while the file is written, so memory doesn't grow with models
+    # squared.
+    scores = ScoreMatrix.from_benchmarks(index.benchmarks, models=index.models)
+    n = len(scores.models)
+    if len(scores.benchmarks) > np.iinfo(np.uint16).max:
+        raise ValueError("Too many benchmarks for uint16 counts")
+
+    header = CompactJson(
+        {
+            "models": scores.models,
+            "rowBytes": sum(np.dtype(dtype).itemsize for _, dtype in SECTIONS) * n,
+            "sections": [
+                {
+                    "name": name,
+                    "type": np.dtype(dtype).name,
+                    "offset": sum(np.dtype(d).itemsize for _, d in SECTIONS[:s]) * n,
+                }
+                for s, (name, dtype) in enumerate(SECTIONS)
+            ],
+        }
+    )
+
+    def rows():
+        with stage("head_to_head"):
+            for start in range(0, n, BLOCK_ROWS):
+                shared, wins, losses, deltas = scores.head_to_head(
+                    start, start + BLOCK_ROWS
+                )
+                yield encode_rows(shared, wins, losses, np.round(deltas, 2))
+
+    return header, Chunks(rows)
+
+
+def build_head_to_head(index, writer):
+    header, rows = compute_head_to_head(index)
+    writer.write(HEAD_TO_HEAD_DIR / "models.json", header)
+    writer.write(HEAD_TO_HEAD_DIR / "rows.bin", rows)
+    size = header["rowBytes"] * len(header["models"])
+    print(f"Head to head: {len(header['models'])} models, {size} bytes")
@@ -0,0 +1,93 @@
+import hashlib
+import json
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from content_writer import atomic_write, atomic_write_chunks
+from run_report import count
+
+CHUNK_SIZE = 1 << 16
+
+
+def body_digest(body):
+    return hashlib.sha256(body).hexdigest()
+
+
+class ResponseCache:
+    # Keeps the last body and validators of each URL on disk, with the sha256
+    # of the body. Whether a body made it into the content is up to the
+    # caller, e.g. sync_aa_data.SYNC_FILE.
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def load_meta(self, url):
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def body_path(self, url):
+        # Path of the stored body, or None before the first fetch
+        _, body_path = self._paths(url)
+        return body_path if body_path.exists() else None
+
+    def _save_meta(self, url, meta):
+        meta_path, _ = self._paths(url)
+        atomic_write(meta_path, json.dumps(meta, indent=4).encode("utf-8"))
+
+    def store(self, url, response):
+        # The body goes to disk chunk by chunk, so a streamed response is never
+        # held in memory as a whole
+        _, body_path = self._paths(url)
+        digest = hashlib.sha256()
+
+        def chunks():
+            for chunk in response.iter_content(CHUNK_SIZE):
+                digest.update(chunk)
+                count("bytes_downloaded", len(chunk), source=urlsplit(url).hostname)
+                yield chunk
+
+        atomic_write_chunks(body_path, chunks())
+
+        meta = self.load_meta(url)
+        meta.update(
+            {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "sha256": digest.hexdigest(),
+            }
+        )
+        self._save_meta(url, meta)
+
+
+def conditional_download(url, headers, cache, timeout=None, client=None):
+    # Refreshes the cached body and returns its path; a 304 keeps the stored copy.
+    # Transient failures are retried by the client before anything is stored.
+    from http_client import default_client
+
+    client = client or default_client()
+    meta = cache.load_meta(url)
+    request_headers = dict(headers)
+    if cache.body_path(url) is not None:
+        if meta.get("etag"):
+            request_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            request_headers["If-Modified-Since"] = meta["last_modified"]
+
+    kwargs = {"timeout": timeout} if timeout else {}
+    with client.get(url, headers=request_headers, stream=True, **kwargs) as response:
+        if response.status_code == 304:
+            print(f"Not modified since last fetch: {url}")
+            return cache.body_path(url)
+
+        response.raise_for_status()
+        cache.store(url, response)
+    return cache.body_path(url)
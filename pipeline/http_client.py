@@ -0,0 +1,154 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from run_report import count
+
+# (connect, read) seconds; the read timeout applies between bytes, not in total
+DEFAULT_TIMEOUT = (10, 60)
+DEFAULT_RETRIES = 4
+# Backoff before retry n is a random delay in [0, min(MAX_BACKOFF, BASE * 2**n)]
+BACKOFF_BASE = 0.5
+MAX_BACKOFF = 30.0
+# A Retry-After longer than this is not waited for, the request fails instead
+MAX_RETRY_AFTER = 120.0
+POOL_SIZE = 8
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+
+def retry_after(response):
+    # Seconds asked for by a Retry-After header, either delta-seconds or a date
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def rate_limit_reset(response):
+    # Seconds until an exhausted X-RateLimit window opens again. Servers send
+    # the reset either as seconds or as a Unix timestamp.
+    if response.headers.get("X-RateLimit-Remaining") != "0":
+        return None
+    try:
+        reset = float(response.headers.get("X-RateLimit-Reset"))
+    except (TypeError, ValueError):
+        return None
+    if reset > 1e9:
+        reset -= time.time()
+    return max(0.0, reset)
+
+
+class HttpClient:
+    # One pooled session shared by every fetch of a run. Connection errors,
+    # timeouts and RETRY_STATUSES are retried with jittered exponential backoff.
+    # A rate-limited response holds back every request to that host, so
+    # concurrent workers don't keep hitting a server that asked them to wait.
+
+    def __init__(
+        self,
+        timeout=DEFAULT_TIMEOUT,
+        retries=DEFAULT_RETRIES,
+        backoff=BACKOFF_BASE,
+        pool_size=POOL_SIZE,
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self._not_before = {}  # host -> monotonic time requests may resume
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _wait_for(self, host):
+        with self._lock:
+            delay = self._not_before.get(host, 0) - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _hold(self, host, seconds):
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._not_before[host] = max(self._not_before.get(host, 0), until)
+
+    def backoff_delay(self, attempt):
+        # "Full jitter", so retries of concurrent requests spread out
+        return random.uniform(0, min(MAX_BACKOFF, self.backoff * 2**attempt))
+
+    def request(self, method, url, **kwargs):
+        # Returns the last response even if its status is still an error, so
+        # callers decide how to handle it with raise_for_status
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).hostname
+        attempt = 0
+        while True:
+            self._wait_for(host)
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except RETRY_ERRORS as e:
+                if attempt >= self.retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                print(f"Retrying {url} in {delay:.1f}s: {type(e).__name__}")
+            else:
+                reset = rate_limit_reset(response)
+                if reset is not None:
+                    self._hold(host, min(reset, MAX_RETRY_AFTER))
+
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                wait = retry_after(response)
+                if attempt >= self.retries or (wait or 0) > MAX_RETRY_AFTER:
+                    return response
+
+                response.close()
+                delay = self.backoff_delay(attempt)
+                if wait is not None:
+                    delay = max(delay, wait)
+                    self._hold(host, wait)
+                print(f"Retrying {url} in {delay:.1f}s: HTTP {response.status_code}")
+
+            count("http_retries", source=host)
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_client():
+    # The client shared by the sync scripts, created on first use
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = HttpClient()
+        return _default
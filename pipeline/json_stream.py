@@ -0,0 +1,97 @@
+import io
+import json
+import re
+
+CHUNK_SIZE = 1 << 16
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _Reader:
+    # A text buffer over a file that refills whenever a value runs past its end.
+    # Only the unread tail is kept, so memory follows the largest single value.
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        # Read at least as much as is buffered, so retrying a long value
+        # stays linear in its size
+        chunk = self.fp.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not chunk:
+            self.eof = True
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+
+    def peek(self):
+        while True:
+            self.pos = WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos : self.pos + 1]
+            self.fill()
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r}, found {char or 'EOF'!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        while True:
+            self.peek()
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.fill()
+                continue
+
+            # A number ending with the buffer may go on in the next chunk
+            if end == len(self.buf) and not self.eof:
+                self.fill()
+                continue
+
+            self.pos = end
+            return value
+
+
+def iter_array(fp, key, chunk_size=CHUNK_SIZE):
+    # Yield the items of the array under `key` of a top-level JSON object one
+    # at a time. `fp` is a text or binary file, other keys are skipped.
+    if not isinstance(fp, io.TextIOBase):
+        fp = io.TextIOWrapper(fp, encoding="utf-8")
+    reader = _Reader(fp, chunk_size)
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        raise KeyError(key)
+
+    while True:
+        name = reader.value()
+        reader.expect(":")
+
+        if name != key:
+            reader.value()
+        else:
+            reader.expect("[")
+            if reader.peek() == "]":
+                return
+            while True:
+                yield reader.value()
+                if reader.expect(",]") == "]":
+                    return
+
+        if reader.expect(",}") == "}":
+            raise KeyError(key)
+
+
+def iter_file_array(path, key, chunk_size=CHUNK_SIZE):
+    with open(path, "rb") as f:
+        yield from iter_array(f, key, chunk_size)
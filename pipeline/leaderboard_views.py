@@ -0,0 +1,103 @@
+from pathlib import Path
+
+from change_journal import fingerprint
+from content_index import read_json
+from run_report import count, stage
+
+CURRENT_SCRIPT_PATH = Path(__file__).resolve()
+AGENT_DIR = CURRENT_SCRIPT_PATH.parent
+PROJECT_ROOT = AGENT_DIR.parent
+
+LEADERBOARDS_DIR = PROJECT_ROOT / "src" / "content" / "leaderboards"
+
+# Part of every fingerprint, bump it when the layout of a view changes
+VIEW_VERSION = 1
+
+# One view per benchmark with every snapshot row joined to its model and
+# publisher, so src/pages/benchmarks/[id].astro renders from a single entry
+# instead of two lookups per row. `inputs` is a fingerprint of everything a
+# view is built from; a view whose inputs didn't change is left alone.
+
+
+def view_inputs(bench, index):
+    # The snapshot, its order and the fields the view copies from each model
+    # and publisher
+    models, publishers = {}, {}
+    for item in bench["snapshot"]:
+        model = index.models.get(item["modelRef"])
+        if model is None:
+            continue
+        models[item["modelRef"]] = [
+            model["name"],
+            model.get("releaseDate"),
+            model["publisher"],
+        ]
+        publisher = index.publishers.get(model["publisher"])
+        if publisher is not None:
+            publishers[model["publisher"]] = [
+                publisher["name"],
+                publisher["color"],
+                publisher["logo"],
+            ]
+
+    return {
+        "version": VIEW_VERSION,
+        "snapshot": [[item["modelRef"], item["score"]] for item in bench["snapshot"]],
+        "isBetterHigher": bench["metrics"].get("isBetterHigher", True),
+        "models": models,
+        "publishers": publishers,
+    }
+
+
+def leaderboard_rows(bench, index):
+    # Best first like the page always sorted them, ties keep snapshot order
+    # and share a rank ("1224")
+    higher = bench["metrics"].get("isBetterHigher", True)
+    snapshot = sorted(
+        bench["snapshot"], key=lambda item: -item["score"] if higher else item["score"]
+    )
+
+    rows = []
+    for i, item in enumerate(snapshot):
+        if i == 0 or item["score"] != snapshot[i - 1]["score"]:
+            rank = i + 1
+        ref = item["modelRef"]
+        model = index.models.get(ref)
+        publisher = model and index.publishers.get(model["publisher"])
+
+        row = {
+            "rank": rank,
+            "modelId": ref,
+            "model": model["name"] if model else ref,
+            "score": item["score"],
+        }
+        if model and model.get("releaseDate"):
+            row["releaseDate"] = model["releaseDate"]
+        row["publisherInfo"] = (
+            {
+                "name": publisher["name"],
+                "color": publisher["color"],
+                "logo": publisher["logo"],
+            }
+            if publisher
+            else None
+        )
+        rows.append(row)
+    return rows
+
+
+def build_leaderboard_views(index, writer):
+    with stage("leaderboards"):
+        rebuilt = 0
+        for bench_id, bench in index.benchmarks.items():
+            path = LEADERBOARDS_DIR / f"{bench_id}.json"
+            inputs = fingerprint(view_inputs(bench, index))
+            if read_json(path).get("inputs") == inputs:
+                continue
+
+            writer.write(
+                path, {"inputs": inputs, "rows": leaderboard_rows(bench, index)}
+            )
+            rebuilt += 1
+        count("leaderboards_rebuilt", rebuilt)
+    print(f"Leaderboard views: {rebuilt} rebuilt")
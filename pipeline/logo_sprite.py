@@ -0,0 +1,254 @@
+import re
+from pathlib import Path
+from xml.dom import minidom
+
+from content_index import ContentIndex, read_json
+from content_records import Publisher
+from content_validator import check_writes
+from content_writer import ContentWriter
+from leaderboard_views import build_leaderboard_views
+from model_stats import BENCH_DIR, MODELS_DIR, PUB_DIR, build_model_stats
+from run_report import count, finish_run, stage, start_run
+from search_index import build_search_index
+
+CURRENT_SCRIPT_PATH = Path(__file__).resolve()
+AGENT_DIR = CURRENT_SCRIPT_PATH.parent
+PROJECT_ROOT = AGENT_DIR.parent
+
+LOGOS_DIR = PROJECT_ROOT / "public" / "logos"
+SPRITE_FILE = LOGOS_DIR / "sprite.svg"
+# {"/logos/<file>": "/logos/sprite.svg#<id>"}, identical logos share an id
+SPRITE_MAP_FILE = LOGOS_DIR / "sprite.json"
+UNKNOWN_LOGO = "/logos/unknown.svg"
+# Larger logos, e.g. ones wrapping a bitmap, stay separate files instead of
+# weighing down every page that shows a single small logo
+SPRITE_MAX_BYTES = 8 * 1024
+
+# The sprite is an "SVG stack": every logo is a nested <svg id=...> that is
+# only drawn while it is the :target, so <img src="/logos/sprite.svg#openai">
+# shows just that logo and every logo on a page comes from one request.
+SPRITE_STYLE = ":root>svg:not(:target){display:none}"
+
+# Editor data that never renders: Inkscape/Sodipodi and Illustrator
+# (anthropic.svg declares the latter as bare "ns_*;" names)
+EDITOR_NAMESPACES = {
+    "http://www.inkscape.org/namespaces/inkscape",
+    "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd",
+    "http://ns.adobe.com/AdobeIllustrator/10.0/",
+    "http://ns.adobe.com/SaveForWeb/1.0/",
+    "ns_ai;",
+    "ns_sfw;",
+    "ns_extend;",
+    "ns_graphs;",
+}
+# Whitespace is kept inside these, it may be shown
+TEXT_ELEMENTS = {"text", "tspan", "textPath", "title", "desc"}
+CSS_CLASS = re.compile(r"\.(-?[A-Za-z_][\w-]*)")
+CSS_ID = re.compile(r"#([A-Za-z_][\w-]*)")
+URL_REF = re.compile(r"url\(\s*['\"]?#([^'\")\s]+)['\"]?\s*\)")
+
+
+def elements(node):
+    yield node
+    for child in node.childNodes:
+        if child.nodeType == child.ELEMENT_NODE:
+            yield from elements(child)
+
+
+def strip_node(node):
+    for child in list(node.childNodes):
+        if child.nodeType in (child.COMMENT_NODE, child.PROCESSING_INSTRUCTION_NODE):
+            node.removeChild(child)
+        elif child.nodeType == child.ELEMENT_NODE:
+            if child.localName == "metadata" or child.namespaceURI in EDITOR_NAMESPACES:
+                node.removeChild(child)
+            else:
+                strip_node(child)
+        elif child.nodeType == child.TEXT_NODE and node.localName not in TEXT_ELEMENTS:
+            if not child.data.strip():
+                node.removeChild(child)
+            elif node.localName == "style":
+                css = re.sub(r"\s+", " ", child.data).strip()
+                child.data = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+
+    for attr in list(node.attributes.values()):
+        name = attr.name
+        if attr.namespaceURI in EDITOR_NAMESPACES or name == "xml:space":
+            node.removeAttribute(name)
+        elif not name.startswith("xmlns"):
+            value = re.sub(r"\s+", " ", attr.value).strip()
+            if name == "style":
+                # Illustrator's enable-background has no effect in browsers
+                value = re.sub(r"enable-background:[^;]*;?", "", value).strip()
+                if not value:
+                    node.removeAttribute(name)
+                    continue
+            node.setAttribute(name, value)
+
+
+def drop_unused_namespaces(root):
+    used = set()
+    for element in elements(root):
+        used.add(element.prefix)
+        used.update(attr.prefix for attr in element.attributes.values())
+    for name in list(root.attributes.keys()):
+        if name.startswith("xmlns:") and name[len("xmlns:") :] not in used:
+            root.removeAttribute(name)
+
+
+def minify_svg(data):
+    # Comments, the XML declaration, metadata, editor data and the whitespace
+    # between elements go; what is drawn doesn't change. Minified input comes
+    # back unchanged.
+    root = minidom.parseString(data).documentElement
+    strip_node(root)
+    drop_unused_namespaces(root)
+    # Illustrator's x="0px" y="0px" on the root are the defaults
+    for name in ("x", "y"):
+        if root.getAttribute(name) in ("0", "0px"):
+            root.removeAttribute(name)
+    return root.toxml().encode("utf-8")
+
+
+def sprite_id_of(path):
+    sprite_id = re.sub(r"[^\w-]", "-", path.stem)
+    return sprite_id if re.match(r"[A-Za-z_]", sprite_id) else f"logo-{sprite_id}"
+
+
+def sprite_entry(data, sprite_id):
+    # One minified logo as a nested <svg id="sprite_id">. Its ids and classes
+    # get the sprite id as a prefix, since every <style> in the sprite applies
+    # to all logos in it.
+    root = minidom.parseString(data).documentElement
+    ids = {
+        element.getAttribute("id"): f"{sprite_id}-{element.getAttribute('id')}"
+        for element in elements(root)
+        if element.getAttribute("id")
+    }
+    classes = {
+        name: f"{sprite_id}-{name}"
+        for element in elements(root)
+        for name in element.getAttribute("class").split()
+    }
+
+    def rename_refs(value):
+        return URL_REF.sub(
+            lambda m: f"url(#{ids.get(m.group(1), m.group(1))})",
+            value,
+        )
+
+    for element in elements(root):
+        for name, value in list(element.attributes.items()):
+            if name == "id":
+                element.setAttribute(name, ids[value])
+            elif name == "class":
+                element.setAttribute(name, " ".join(classes[c] for c in value.split()))
+            elif name in ("href", "xlink:href") and value.startswith("#"):
+                element.setAttribute(name, f"#{ids.get(value[1:], value[1:])}")
+            else:
+                element.setAttribute(name, rename_refs(value))
+        if element.localName == "style":
+            for text in element.childNodes:
+                css = rename_refs(text.data)
+                css = CSS_ID.sub(lambda m: f"#{ids.get(m.group(1), m.group(1))}", css)
+                text.data = CSS_CLASS.sub(
+                    lambda m: f".{classes.get(m.group(1), m.group(1))}", css
+                )
+
+    # Sized by the <img> showing it, drawn in its own coordinates
+    if not root.getAttribute("viewBox"):
+        width, height = (
+            re.sub(r"px$", "", root.getAttribute(name)) for name in ("width", "height")
+        )
+        if width and height:
+            root.setAttribute("viewBox", f"0 0 {width} {height}")
+    for name in ("width", "height", "x", "y", "xmlns"):
+        if root.hasAttribute(name):
+            root.removeAttribute(name)
+    root.setAttribute("id", sprite_id)
+    return root.toxml()
+
+
+def build_logo_sprite(logos_dir=LOGOS_DIR):
+    # -> ({path: content} of the minified logos and the sprite, id map).
+    # Logos minify to identical bytes are one entry of the sprite.
+    sprite_file = logos_dir / SPRITE_FILE.name
+    minified = {
+        path: minify_svg(path.read_bytes())
+        for path in sorted(logos_dir.glob("*.svg"))
+        if path != sprite_file
+    }
+
+    shared = {}
+    for path, data in minified.items():
+        if len(data) <= SPRITE_MAX_BYTES:
+            shared.setdefault(data, []).append(path)
+
+    id_map, entries = {}, {}
+    for data, paths in shared.items():
+        sprite_id = sprite_id_of(paths[0])
+        entries[sprite_id] = sprite_entry(data, sprite_id)
+        for path in paths:
+            id_map[f"/logos/{path.name}"] = f"/logos/{sprite_file.name}#{sprite_id}"
+
+    sprite = (
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        'xmlns:xlink="http://www.w3.org/1999/xlink">'
+        f"<style>{SPRITE_STYLE}</style>"
+        + "".join(entries[sprite_id] for sprite_id in sorted(entries))
+        + "</svg>"
+    )
+    files = {**minified, sprite_file: sprite.encode("utf-8")}
+    return files, id_map
+
+
+def logo_for(slug, logos_dir=LOGOS_DIR):
+    # The logo of a new publisher: its entry in the sprite or the file named
+    # after it, None without one
+    id_map = read_json(logos_dir / SPRITE_MAP_FILE.name)
+    for path in sorted(logos_dir.glob(f"{slug}.*")):
+        if path.stem == slug:
+            return id_map.get(f"/logos/{path.name}", f"/logos/{path.name}")
+    return None
+
+
+def update_logos():
+    start_run("logos")
+    with stage("logo_sprite"):
+        files, id_map = build_logo_sprite()
+
+    # The sprite and its id map go first, the publisher checks below resolve
+    # logos against them
+    assets = ContentWriter()
+    for path, data in files.items():
+        assets.write(path, data)
+    assets.write(SPRITE_MAP_FILE, id_map)
+    assets.commit()
+
+    index = ContentIndex(MODELS_DIR, PUB_DIR, BENCH_DIR)
+    writer = ContentWriter()
+    rewritten = 0
+    for slug, publisher in sorted(index.publishers.items()):
+        logo = id_map.get(publisher["logo"], publisher["logo"])
+        if logo == publisher["logo"]:
+            continue
+        updated = Publisher.from_dict({**publisher.to_dict(), "logo": logo})
+        writer.write(PUB_DIR / f"{slug}.json", updated)
+        index.add_publisher(slug, updated)
+        rewritten += 1
+    count("publishers_rewritten", rewritten)
+
+    # The leaderboard views and the search index carry publisher logos too
+    stats = build_model_stats(index, writer)
+    build_search_index(index, stats, writer)
+    build_leaderboard_views(index, writer)
+    check_writes(writer, index)
+    writer.commit()
+
+    size = sum(len(data) for data in files.values())
+    print(
+        f"Logos: {len(id_map)} in the sprite as {len(set(id_map.values()))} "
+        f"entries, {len(files) - 1} minified, {size} bytes, "
+        f"{rewritten} publishers rewritten"
+    )
+    finish_run()
@@ -0,0 +1,173 @@
+import re
+import math
+from collections import defaultdict, namedtuple
+from pathlib import Path
+
+from content_index import alias_key, read_json
+from run_report import count
+
+ALIASES_FILE = Path(__file__).resolve().parent / "aliases.json"
+
+# Fuzzy matches below this confidence are not used
+MIN_CONFIDENCE = 0.8
+# A fuzzy match is ambiguous when the runner-up is this close to it
+AMBIGUITY_MARGIN = 0.05
+# Confidence is multiplied by this when the version numbers differ
+VERSION_PENALTY = 0.5
+# Taken off per noise token ("preview", ...) the candidate has and the name lacks
+NOISE_PENALTY = 0.06
+# Added when the candidate belongs to the row's publisher
+PUBLISHER_BONUS = 0.05
+# Candidates whose trigram similarity can't reach this are never scored
+CANDIDATE_FLOOR = MIN_CONFIDENCE - PUBLISHER_BONUS
+
+# `method` is "alias", "exact", "fuzzy" or None when nothing was accepted.
+# `candidates` holds the best (modelRef, confidence) pairs for fuzzy lookups.
+Match = namedtuple("Match", "ref confidence method candidates")
+
+
+def clean_model_date(name):
+    # Drop the release date leaderboards put after the name, e.g. "(2025-09-29)"
+    return re.sub(r"\s*\(\d+(?:-\d+)*\)", "", name or "").strip()
+
+
+def trigrams(key):
+    padded = f"^{key}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def numbers(key):
+    return sorted(re.findall(r"\d+", key))
+
+
+def load_aliases(path=ALIASES_FILE):
+    aliases = read_json(path)
+    return {
+        "publishers": {
+            alias_key(name): slug
+            for name, slug in aliases.get("publishers", {}).items()
+        },
+        "models": aliases.get("models", {}),
+        "noise": set(aliases.get("noise", [])),
+    }
+
+
+class ModelResolver:
+    # Matches scraped model names to modelRefs of a ContentIndex. Exact lookups
+    # go through the alias table and the index, anything else is scored against
+    # a trigram index over every model slug and display name.
+
+    def __init__(self, index, aliases=None):
+        self.index = index
+        self.aliases = aliases if aliases is not None else load_aliases()
+
+        self._keys = []  # (modelRef, trigrams, version numbers, noise tokens)
+        self._postings = defaultdict(list)  # trigram -> positions in _keys
+        self._indexed = set()
+
+    def _update(self):
+        # Pick up models the sync added to the index since the last lookup
+        if len(self._indexed) == len(self.index.models):
+            return
+
+        for ref, data in self.index.models.items():
+            if ref in self._indexed:
+                continue
+            self._indexed.add(ref)
+
+            slug = ref.rpartition("/")[2]
+            for name in {slug, data.get("name")}:
+                key, noise = self.fuzzy_key(name)
+                if not key:
+                    continue
+                grams = trigrams(key)
+                for gram in grams:
+                    self._postings[gram].append(len(self._keys))
+                self._keys.append((ref, grams, numbers(key), noise))
+
+    def fuzzy_key(self, name):
+        # Sorted tokens without noise, so "Claude Haiku 4.5" and
+        # "claude-4-5-haiku" share a key. Also returns the dropped noise tokens.
+        tokens = [t for t in alias_key(clean_model_date(name)).split("-") if t]
+        noise = {t for t in tokens if t in self.aliases["noise"]}
+        return "-".join(sorted(t for t in tokens if t not in noise)), noise
+
+    def publisher_slug(self, publisher):
+        key = alias_key(publisher)
+        return self.aliases["publishers"].get(key, key)
+
+    def candidates(self, name, publisher=None, limit=3):
+        # Best fuzzy candidates as [(modelRef, confidence)]
+        self._update()
+        key, noise = self.fuzzy_key(name)
+        if not key:
+            return []
+
+        # A key reaching CANDIDATE_FLOOR shares at least `needed` trigrams with
+        # the name, so it has to share one of the rarest len - needed + 1. Only
+        # those postings are read, common trigrams like "gpt" never are.
+        grams = trigrams(key)
+        needed = math.ceil(CANDIDATE_FLOOR * len(grams) / (2 - CANDIDATE_FLOOR))
+        rarest = sorted(grams, key=lambda g: len(self._postings.get(g, ())))
+        positions = set()
+        for gram in rarest[: len(grams) - needed + 1]:
+            positions.update(self._postings.get(gram, ()))
+
+        versions = numbers(key)
+        best = {}
+        for pos in positions:
+            ref, other_grams, other_versions, other_noise = self._keys[pos]
+            score = 2 * len(grams & other_grams) / (len(grams) + len(other_grams))
+            if score < CANDIDATE_FLOOR:
+                continue
+            if other_versions != versions:
+                score *= VERSION_PENALTY
+            score -= NOISE_PENALTY * len(other_noise - noise)
+            if publisher and ref.startswith(publisher + "/"):
+                score = min(1.0, score + PUBLISHER_BONUS)
+            if score > best.get(ref, 0):
+                best[ref] = score
+
+        ranked = sorted(best.items(), key=lambda x: (-x[1], x[0]))
+        return [(ref, round(score, 3)) for ref, score in ranked[:limit]]
+
+    def match(self, name, publisher=None):
+        publisher = self.publisher_slug(publisher) if publisher else None
+        key = alias_key(clean_model_date(name))
+        if not key:
+            return Match(None, 0.0, None, [])
+
+        alias = self.aliases["models"].get(key)
+        if alias:
+            ref = self.index.resolve(alias, publisher=publisher)
+            if ref:
+                return Match(ref, 1.0, "alias", [])
+
+        ref = self.index.resolve(key, publisher=publisher)
+        if ref:
+            return Match(ref, 1.0, "exact", [])
+
+        found = self.candidates(name, publisher)
+        if not found or found[0][1] < MIN_CONFIDENCE:
+            return Match(None, found[0][1] if found else 0.0, None, found)
+        if len(found) > 1 and found[0][1] - found[1][1] < AMBIGUITY_MARGIN:
+            return Match(None, found[0][1], "ambiguous", found)
+        return Match(found[0][0], found[0][1], "fuzzy", found)
+
+
+def report_matches(matches, source=None):
+    # Print what a sync could not resolve exactly. `matches` is [(name, Match)].
+    for _, m in matches:
+        count("refs_" + (m.method or "unresolved"), source=source)
+
+    fuzzy = [(name, m) for name, m in matches if m.method == "fuzzy"]
+    ambiguous = [(name, m) for name, m in matches if m.method == "ambiguous"]
+    unresolved = [name for name, m in matches if m.method is None]
+
+    for name, m in fuzzy:
+        print(f"Fuzzy matched {name} -> {m.ref} ({m.confidence})")
+    for name, m in ambiguous:
+        options = ", ".join(f"{ref} ({score})" for ref, score in m.candidates)
+        print(f"Skipping ambiguous match for {name}: {options}")
+    if unresolved:
+        print(f"Skipping {len(unresolved)} unresolved models: {', '.join(unresolved)}")
@@ -0,0 +1,101 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from run_report import stage
+from score_matrix import ScoreMatrix
+
+CURRENT_SCRIPT_PATH = Path(__file__).resolve()
+AGENT_DIR = CURRENT_SCRIPT_PATH.parent
+PROJECT_ROOT = AGENT_DIR.parent
+
+MODELS_DIR = PROJECT_ROOT / "src" / "content" / "models"
+BENCH_DIR = PROJECT_ROOT / "src" / "content" / "benchmarks"
+PUB_DIR = PROJECT_ROOT / "src" / "content" / "publishers"
+MODEL_STATS_FILE = PROJECT_ROOT / "src" / "content" / "model-stats.json"
+
+# Keep in step with BENCH_CATEGORIES in src/consts.ts
+BENCH_CATEGORIES = [
+    "Reasoning",
+    "Coding",
+    "Knowledge",
+    "Agent",
+    "Long-Context",
+    "Multi-Modal",
+]
+
+
+def js_round(value):
+    # Math.round in the site rounds halves up, Python's round() doesn't. Scores
+    # have two decimals, so trim float noise first to keep x.5 averages at x.5.
+    return np.floor(np.round(value, 6) + 0.5)
+
+
+def competition_ranks(items, higher_is_better=True):
+    # [(key, value)] -> {key: rank}, ties share the best rank ("1224")
+    keys = [key for key, _ in items]
+    matrix = ScoreMatrix(
+        keys, ["value"], [[value] for _, value in items], [higher_is_better]
+    )
+    return dict(zip(keys, matrix.ranks()[:, 0].tolist()))
+
+
+def compute_model_stats(index):
+    # Every aggregate comes out of one models x benchmarks matrix; only the
+    # JSON assembly below is per model.
+    scores = ScoreMatrix.from_benchmarks(index.benchmarks, models=index.models)
+    ranks = scores.ranks()
+    counts = scores.counts()
+    averages = js_round(np.nan_to_num(scores.means()))
+    bench_tags = {bench_id: b["tags"] for bench_id, b in index.benchmarks.items()}
+    radar = js_round(np.nan_to_num(scores.category_means(bench_tags, BENCH_CATEGORIES)))
+
+    stats = {}
+    for i, ref in enumerate(scores.models):
+        benches = [
+            {
+                "id": bench_id,
+                "name": index.benchmarks[bench_id]["name"],
+                "score": float(scores.values[i, j]),
+                "tags": index.benchmarks[bench_id]["tags"],
+                "rank": int(ranks[i, j]),
+            }
+            for j, bench_id in enumerate(scores.benchmarks)
+            if ranks[i, j]
+        ]
+
+        stats[ref] = {
+            "totalBenchmarks": int(counts[i]),
+            "averageScore": int(averages[i]),
+            "rank": None,
+            "radarData": [
+                {"subject": category, "A": int(radar[i, c]), "fullMark": 100}
+                for c, category in enumerate(BENCH_CATEGORIES)
+            ],
+            "participatedBenchmarks": sorted(benches, key=lambda b: -b["score"]),
+        }
+
+    # Overall rank by average score among models with at least one result
+    ranked = [
+        (ref, s["averageScore"]) for ref, s in stats.items() if s["totalBenchmarks"]
+    ]
+    for ref, rank in competition_ranks(ranked).items():
+        stats[ref]["rank"] = rank
+
+    return stats
+
+
+def build_model_stats(index, writer):
+    with stage("stats"):
+        stats = compute_model_stats(index)
+    writer.write(MODEL_STATS_FILE, stats)
+    print(f"Computed stats for {len(stats)} models")
+    return stats
+
+
+if __name__ == "__main__":
+    # Same as `benchai.py stats`
+    from benchai import main
+
+    sys.exit(main(["stats", *sys.argv[1:]]))
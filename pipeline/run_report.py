@@ -0,0 +1,203 @@
+import atexit
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from content_writer import atomic_write
+
+REPORT_DIR = Path(__file__).resolve().parent / ".cache"
+METRIC_PREFIX = "benchai_sync"
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+class RunReport:
+    # Timers and counters of one sync run. Stages and counters are keyed by
+    # name plus labels such as source="swe_verified"; repeated stages add up.
+    # Updates take a lock because sync_all fetches AA from a worker thread.
+    # A run that ends before finish_run() is reported as failed, in the
+    # innermost stage the last error went through.
+
+    def __init__(self, run="sync", prometheus_path=None):
+        self.run = run
+        self.prometheus_path = prometheus_path
+        self.started = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages = {}  # (name, labels) -> {"seconds", "calls"}
+        self.counters = {}  # (name, labels) -> value
+        self.finished = False
+        self.failed_stage = None  # (name, labels)
+        self._error = None
+
+    @contextmanager
+    def stage(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            # Outer stages see the same error, the innermost one is kept
+            with self._lock:
+                if e is not self._error:
+                    self._error = e
+                    self.failed_stage = _key(name, labels)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry = self.stages.setdefault(
+                    _key(name, labels), {"seconds": 0.0, "calls": 0}
+                )
+                entry["seconds"] += elapsed
+                entry["calls"] += 1
+
+    def count(self, name, value=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def to_dict(self):
+        def entries(items, value):
+            return [
+                {"name": name, "labels": dict(labels), **value(v)}
+                for (name, labels), v in sorted(items.items())
+            ]
+
+        report = {
+            "run": self.run,
+            "status": "complete" if self.finished else "failed",
+            "started": self.started.isoformat(timespec="seconds"),
+            "seconds": round(time.perf_counter() - self._start, 4),
+            "stages": entries(
+                self.stages,
+                lambda v: {"seconds": round(v["seconds"], 4), "calls": v["calls"]},
+            ),
+            "counters": entries(self.counters, lambda v: {"value": v}),
+        }
+        if not self.finished and self.failed_stage:
+            name, labels = self.failed_stage
+            report["failed_stage"] = {"name": name, "labels": dict(labels)}
+        return report
+
+    def write_json(self, path):
+        atomic_write(
+            Path(path),
+            json.dumps(self.to_dict(), indent=4, ensure_ascii=False).encode("utf-8"),
+        )
+
+    def write_prometheus(self, path):
+        # Textfile collector format, e.g. for node_exporter's textfile directory
+        report = self.to_dict()
+        run = (("run", self.run),)
+        lines = [
+            f"# TYPE {METRIC_PREFIX}_duration_seconds gauge",
+            f"{METRIC_PREFIX}_duration_seconds{_label_text(run)} {report['seconds']}",
+            f"# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge",
+            f"{METRIC_PREFIX}_last_run_timestamp_seconds{_label_text(run)} "
+            f"{int(self.started.timestamp())}",
+            f"# TYPE {METRIC_PREFIX}_success gauge",
+            f"{METRIC_PREFIX}_success{_label_text(run)} {int(self.finished)}",
+        ]
+        if not self.finished and self.failed_stage:
+            name, labels = self.failed_stage
+            text = _label_text(run + (("stage", name),) + labels)
+            lines.append(f"# TYPE {METRIC_PREFIX}_failed_stage gauge")
+            lines.append(f"{METRIC_PREFIX}_failed_stage{text} 1")
+        lines.append(f"# TYPE {METRIC_PREFIX}_stage_seconds gauge")
+        for (name, labels), v in sorted(self.stages.items()):
+            text = _label_text(run + (("stage", name),) + labels)
+            lines.append(f"{METRIC_PREFIX}_stage_seconds{text} {v['seconds']:.4f}")
+
+        for name in sorted({name for name, _ in self.counters}):
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for (other, labels), value in sorted(self.counters.items()):
+                if other == name:
+                    lines.append(f"{metric}{_label_text(run + labels)} {value}")
+
+        atomic_write(Path(path), ("\n".join(lines) + "\n").encode("utf-8"))
+
+    def summary(self):
+        # Slowest stages first, e.g. "render swe_verified 4.10s, fetch aa 1.20s"
+        parts = []
+        for (name, labels), entry in sorted(
+            self.stages.items(), key=lambda x: -x[1]["seconds"]
+        ):
+            label = "".join(f" {value}" for _, value in labels)
+            parts.append(f"{name}{label} {entry['seconds']:.2f}s")
+        return ", ".join(parts)
+
+
+# The report of the current run. The sync entry points replace it with
+# start_run() and every module records into it through stage() and count().
+_current = RunReport()
+_started = False
+
+
+def start_run(run, prometheus_path=None):
+    global _current, _started
+    _current = RunReport(run, prometheus_path)
+    _started = True
+    return _current
+
+
+def current_run():
+    return _current
+
+
+def stage(name, **labels):
+    return _current.stage(name, **labels)
+
+
+def count(name, value=1, **labels):
+    _current.count(name, value, **labels)
+
+
+def count_files(stats):
+    # Record the {"written", "skipped", "created"} stats of ContentWriter.commit
+    for kind, value in stats.items():
+        count(f"files_{kind}", value)
+
+
+def write_report(report_dir=REPORT_DIR):
+    # Always leaves <run>_report.json in the cache, the textfile only on request
+    _current.write_json(Path(report_dir) / f"{_current.run}_report.json")
+    if _current.prometheus_path:
+        _current.write_prometheus(_current.prometheus_path)
+
+
+def finish_run(prometheus_path=None, report_dir=REPORT_DIR):
+    _current.finished = True
+    if prometheus_path:
+        _current.prometheus_path = prometheus_path
+    write_report(report_dir)
+    print(f"Run report: {_current.summary()}")
+
+
+@atexit.register
+def _report_unfinished():
+    # A run cut short by sys.exit() or an uncaught error still leaves its
+    # report, marked failed
+    if not _started or _current.finished:
+        return
+    failed = ""
+    if _current.failed_stage:
+        name, labels = _current.failed_stage
+        failed = " in " + name + "".join(f" {value}" for _, value in labels)
+    write_report()
+    print(f"Run report (failed{failed}): {_current.summary()}")
@@ -0,0 +1,290 @@
+import argparse
+import json
+from datetime import date, datetime
+from pathlib import Path
+
+from content_index import ContentIndex
+from content_writer import atomic_write
+from run_report import count, stage
+
+CURRENT_SCRIPT_PATH = Path(__file__).resolve()
+AGENT_DIR = CURRENT_SCRIPT_PATH.parent
+PROJECT_ROOT = AGENT_DIR.parent
+
+MODELS_DIR = PROJECT_ROOT / "src" / "content" / "models"
+BENCH_DIR = PROJECT_ROOT / "src" / "content" / "benchmarks"
+PUB_DIR = PROJECT_ROOT / "src" / "content" / "publishers"
+HISTORY_DIR = AGENT_DIR / "history"
+
+# Scores are stored as integer hundredths, every source has at most 2 decimals
+SCALE = 100
+# Rewrite a log into one block per year once it has this many blocks
+COMPACT_AFTER = 64
+
+# One log per benchmark, one JSON line per block. A block is columnar and
+# delta-encoded against everything before it in the file:
+#
+#   start   first date of the block
+#   days    day offsets, each against the previous date (the first is 0)
+#   counts  number of changes on each date
+#   refs    modelRefs first seen in this block, appended to the file's
+#           dictionary so `ids` can refer to them by position
+#   ids     dictionary positions, sorted per date and stored as gaps
+#   scores  hundredths relative to the model's previous score, the absolute
+#           value for its first score, null when it left the leaderboard
+#
+# Replaying the blocks in order rebuilds any past leaderboard, so a daily sync
+# only appends the models whose score changed that day.
+
+
+def to_units(score):
+    return round(score * SCALE)
+
+
+def from_units(units):
+    return units / SCALE
+
+
+class ScoreHistory:
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def blocks(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def _decode(self, until=None):
+        # Yield (date, dictionary, model id, score in units or None) in order,
+        # stopping after `until`. The dictionary grows as blocks are read.
+        refs = []
+        current = {}
+        for block in self.blocks():
+            if until is not None and block["start"] > until:
+                return
+            refs.extend(block["refs"])
+
+            day = date.fromisoformat(block["start"])
+            ids = iter(block["ids"])
+            scores = iter(block["scores"])
+            for offset, n in zip(block["days"], block["counts"]):
+                day = date.fromordinal(day.toordinal() + offset)
+                day_str = day.isoformat()
+                if until is not None and day_str > until:
+                    return
+
+                model_id = 0
+                for i in range(n):
+                    gap = next(ids)
+                    model_id = gap if i == 0 else model_id + gap
+                    delta = next(scores)
+                    if delta is None:
+                        current.pop(model_id, None)
+                        yield day_str, refs, model_id, None
+                    else:
+                        current[model_id] = current.get(model_id, 0) + delta
+                        yield day_str, refs, model_id, current[model_id]
+
+    def events(self, until=None):
+        # Yield (date, modelRef, score or None) in order, stopping after `until`
+        for day, refs, model_id, units in self._decode(until):
+            yield day, refs[model_id], None if units is None else from_units(units)
+
+    def as_of(self, day=None):
+        # {modelRef: score} of the leaderboard on `day` (YYYY-MM-DD)
+        board = {}
+        for _, ref, score in self.events(until=day):
+            if score is None:
+                board.pop(ref, None)
+            else:
+                board[ref] = score
+        return board
+
+    def series(self, model_ref):
+        # [(date, score or None)] of every change for one model
+        return [(day, score) for day, ref, score in self.events() if ref == model_ref]
+
+    def dates(self):
+        # Every date with a change, oldest first
+        days = []
+        for day, _, _, _ in self._decode():
+            if not days or days[-1] != day:
+                days.append(day)
+        return days
+
+    def diff(self, since=None, until=None):
+        # [(modelRef, score on `since`, score on `until`)] of every model whose
+        # score differs between the two dates. None means absent; `since` None
+        # compares against an empty leaderboard.
+        old = self.as_of(since) if since else {}
+        new = self.as_of(until)
+        return sorted(
+            (ref, old.get(ref), new.get(ref))
+            for ref in old.keys() | new.keys()
+            if old.get(ref) != new.get(ref)
+        )
+
+    def _state(self):
+        # Last date, dictionary and current scores in units, as the next block
+        # sees them
+        last, refs, current = None, [], {}
+        for day, refs, model_id, units in self._decode():
+            last = day
+            if units is None:
+                current.pop(model_id, None)
+            else:
+                current[model_id] = units
+        return last, refs, current
+
+    def record(self, day, snapshot):
+        # Append the changes between the stored leaderboard and `snapshot`
+        # ([{"modelRef", "score"}]). Returns the number of changes.
+        last, refs, current = self._state()
+        if last is not None and day < last:
+            raise ValueError(f"{self.path.name}: {day} is before the last entry {last}")
+        positions = {ref: i for i, ref in enumerate(refs)}
+
+        board = {}
+        for item in snapshot:
+            # The first row wins, like the site's lookups
+            board.setdefault(item["modelRef"], to_units(item["score"]))
+
+        new_refs = [ref for ref in sorted(board) if ref not in positions]
+        for ref in new_refs:
+            positions[ref] = len(positions)
+        wanted = {positions[ref]: units for ref, units in board.items()}
+
+        changes = []
+        for model_id in sorted(wanted.keys() | current.keys()):
+            before = current.get(model_id)
+            after = wanted.get(model_id)
+            if after is None:
+                changes.append((model_id, None))
+            elif before is None:
+                changes.append((model_id, after))
+            elif after != before:
+                changes.append((model_id, after - before))
+
+        if not changes:
+            return 0
+
+        ids = [model_id for model_id, _ in changes]
+        block = {
+            "start": day,
+            "days": [0],
+            "counts": [len(changes)],
+            "refs": new_refs,
+            "ids": [ids[0]] + [b - a for a, b in zip(ids, ids[1:])],
+            "scores": [delta for _, delta in changes],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(block, separators=(",", ":")) + "\n")
+        return len(changes)
+
+    def compact(self):
+        # Merge the blocks into one per calendar year. The event sequence and
+        # its deltas don't change, only how they are split into lines.
+        merged = []
+        for block in self.blocks():
+            start = date.fromisoformat(block["start"])
+            block_days = []
+            day = start
+            for offset in block["days"]:
+                day = date.fromordinal(day.toordinal() + offset)
+                block_days.append(day)
+
+            target = merged[-1] if merged else None
+            if target is None or target["year"] != start.year:
+                target = {
+                    "year": start.year,
+                    "dates": [],
+                    "counts": [],
+                    "refs": [],
+                    "ids": [],
+                    "scores": [],
+                }
+                merged.append(target)
+
+            target["dates"].extend(block_days)
+            target["counts"].extend(block["counts"])
+            target["refs"].extend(block["refs"])
+            target["ids"].extend(block["ids"])
+            target["scores"].extend(block["scores"])
+
+        lines = []
+        for target in merged:
+            dates = target["dates"]
+            lines.append(
+                json.dumps(
+                    {
+                        "start": dates[0].isoformat(),
+                        "days": [0] + [(b - a).days for a, b in zip(dates, dates[1:])],
+                        "counts": target["counts"],
+                        "refs": target["refs"],
+                        "ids": target["ids"],
+                        "scores": target["scores"],
+                    },
+                    separators=(",", ":"),
+                )
+            )
+
+        atomic_write(self.path, "".join(line + "\n" for line in lines).encode("utf-8"))
+        return len(lines)
+
+    def block_count(self):
+        return sum(1 for _ in self.blocks())
+
+
+def history_for(bench_id, history_dir=HISTORY_DIR):
+    return ScoreHistory(Path(history_dir) / f"{bench_id}.jsonl")
+
+
+def record_history(index, day=None, history_dir=HISTORY_DIR):
+    # Log every benchmark's snapshot after a sync, dated by its lastUpdated
+    today = datetime.now().strftime("%Y-%m-%d")
+    changed = 0
+    with stage("history"):
+        for bench_id, bench in sorted(index.benchmarks.items()):
+            history = history_for(bench_id, history_dir)
+            changes = history.record(
+                day or bench.get("lastUpdated", today), bench.get("snapshot", [])
+            )
+            if changes:
+                count("history_changes", changes)
+                changed += 1
+                if history.block_count() > COMPACT_AFTER:
+                    history.compact()
+
+    print(f"Score history: {changed} of {len(index.benchmarks)} benchmarks changed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--benchmark", help="Benchmark id to query")
+    parser.add_argument("--model", help="Print the score history of this modelRef")
+    parser.add_argument(
+        "--as-of", help="Print the leaderboard on this date (YYYY-MM-DD)"
+    )
+    parser.add_argument("--compact", action="store_true", help="Compact every log")
+    args = parser.parse_args()
+
+    if args.compact:
+        for path in sorted(HISTORY_DIR.glob("*.jsonl")):
+            print(f"{path.name}: {ScoreHistory(path).compact()} blocks")
+    elif args.benchmark:
+        history = history_for(args.benchmark)
+        if args.model:
+            for day, score in history.series(args.model):
+                print(f"{day}  {'-' if score is None else score}")
+        else:
+            board = history.as_of(args.as_of)
+            for ref, score in sorted(board.items(), key=lambda x: (-x[1], x[0])):
+                print(f"{score:>8}  {ref}")
+    else:
+        # Record the current content tree
+        record_history(ContentIndex(MODELS_DIR, PUB_DIR, BENCH_DIR))
@@ -0,0 +1,183 @@
+import numpy as np
+
+
+class ScoreMatrix:
+    # Models x benchmarks score table. Missing results are NaN, rows follow the
+    # sorted modelRefs so index order doubles as the modelRef tie-break.
+
+    def __init__(self, models, benchmarks, values, higher_is_better=None):
+        self.models = list(models)
+        self.benchmarks = list(benchmarks)
+        self.values = np.asarray(values, dtype=np.float64)
+        if higher_is_better is None:
+            higher_is_better = np.ones(len(self.benchmarks), dtype=bool)
+        self.higher_is_better = np.asarray(higher_is_better, dtype=bool)
+
+        self.bench_pos = {bench_id: j for j, bench_id in enumerate(self.benchmarks)}
+        # (modelRef, benchmark id) of the entries from_entries() left out
+        self.duplicates = []
+
+    @classmethod
+    def from_entries(cls, entries, higher_is_better=None, models=None, benchmarks=None):
+        # `entries` are (modelRef, benchmark id, score); the first score wins
+        # and the later ones are listed in `duplicates`. `models` / `benchmarks`
+        # add rows / columns that may have no entries.
+        entries = list(entries)
+        model_list = sorted(set(models or ()) | {e[0] for e in entries})
+        bench_list = sorted(set(benchmarks or ()) | {e[1] for e in entries})
+
+        model_pos = {ref: i for i, ref in enumerate(model_list)}
+        bench_pos = {bench_id: j for j, bench_id in enumerate(bench_list)}
+
+        values = np.full((len(model_list), len(bench_list)), np.nan)
+        duplicates = []
+        if entries:
+            rows = np.fromiter((model_pos[e[0]] for e in entries), dtype=np.intp)
+            cols = np.fromiter((bench_pos[e[1]] for e in entries), dtype=np.intp)
+            scores = np.fromiter((e[2] for e in entries), dtype=np.float64)
+
+            _, first = np.unique(rows * len(bench_list) + cols, return_index=True)
+            values[rows[first], cols[first]] = scores[first]
+            if len(first) < len(entries):
+                kept = set(first.tolist())
+                duplicates = [e[:2] for i, e in enumerate(entries) if i not in kept]
+
+        better = None
+        if higher_is_better is not None:
+            better = [higher_is_better.get(b, True) for b in bench_list]
+
+        matrix = cls(model_list, bench_list, values, better)
+        matrix.duplicates = duplicates
+        return matrix
+
+    @classmethod
+    def from_benchmarks(cls, benchmarks, models=None):
+        # Build from benchmark JSON data keyed by id, e.g. ContentIndex.benchmarks.
+        # With `models`, rows outside that set are dropped.
+        entries = [
+            (item["modelRef"], bench_id, item["score"])
+            for bench_id, bench in benchmarks.items()
+            for item in bench.get("snapshot", [])
+            if models is None or item["modelRef"] in models
+        ]
+        higher_is_better = {
+            bench_id: bench.get("metrics", {}).get("isBetterHigher", True)
+            for bench_id, bench in benchmarks.items()
+        }
+        return cls.from_entries(
+            entries, higher_is_better, models=models, benchmarks=benchmarks
+        )
+
+    @property
+    def mask(self):
+        return ~np.isnan(self.values)
+
+    def counts(self):
+        return self.mask.sum(axis=1)
+
+    # Normalization
+
+    def normalized(self, decimals=2):
+        # Columns whose best score is <= 1.0 are fractions and become percentages
+        with np.errstate(invalid="ignore"):
+            column_max = np.nanmax(np.where(self.mask, self.values, -np.inf), axis=0)
+        factor = np.where(column_max <= 1.0, 100.0, 1.0)
+        scaled = self.values * factor
+        # Python's round() of each score, as the scores were always written.
+        # np.round can differ on halfway values, 66.815 -> 66.82 vs 66.81.
+        values = np.full_like(scaled, np.nan)
+        values[self.mask] = [round(x, decimals) for x in scaled[self.mask].tolist()]
+        return ScoreMatrix(self.models, self.benchmarks, values, self.higher_is_better)
+
+    # Ranking
+
+    def _sort_keys(self):
+        # Lower key is better, missing entries sort last
+        keys = np.where(self.higher_is_better, -self.values, self.values)
+        return np.where(self.mask, keys, np.inf)
+
+    def ranks(self):
+        # 1-based competition rank per column (ties share the best rank), 0
+        # where the model has no score
+        keys = self._sort_keys()
+        order = np.argsort(keys, axis=0, kind="stable")
+        sorted_keys = np.take_along_axis(keys, order, axis=0)
+
+        new_group = np.ones_like(sorted_keys, dtype=bool)
+        new_group[1:] = sorted_keys[1:] != sorted_keys[:-1]
+
+        positions = np.arange(len(self.models))[:, None]
+        starts = np.where(new_group, positions, 0)
+        sorted_ranks = np.maximum.accumulate(starts, axis=0) + 1
+
+        ranks = np.empty_like(sorted_ranks)
+        np.put_along_axis(ranks, order, sorted_ranks, axis=0)
+        return np.where(self.mask, ranks, 0)
+
+    # Aggregates
+
+    def means(self):
+        # Mean score per model, NaN without results
+        counts = self.counts()
+        sums = np.where(self.mask, self.values, 0.0).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, sums / counts, np.nan)
+
+    def category_means(self, bench_tags, categories):
+        # Mean per model over the benchmarks tagged with each category,
+        # shaped (models, categories)
+        membership = np.array(
+            [[c in bench_tags.get(b, ()) for c in categories] for b in self.benchmarks],
+            dtype=np.float64,
+        ).reshape(len(self.benchmarks), len(categories))
+
+        sums = np.where(self.mask, self.values, 0.0) @ membership
+        counts = self.mask.astype(np.float64) @ membership
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, sums / counts, np.nan)
+
+    def head_to_head(self, start=0, stop=None):
+        # Models start:stop against every model over the benchmarks both have a
+        # score for, each shaped (stop - start, models) with row i against
+        # column k: shared benchmarks, wins and losses of i, and the mean score
+        # of i minus that of k, negated where lower is better (0 when nothing
+        # is shared). Callers take the rows in blocks, the full matrix is
+        # models squared.
+        rows = slice(start, stop)
+        mask = self.mask
+        present = mask.astype(np.float64)
+        shared = present[rows] @ present.T
+
+        # A missing score is +inf on one side of a comparison and -inf on the
+        # other, so any comparison with it is false and no mask is needed
+        keys = self._sort_keys()
+        low = np.where(mask, keys, -np.inf)
+        # The smallest unsigned type that holds a count of every benchmark
+        counts = np.min_scalar_type(len(self.benchmarks))
+        wins = np.zeros(shared.shape, dtype=counts)
+        losses = np.zeros(shared.shape, dtype=counts)
+        compared = np.empty(shared.shape, dtype=bool)
+        for j in range(len(self.benchmarks)):
+            wins += np.less.outer(keys[rows, j], low[:, j], out=compared)
+            losses += np.greater.outer(low[rows, j], keys[:, j], out=compared)
+
+        # Summed in whole hundredths (scores have at most 2 decimals), which
+        # float64 adds exactly in any order, so a row comes out the same
+        # whatever block it is computed in
+        signed = np.where(self.higher_is_better, self.values, -self.values)
+        units = np.round(np.where(mask, signed, 0.0) * 100)
+        differences = units[rows] @ present.T - present[rows] @ units.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            deltas = np.where(shared > 0, differences / shared / 100, 0.0)
+
+        return shared.astype(counts), wins, losses, deltas
+
+    def column(self, bench_id):
+        # [(modelRef, score)] of one benchmark, best first. Like sorting by
+        # (score, modelRef) with reverse=isBetterHigher, which the AA sync uses.
+        j = self.bench_pos[bench_id]
+        rows = np.flatnonzero(self.mask[:, j])
+        rows = rows[np.lexsort((rows, self.values[rows, j]))]
+        if self.higher_is_better[j]:
+            rows = rows[::-1]
+        return [(self.models[i], float(self.values[i, j])) for i in rows]
@@ -0,0 +1,235 @@
+import asyncio
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+from run_report import count, stage
+
+# Read the rows of the first table matching the selector. Cell text is built the
+# same way as BeautifulSoup's `get_text(strip=True)` so both modes agree.
+EXTRACT_ROWS_JS = """
+(selector) => {
+  const table = document.querySelector(selector);
+  if (!table) return null;
+  const body = table.querySelector("tbody");
+  if (!body) return [];
+
+  const text = (el) => {
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    let out = "";
+    while (walker.nextNode()) out += walker.currentNode.nodeValue.trim();
+    return out;
+  };
+
+  return Array.from(body.querySelectorAll("tr"), (row) => ({
+    classes: Array.from(row.classList),
+    tags: row.getAttribute("data-tags") || "",
+    cells: Array.from(row.querySelectorAll("td"), text),
+  }));
+}
+"""
+
+
+# Defaults for every source, each sync script can override them in its SCRAPE_PROFILE
+DEFAULT_PROFILE = {
+    "timeout": 30000,  # ms for navigation and for the table to settle
+    "retries": 2,  # extra attempts after the first failure
+    "block_resources": True,
+    "stable_polls": 3,  # identical row counts in a row before the table is ready
+    "poll_interval": 250,  # ms between row counts
+    "table": "table",  # CSS selector of the leaderboard table
+}
+
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "plausible.io",
+    "hotjar.com",
+    "segment.io",
+)
+
+COUNT_ROWS_JS = """
+(selector) => {
+  const table = document.querySelector(selector);
+  const body = table && table.querySelector("tbody");
+  return body ? body.querySelectorAll("tr:not(.no-results)").length : -1;
+}
+"""
+
+
+def scrape_profile(overrides=None):
+    return {**DEFAULT_PROFILE, **(overrides or {})}
+
+
+async def block_non_essential(route):
+    request = route.request
+    host = urlsplit(request.url).hostname or ""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or host.endswith(BLOCKED_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def wait_for_stable_rows(page, profile):
+    # The table element shows up before the leaderboard script fills it, so
+    # wait until the row count stops changing instead of for <table> alone.
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + profile["timeout"] / 1000
+    last_count = None
+    stable = 0
+
+    while True:
+        count = await page.evaluate(COUNT_ROWS_JS, profile["table"])
+        if count > 0 and count == last_count:
+            stable += 1
+            if stable >= profile["stable_polls"]:
+                return count
+        else:
+            stable = 0
+        last_count = count
+
+        if loop.time() > deadline:
+            raise TimeoutError(
+                f"Table rows did not settle within {profile['timeout']}ms "
+                f"(last count {count})"
+            )
+        await asyncio.sleep(profile["poll_interval"] / 1000)
+
+
+@asynccontextmanager
+async def open_browser():
+    # One headless chromium shared by every page opened inside the block.
+    # Playwright is only imported here, commands that never render skip it.
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            yield browser
+        finally:
+            await browser.close()
+
+
+@asynccontextmanager
+async def open_page(browser, url, profile):
+    # `browser` may also be a BrowserContext, both hand out pages the same way
+    page = await browser.new_page()
+    try:
+        if profile["block_resources"]:
+            await page.route("**/*", block_non_essential)
+
+        response = await page.goto(
+            url, wait_until="domcontentloaded", timeout=profile["timeout"]
+        )
+        if response is not None:
+            body = await response.body()
+            count("bytes_downloaded", len(body), source=urlsplit(url).hostname)
+        await wait_for_stable_rows(page, profile)
+        yield page
+    finally:
+        await page.close()
+
+
+async def render_page(browser, url, profile):
+    async with open_page(browser, url, profile) as page:
+        return await page.content()
+
+
+async def extract_rows(browser, url, profile):
+    async with open_page(browser, url, profile) as page:
+        return await page.evaluate(EXTRACT_ROWS_JS, profile["table"])
+
+
+def html_rows(html_content, selector="table"):
+    # BeautifulSoup fallback producing the same rows as EXTRACT_ROWS_JS
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, "html.parser")
+
+    target_table = soup.select_one(selector)
+    if not target_table:
+        return None
+
+    body = target_table.find("tbody")
+    if not body:
+        return []
+
+    return [
+        {
+            "classes": row.get("class", []),
+            "tags": row.get("data-tags", ""),
+            "cells": [td.get_text(strip=True) for td in row.find_all("td")],
+        }
+        for row in body.find_all("tr")
+    ]
+
+
+async def scrape_rows(browser, url, mode="dom", profile=None):
+    # mode "dom" reads the rows inside the page, "soup" parses the whole HTML
+    from playwright.async_api import Error as PlaywrightError
+
+    profile = scrape_profile(profile)
+    if mode not in ("dom", "soup"):
+        raise ValueError(f"Unknown extract mode: {mode}")
+
+    attempt = 0
+    while True:
+        try:
+            with stage("render", source=url):
+                if mode == "dom":
+                    rows = await extract_rows(browser, url, profile)
+                else:
+                    html_content = await render_page(browser, url, profile)
+                    rows = html_rows(html_content, profile["table"])
+            break
+        except (PlaywrightError, TimeoutError) as e:
+            attempt += 1
+            if attempt > profile["retries"]:
+                raise
+            count("render_retries", source=url)
+            print(f"Retrying {url} ({attempt}/{profile['retries']}): {e}")
+            await asyncio.sleep(attempt)
+
+    if rows is None:
+        raise LookupError(f"Could not find the result table on {url}")
+    return rows
+
+
+async def scrape_pool(browser, jobs, size=4, return_exceptions=False):
+    # Scrape several pages in tabs of one browser context, `size` at a time.
+    # Returns the rows of each job in order; with `return_exceptions`, a job
+    # that failed gives its exception instead of failing them all.
+    context = await browser.new_context()
+    semaphore = asyncio.Semaphore(size)
+
+    async def run(url, mode, profile):
+        async with semaphore:
+            return await scrape_rows(context, url, mode, profile)
+
+    try:
+        return await asyncio.gather(
+            *(run(*job) for job in jobs), return_exceptions=return_exceptions
+        )
+    finally:
+        await context.close()
+
+
+async def scrape_many(jobs):
+    # `jobs` is a list of (url, mode, profile) tuples scraped in one browser
+    async with open_browser() as browser:
+        return await asyncio.gather(
+            *(scrape_rows(browser, url, mode, profile) for url, mode, profile in jobs)
+        )
+
+
+def fetch_rows(url, mode="dom", profile=None):
+    return asyncio.run(scrape_many([(url, mode, profile)]))[0]
+
+
+def fetch_pool(jobs, size=4, return_exceptions=False):
+    async def run():
+        async with open_browser() as browser:
+            return await scrape_pool(browser, jobs, size, return_exceptions)
+
+    return asyncio.run(run())
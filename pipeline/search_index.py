@@ -0,0 +1,109 @@
+from pathlib import Path
+
+from content_writer import CompactJson
+from run_report import stage
+
+CURRENT_SCRIPT_PATH = Path(__file__).resolve()
+AGENT_DIR = CURRENT_SCRIPT_PATH.parent
+PROJECT_ROOT = AGENT_DIR.parent
+
+MODEL_INDEX_FILE = PROJECT_ROOT / "src" / "content" / "model-index.json"
+
+# Every substring up to this length is indexed. A longer query intersects the
+# postings of its GRAM-grams and the candidates are checked against the text.
+GRAM = 3
+WORD_BITS = 32
+
+# Query index for the model list (src/utils/searchIndex.ts reads it), so the
+# page answers a search by intersecting postings instead of scanning names.
+# Models are numbered by their position in `ids`.
+#
+#   names       display names, to confirm matches of queries longer than GRAM
+#   grams       lowercase substring -> model numbers as gaps
+#   publishers  publisher name -> bitset of its models
+#   order       "score", "date" and each category -> model numbers, best first
+
+
+def grams(text, size=GRAM):
+    text = text.lower()
+    return {
+        text[i : i + n] for n in range(1, size + 1) for i in range(len(text) - n + 1)
+    }
+
+
+def gaps(numbers):
+    previous = 0
+    encoded = []
+    for n in numbers:
+        encoded.append(n - previous)
+        previous = n
+    return encoded
+
+
+def bitset(numbers, size):
+    words = [0] * ((size + WORD_BITS - 1) // WORD_BITS)
+    for n in numbers:
+        words[n // WORD_BITS] |= 1 << (n % WORD_BITS)
+    return words
+
+
+def compute_search_index(index, stats):
+    ids = sorted(index.models)
+    size = len(ids)
+    names = [index.models[ref]["name"] for ref in ids]
+
+    postings = {}
+    for n, ref in enumerate(ids):
+        # The name and the slug, not the publisher part of the id, which would
+        # match every model of a publisher
+        for gram in grams(names[n]) | grams(ref.rsplit("/", 1)[-1]):
+            postings.setdefault(gram, []).append(n)
+
+    by_publisher = {}
+    for n, ref in enumerate(ids):
+        publisher = index.publishers.get(index.models[ref]["publisher"])
+        name = publisher["name"] if publisher else index.models[ref]["publisher"]
+        by_publisher.setdefault(name, []).append(n)
+
+    empty = {"averageScore": 0, "radarData": [], "participatedBenchmarks": []}
+    model_stats = [stats.get(ref, empty) for ref in ids]
+    categories = [r["subject"] for s in stats.values() for r in s["radarData"]]
+    categories = list(dict.fromkeys(categories))
+
+    radar = [{r["subject"]: r["A"] for r in s["radarData"]} for s in model_stats]
+
+    # Ties keep id order. Models without a release date go last.
+    order = {
+        "score": sorted(range(size), key=lambda n: -model_stats[n]["averageScore"]),
+        "date": sorted(
+            range(size),
+            key=lambda n: index.models[ids[n]].get("releaseDate") or "",
+            reverse=True,
+        ),
+    }
+    for category in categories:
+        order[category] = sorted(range(size), key=lambda n: -radar[n].get(category, 0))
+
+    return CompactJson(
+        {
+            "gram": GRAM,
+            "ids": ids,
+            "names": names,
+            "grams": {gram: gaps(postings[gram]) for gram in sorted(postings)},
+            "publishers": {
+                name: bitset(numbers, size)
+                for name, numbers in sorted(by_publisher.items())
+            },
+            "order": order,
+        }
+    )
+
+
+def build_search_index(index, stats, writer):
+    with stage("search_index"):
+        search_index = compute_search_index(index, stats)
+    writer.write(MODEL_INDEX_FILE, search_index)
+    print(
+        f"Indexed {len(search_index['ids'])} models, "
+        f"{len(search_index['grams'])} grams"
+    )
@@ -5,9 +5,28 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
-import requests
 from dotenv import load_dotenv
 
+from change_journal import (
+    diff_states,
+    fingerprint,
+    load_state,
+    summarize,
+)
+from content_index import ContentIndex, read_json
+from content_records import Benchmark, Model, Publisher, SnapshotEntry
+from content_validator import check_writes
+from content_writer import ContentWriter, atomic_write
+from http_cache import ResponseCache, conditional_download
+from json_stream import iter_file_array
+from leaderboard_views import build_leaderboard_views
+from logo_sprite import UNKNOWN_LOGO, logo_for
+from model_stats import build_model_stats
+from run_report import count, count_files, finish_run, stage, start_run
+from score_history import record_history
+from score_matrix import ScoreMatrix
+from search_index import build_search_index
+
 CURRENT_SCRIPT_PATH = Path(__file__).resolve()
 AGENT_DIR = CURRENT_SCRIPT_PATH.parent
 PROJECT_ROOT = AGENT_DIR.parent
@@ -17,6 +36,13 @@ load_dotenv(AGENT_DIR / ".env")
 MODELS_DIR = PROJECT_ROOT / "src" / "content" / "models"
 BENCH_DIR = PROJECT_ROOT / "src" / "content" / "benchmarks"
 PUB_DIR = PROJECT_ROOT / "src" / "content" / "publishers"
+# Digest of the payload the content was built from and the fingerprints of
+# its models and benchmarks. It is committed along with the content, so it
+# always describes the checked-out tree: a sync whose pull request never
+# merged, or was reverted, is redone in full next time.
+SYNC_FILE = PROJECT_ROOT / "src" / "content" / "aa-sync.json"
+CACHE_DIR = AGENT_DIR / ".cache"
+JOURNAL_FILE = CACHE_DIR / "aa_journal.json"
 
 AA_LLM_URL = "https://artificialanalysis.ai/api/v2/data/llms/models"
 AA_API_KEY = os.environ.get("ARTIFICIAL_ANALYSIS_API_KEY")
@@ -24,6 +50,7 @@ HEADERS = {
     "x-api-key": AA_API_KEY,
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
 }
+RESPONSE_CACHE = ResponseCache(CACHE_DIR)
 
 BENCHMARK_METADATA = {
     "artificial_analysis_intelligence_index": {
@@ -180,44 +207,72 @@ def slugify(text):
     return text.strip("-").strip(".")
 
 
-def load_json_safe(path):
-    if path.exists():
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return {}
-    return {}
-
+class FetchError(Exception):
+    # No usable AA payload. Raised rather than exiting, so sync_all can run
+    # this in a worker thread and handle it like any other failed source.
+    pass
 
-def save_json(path, data):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
 
+def fetch_llm_data(replay=False, force=False, stream=False, url=AA_LLM_URL):
+    # Returns None when the payload is the one the checked-out content was
+    # built from, see SYNC_FILE.
+    # With `stream`, models are decoded one at a time from the cached body
+    # instead of parsing the whole payload up front.
+    if replay:
+        body_path = RESPONSE_CACHE.body_path(url)
+        if body_path is None:
+            raise FetchError("No cached payload to replay")
+        print("Replaying cached data from Artificial Analysis...")
 
-def sync_llm_data():
-    print("Start syncing llm data from Artificial Analysis...")
+    else:
+        if not AA_API_KEY:
+            raise FetchError("No API KEY is available")
 
-    if not AA_API_KEY:
-        print("Error: No API KEY is available")
-        sys.exit(1)
+        try:
+            # Timeouts, 5xx and 429 are retried with backoff by the shared client
+            print("Requesting data from Artificial Analysis...")
+            with stage("fetch", source="aa"):
+                body_path = conditional_download(url, HEADERS, RESPONSE_CACHE)
+        except Exception as e:
+            raise FetchError(f"Network error: {e}") from e
+
+        synced = read_json(SYNC_FILE).get("payload")
+        if (
+            not force
+            and synced
+            and RESPONSE_CACHE.load_meta(url).get("sha256") == synced
+        ):
+            print("No upstream change since last sync")
+            return None
+
+    if stream:
+        print(f"Streaming model data from {body_path.name}")
+        return iter_file_array(body_path, "data")
 
     try:
-        print("Requesting data from Artificial Analysis...")
-        response = requests.get(AA_LLM_URL, headers=HEADERS)
-        response.raise_for_status()
-        llmData = response.json().get("data")
+        with stage("parse", source="aa"):
+            llmData = json.loads(body_path.read_bytes()).get("data")
         print(f"Get {len(llmData)} model data")
 
     except Exception as e:
-        print("Network error:", e)
-        sys.exit(1)
+        raise FetchError(f"Invalid payload: {e}") from e
+
+    return llmData
+
+
+def build_llm_data(llmData, index, writer, previous=None):
+    # With the fingerprints of the last run in `previous`, models and benchmarks
+    # whose inputs are unchanged are left alone. Returns this run's fingerprints.
+    previous_models = (previous or {}).get("models", {})
+    previous_benchmarks = (previous or {}).get("benchmarks", {})
+    state = {"models": {}, "benchmarks": {}}
 
     bench_results = {}
     today_str = datetime.now().strftime("%Y-%m-%d")
+    parsed = 0
 
     for model in llmData:
+        parsed += 1
         model_name = model.get("name")
         raw_model_slug = model.get("slug")
 
@@ -229,112 +284,217 @@ def sync_llm_data():
 
         model_ref_id = f"{publisher_slug}/{model_slug}"
 
-        # Update / Create Publisher information
-        pub_file = PUB_DIR / f"{publisher_slug}.json"
-        existing_pub = load_json_safe(pub_file)
-
-        new_pub_data = {
-            "name": publisher_name,
-            "color": existing_pub.get("color", "#94a3b8"),
-            "logo": existing_pub.get("logo", "/logos/unknown.svg"),
-            "website": model.get("model_creator", {}).get("website", ""),
+        evaluations = {
+            bench_id: float(score)
+            for bench_id, score in model.get("evaluations", {}).items()
+            if score is not None and bench_id != "aime"
         }
 
-        save_json(pub_file, new_pub_data)
-
-        # Update / Create Model information
-        model_dir = MODELS_DIR / publisher_slug
-        model_file = model_dir / f"{model_slug}.json"
-        existing_model = load_json_safe(model_file)
-
-        new_model_data = {
+        model_id = model.get("id") or model_ref_id
+        model_hash = fingerprint(
+            [
+                model_name,
+                model_ref_id,
+                model.get("model_creator", {}),
+                model.get("release_date", ""),
+                evaluations,
+            ]
+        )
+        state["models"][model_id] = {
+            "ref": model_ref_id,
             "name": model_name,
-            "publisher": publisher_slug,
-            "releaseDate": model.get("release_date", ""),
-            "params": str(existing_model.get("params", "")),
-            "license": existing_model.get("license", ""),
-            "website": existing_model.get("website", ""),
-            "discussionId": existing_model.get("discussionId", ""),
+            "hash": model_hash,
+            "scores": evaluations,
         }
 
-        save_json(model_file, new_model_data)
-
-        # Update / Create Benchmark information
-        eval = model.get("evaluations", {})
-        for bench_id, score in eval.items():
-            if score is None:
-                continue
-            if bench_id == "aime":
-                continue
-
+        for bench_id, score in evaluations.items():
             if bench_id not in bench_results:
                 bench_results[bench_id] = []
 
             bench_results[bench_id].append(
-                {"modelRef": model_ref_id, "raw_score": float(score)}
+                {"modelRef": model_ref_id, "raw_score": score}
             )
 
+        if previous_models.get(model_id, {}).get(
+            "hash"
+        ) == model_hash and index.has_model(model_ref_id):
+            count("models_unchanged", source="aa")
+            continue
+
+        # Update / Create Publisher information
+        pub_file = PUB_DIR / f"{publisher_slug}.json"
+        existing_pub = index.get_publisher(publisher_slug) or {}
+        logo = existing_pub.get("logo") or logo_for(publisher_slug)
+        if logo is None:
+            print(
+                f"No logo for publisher {publisher_slug}, add "
+                f"public/logos/{publisher_slug}.svg and run benchai.py logos"
+            )
+            count("publishers_without_logo", source="aa")
+            logo = logo_for("unknown") or UNKNOWN_LOGO
+
+        new_pub_data = Publisher(
+            name=publisher_name,
+            color=existing_pub.get("color", "#94a3b8"),
+            logo=logo,
+            website=model.get("model_creator", {}).get("website", ""),
+        )
+
+        writer.write(pub_file, new_pub_data)
+        index.add_publisher(publisher_slug, new_pub_data)
+
+        # Update / Create Model information
+        model_dir = MODELS_DIR / publisher_slug
+        model_file = model_dir / f"{model_slug}.json"
+        existing_model = index.get_model(model_ref_id) or {}
+
+        new_model_data = Model(
+            name=model_name,
+            publisher=publisher_slug,
+            releaseDate=model.get("release_date", ""),
+            params=str(existing_model.get("params", "")),
+            license=existing_model.get("license", ""),
+            website=existing_model.get("website", ""),
+            discussionId=existing_model.get("discussionId", ""),
+        )
+
+        writer.write(model_file, new_model_data)
+        index.add_model(model_ref_id, new_model_data)
+
+    count("rows_parsed", parsed, source="aa")
+
+    # Normalize and sort every benchmark at once. A benchmark is multiplied by
+    # 100 only when its biggest score is <= 1.0, instead of each score on its own.
+    with stage("normalize", source="aa"):
+        matrix = ScoreMatrix.from_entries(
+            (
+                (item["modelRef"], bench_id, item["raw_score"])
+                for bench_id, snapshot in bench_results.items()
+                for item in snapshot
+            ),
+            higher_is_better={
+                bench_id: meta["metrics"].get("isBetterHigher", True)
+                for bench_id, meta in BENCHMARK_METADATA.items()
+            },
+        )
+        scores = matrix.normalized()
+    # A model listed twice by the API keeps its first score per benchmark
+    for model_ref, bench_id in matrix.duplicates:
+        print(f"Warning: duplicate {bench_id} score for {model_ref}, keeping the first")
+    count("duplicate_scores", len(matrix.duplicates), source="aa")
+
     print("Updating benchmarks...")
     for bench_id, snapshot in bench_results.items():
         meta = BENCHMARK_METADATA.get(bench_id)
 
-        max_score_in_bench = max(item["raw_score"] for item in snapshot)
-        should_multiply = max_score_in_bench <= 1.0
-
         if not meta:
             print(f"Skipping unknown benchmark from API: {bench_id}")
             continue
 
-        # Fixed logic: multiply 100 only when the biggest score <= 1.0 instead of each one
-        for item in snapshot:
-            final_score = item["raw_score"]
-            if should_multiply:
-                final_score *= 100
-
-            item["score"] = round(final_score, 2)
-            del item["raw_score"]
+        bench_hash = fingerprint([meta, snapshot])
+        state["benchmarks"][bench_id] = bench_hash
+        if previous_benchmarks.get(bench_id) == bench_hash and index.get_benchmark(
+            bench_id
+        ):
+            continue
 
         bench_file = BENCH_DIR / f"{bench_id}.json"
-        existing_bench_data = load_json_safe(bench_file)
+        existing_bench_data = index.get_benchmark(bench_id) or {}
         existing_trending = existing_bench_data.get(
             "trending", {"views": 0, "initialWeight": 1000}
         )
 
-        output_data = {
-            "name": meta["name"],
-            "fullName": meta.get("fullName"),
-            "publisher": meta.get("publisher"),
-            "description": meta["description"],
-            "link": meta["link"],
-            "tags": meta["tags"],
-            "lastUpdated": today_str,
-            "metrics": meta["metrics"],
-            "isFromAA": meta.get("isFromAA", False),
-            "AALink": meta.get("AALink"),
-            "trending": existing_trending,
-            "snapshot": sorted(
-                snapshot,
-                key=lambda x: (x["score"], x["modelRef"]),
-                reverse=meta["metrics"].get("isBetterHigher", True),
-            ),
-        }
-
-        def get_core_content(data):
-            cp = data.copy()
-
-            return cp.get("snapshot", None)
+        output_data = Benchmark(
+            name=meta["name"],
+            fullName=meta.get("fullName"),
+            publisher=meta.get("publisher"),
+            description=meta["description"],
+            link=meta["link"],
+            tags=meta["tags"],
+            lastUpdated=today_str,
+            metrics=meta["metrics"],
+            isFromAA=meta.get("isFromAA", False),
+            AALink=meta.get("AALink"),
+            trending=existing_trending,
+            snapshot=[
+                SnapshotEntry(model_ref, score)
+                for model_ref, score in scores.column(bench_id)
+            ],
+        )
 
-        if get_core_content(output_data) == get_core_content(existing_bench_data):
-            output_data["lastUpdated"] = existing_bench_data.get(
-                "lastUpdated", today_str
-            )
+        if output_data.snapshot == existing_bench_data.get("snapshot"):
+            output_data.lastUpdated = existing_bench_data.get("lastUpdated", today_str)
         else:
             print(f"Update occurs for {bench_id}")
 
-        save_json(bench_file, output_data)
+        writer.write(bench_file, output_data)
+        index.add_benchmark(bench_id, output_data)
+
+    return state
+
+
+def write_synced(writer, state, url=AA_LLM_URL):
+    # Goes out in the same commit as the content built from the payload
+    writer.write(
+        SYNC_FILE, {"payload": RESPONSE_CACHE.load_meta(url).get("sha256"), **state}
+    )
+
+
+def record_changes(previous, state):
+    # What changed since the content was last synced
+    changes = diff_states(previous, state)
+    journal = {"date": datetime.now().strftime("%Y-%m-%d"), **changes}
+    atomic_write(
+        JOURNAL_FILE, json.dumps(journal, indent=4, ensure_ascii=False).encode("utf-8")
+    )
+
+    print(f"Change journal: {summarize(changes)}")
 
+
+def sync_llm_data(
+    replay=False,
+    force=False,
+    incremental=False,
+    stream=False,
+    prometheus=None,
+    url=AA_LLM_URL,
+):
+    start_run("sync_aa_data", prometheus)
+    print("Start syncing llm data from Artificial Analysis...")
+    try:
+        llmData = fetch_llm_data(replay=replay, force=force, stream=stream, url=url)
+    except FetchError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if llmData is None:
+        print("Sync skipped")
+        finish_run()
+        return
+
+    index = ContentIndex(MODELS_DIR, PUB_DIR, BENCH_DIR)
+    writer = ContentWriter()
+    previous = load_state(SYNC_FILE)
+    with stage("build", source="aa"):
+        state = build_llm_data(
+            llmData, index, writer, previous=previous if incremental else None
+        )
+
+    write_synced(writer, state, url)
+    stats = build_model_stats(index, writer)
+    build_search_index(index, stats, writer)
+    build_leaderboard_views(index, writer)
+    with stage("validate"):
+        check_writes(writer, index)
+    with stage("write"):
+        count_files(writer.commit())
+    record_history(index)
+    record_changes(previous, state)
+    finish_run()
     print("Sync complete")
 
 
 if __name__ == "__main__":
-    sync_llm_data()
+    # Same as `benchai.py sync aa`
+    from benchai import main
+
+    sys.exit(main(["sync", "aa", *sys.argv[1:]]))
@@ -0,0 +1,133 @@
+import asyncio
+import sys
+
+from change_journal import load_state
+from content_index import ContentIndex
+from content_validator import check_writes
+from content_writer import ContentWriter
+from leaderboard_views import build_leaderboard_views
+from model_stats import build_model_stats
+from run_report import count, count_files, finish_run, stage, start_run
+from score_history import record_history
+from scraper import open_browser, scrape_pool, scrape_rows
+from search_index import build_search_index
+from sync_aa_data import (
+    BENCH_DIR,
+    MODELS_DIR,
+    PUB_DIR,
+    SYNC_FILE,
+    build_llm_data,
+    fetch_llm_data,
+    record_changes,
+    write_synced,
+)
+from sync_swe_data import SWE_LEADERBOARDS, build_swe_leaderboards, swe_jobs
+from sync_tau_data import EXTRACT_MODE as TAU_EXTRACT_MODE
+from sync_tau_data import SCRAPE_PROFILE as TAU_SCRAPE_PROFILE
+from sync_tau_data import TAU_URL, build_tau_data
+
+
+async def scrape_leaderboards():
+    # Every leaderboard renders in tabs of the same browser
+    async with open_browser() as browser:
+        return await asyncio.gather(
+            scrape_pool(browser, swe_jobs(), return_exceptions=True),
+            scrape_rows(browser, TAU_URL, TAU_EXTRACT_MODE, TAU_SCRAPE_PROFILE),
+            return_exceptions=True,
+        )
+
+
+async def fetch_all(replay=False, force=False, stream=False):
+    # The AA request runs in a worker thread while the leaderboards render, so
+    # the wait is bounded by the slowest source. Each source comes back as its
+    # data or as the exception that stopped it, a browser that doesn't start
+    # stops only the leaderboards.
+    llmData, scraped = await asyncio.gather(
+        asyncio.to_thread(fetch_llm_data, replay, force, stream),
+        scrape_leaderboards(),
+        return_exceptions=True,
+    )
+    if isinstance(scraped, Exception):
+        scraped = (scraped, scraped)
+    swe_results, tau_rows = scraped
+    if isinstance(swe_results, Exception):
+        swe_results = [swe_results] * len(SWE_LEADERBOARDS)
+
+    return llmData, dict(zip(SWE_LEADERBOARDS, swe_results)), tau_rows
+
+
+def skip_source(source, error, failed):
+    # The source keeps its current content, the others still update
+    print(f"Skipping {source}: {error}")
+    count("sources_failed", source=source)
+    failed.append(source)
+
+
+def sync_all(
+    replay=False, force=False, incremental=False, stream=False, prometheus=None
+):
+    start_run("sync_all", prometheus)
+    print("Fetching all sources...")
+    with stage("fetch"):
+        llmData, swe_leaderboards, tau_rows = asyncio.run(
+            fetch_all(replay, force, stream)
+        )
+
+    index = ContentIndex(MODELS_DIR, PUB_DIR, BENCH_DIR)
+    writer = ContentWriter()
+    failed = []
+
+    # AA goes first so the scraped leaderboards resolve against its new models
+    previous = load_state(SYNC_FILE)
+    state = None
+    if isinstance(llmData, Exception):
+        skip_source("aa", llmData, failed)
+    elif llmData is not None:
+        try:
+            with stage("build", source="aa"):
+                state = build_llm_data(
+                    llmData, index, writer, previous=previous if incremental else None
+                )
+        except Exception as e:
+            # Whatever the build got through is dropped, the leaderboards
+            # resolve against the checked-out models instead
+            skip_source("aa", e, failed)
+            state = None
+            index = ContentIndex(MODELS_DIR, PUB_DIR, BENCH_DIR)
+            writer = ContentWriter()
+        else:
+            write_synced(writer, state)
+
+    built = build_swe_leaderboards(swe_leaderboards, index, writer)
+    if built < len(swe_leaderboards):
+        failed.append("swe")
+    try:
+        if isinstance(tau_rows, Exception):
+            raise tau_rows
+        build_tau_data(tau_rows, index, writer)
+    except Exception as e:
+        skip_source("tau", e, failed)
+
+    stats = build_model_stats(index, writer)
+    build_search_index(index, stats, writer)
+    build_leaderboard_views(index, writer)
+    with stage("validate"):
+        check_writes(writer, index)
+    with stage("write"):
+        count_files(writer.commit())
+    record_history(index)
+    if state is not None:
+        record_changes(previous, state)
+    if failed:
+        # What did sync is written, the run still fails so it gets noticed
+        print(f"Sync incomplete, skipped: {', '.join(failed)}")
+        sys.exit(1)
+    finish_run()
+    print("All sources sync completed")
+
+
+if __name__ == "__main__":
+    # Same as `benchai.py sync all`
+    from benchai import main
+
+    sys.exit(main(["sync", "all", *sys.argv[1:]]))
@@ -1,16 +1,24 @@
-import json
-import os
-import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
-import requests
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
-
-SWE_URL = "https://www.swebench.com/index.html"
-HEADERS = { "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}
+from content_index import ContentIndex
+from content_records import Benchmark, SnapshotEntry
+from content_validator import check_writes
+from content_writer import ContentWriter
+from leaderboard_views import build_leaderboard_views
+from model_resolver import ModelResolver, report_matches
+from model_stats import build_model_stats
+from run_report import count, count_files, finish_run, stage, start_run
+from score_history import record_history
+from scraper import fetch_pool
+from search_index import build_search_index
+
+SWE_BASE_URL = "https://www.swebench.com/"
+# "dom" extracts the rows inside the browser, "soup" parses the page with BeautifulSoup
+EXTRACT_MODE = "dom"
+# Overrides for scraper.DEFAULT_PROFILE
+SCRAPE_PROFILE = {"timeout": 30000, "retries": 2}
 
 CURRENT_SCRIPT_PATH = Path(__file__).resolve()
 AGENT_DIR = CURRENT_SCRIPT_PATH.parent
@@ -30,113 +38,86 @@ SWE_META = {
         "metrics": {"unit": "% Resolved", "isBetterHigher": True},
         }
 
-PUBLISHER_TABULAR = {
-        "Google DeepMind": "Google",
-        "Qwen": "Alibaba",
-        "Z.ai": "Zai",
-        "Moonshot AI": "Kimi"
+SWE_VERIFIED_META = {
+        **SWE_META,
+        "name": "SWE-bench Verified",
+        "description": "A human-validated subset of 500 SWE-bench tasks confirmed by software engineers to have clear issue descriptions and reliable tests, so resolved rates reflect real problem solving",
+        "link": "https://www.swebench.com/verified.html",
         }
 
-MODEL_TABULAR = {
-        "claude-4-5-opus-medium": "claude-opus-4-5-thinking",
-        "gemini-3-pro-preview": "gemini-3-pro",
-        "gpt-5-2-high-reasoning": "gpt-5-2",
-        "gpt-5-1-codex-medium-reasoning": "gpt-5-1-codex",
-        "gpt-5-1-medium-reasoning": "gpt-5-1",
-        "gpt-5-medium-reasoning": "gpt-5-medium",
-        "deepseek-v3-2-reasoner": "deepseek-v3-2-reasoning",
-        "gpt-5-mini-medium-reasoning": "gpt-5-mini-medium",
-        "glm-4-6-t-1": "glm-4-6",
-        "kimi-k2-instruct": "kimi-k2-0905",
-        "gpt-5-nano-medium-reasoning": "gpt-5-nano-medium",
-        "llama-4-maverick-instruct": "llama-4-maverick",
-        "llama-4-scout-instruct": "llama-4-scout",
-        "devstral": "devstral-2"
+SWE_LITE_META = {
+        **SWE_META,
+        "name": "SWE-bench Lite",
+        "description": "A curated subset of 300 self-contained SWE-bench tasks focused on functional bug fixes, making evaluation cheaper while keeping the real world GitHub setting",
+        "link": "https://www.swebench.com/lite.html",
         }
 
-def slugify(text):
-    if not text: return "unknown" 
-    text = text.lower()
-    text = re.sub(r'[^a-z0-9]+','-',text)
-    return text.strip('-').strip('.')
-
-def clean_model_date(name):
-    # Clean the date after the model name
-    return re.sub(r'\s*\(\d+(?:-\d+)*\)','',name).strip()
-
-def load_json_safe(path):
-    if path.exists():
-        try:
-            with open(path, "r", encoding='utf-8') as f:
-                return json.load(f)
-        except: return {}
-    return {}
-
-def save_json(path,data):
-    path.parent.mkdir(parents=True, exist_ok = True)
-    with open(path,"w",encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
-
-def fetch_swe_html(url):
-    print(f"Fetching SWE information from {url}")
-    try:
-        with sync_playwright() as p:
-            # Launch the chromium
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-
-            # Wait the page for <table>
-            page.goto(url, wait_until='domcontentloaded')
-            page.wait_for_selector('table',timeout=60000)
+SWE_MULTIMODAL_META = {
+        **SWE_META,
+        "name": "SWE-bench Multimodal",
+        "description": "SWE-bench tasks from visual, user-facing JavaScript repositories where issues include screenshots or other images that the model has to understand to produce a working patch",
+        "link": "https://www.swebench.com/multimodal.html",
+        "tags": ["Coding", "Agent", "Multi-Modal"],
+        }
 
-            # Get the HTML with <table>
-            html_content = page.content()
+# Every leaderboard is a page of swebench.com, scraped in parallel tabs. Each
+# one is expected to have the table layout of index.html; one that fails to
+# load or doesn't parse is skipped and the others still update.
+SWE_LEADERBOARDS = {
+        "swe_bash_only": {"page": "index.html", "meta": SWE_META},
+        "swe_verified": {"page": "verified.html", "meta": SWE_VERIFIED_META},
+        "swe_lite": {"page": "lite.html", "meta": SWE_LITE_META},
+        "swe_multimodal": {"page": "multimodal.html", "meta": SWE_MULTIMODAL_META},
+        }
 
-            # Close chromium
-            browser.close()
+def swe_jobs(base_url=SWE_BASE_URL):
+    return [
+            (base_url + board["page"], EXTRACT_MODE, SCRAPE_PROFILE)
+            for board in SWE_LEADERBOARDS.values()
+            ]
 
-        return html_content
+def fetch_swe_leaderboards(base_url=SWE_BASE_URL):
+    print(f"Fetching {len(SWE_LEADERBOARDS)} SWE leaderboards from {base_url}")
+    try:
+        with stage("fetch", source="swe"):
+            results = fetch_pool(swe_jobs(base_url), return_exceptions=True)
     except Exception as e:
         print(f"Network Error: {e}")
         sys.exit(1)
 
-def parse_html(html_content):
-    soup = BeautifulSoup(html_content, 'html.parser')
-
-    target_table = soup.find('table')
-    if not target_table:
-        print("Could not find the result table")
-        sys.exit(1)
+    return dict(zip(SWE_LEADERBOARDS, results))
 
+def parse_rows(rows):
     print("Found target table. Parsing ...")
 
     results = []
 
-    rows = target_table.find('tbody').find_all('tr')
     for row in rows:
         # There will be an empty <tr>, so exlude it
-        if 'no-results' in row.get('class', []):
+        if 'no-results' in row['classes']:
             continue
 
         # Directly get publisher name from data-tags
-        data_tags = row.get('data-tags', '')
+        data_tags = row['tags']
         org = None
         model = None
         for part in data_tags.split(','):
             part = part.strip()
             if part.startswith('Org:'):
                 org = part.split(':', 1)[1].strip()
-        
-        # Unify the publisher name
-        if org in PUBLISHER_TABULAR:
-            org = PUBLISHER_TABULAR[org]
 
-        cols = row.find_all('td')
+        cols = row['cells']
         if not cols: continue
+        if len(cols) < 3:
+            raise ValueError(f"expected rank, model and score columns, found {len(cols)} cells")
 
         # Get model name and score from <td>s
-        model = cols[1].get_text(strip=True)
-        score = cols[2].get_text(strip=True)
+        model = cols[1]
+        score = cols[2]
+        try:
+            float(score)
+        except ValueError:
+            raise ValueError(f"score {score!r} of {model!r} is not a number") from None
 
         results.append({
             "model": model,
@@ -144,65 +125,103 @@ def parse_html(html_content):
             "score": score
             })
 
+    if not results:
+        raise ValueError("no leaderboard rows")
     return results
 
-def sync_swe_data():
-    html_content = fetch_swe_html(SWE_URL)
-    results = parse_html(html_content)
+def build_swe_data(rows, index, writer, bench_id="swe_bash_only"):
+    meta = SWE_LEADERBOARDS[bench_id]["meta"]
+    with stage("parse", source=bench_id):
+        results = parse_rows(rows)
+    count("rows_parsed", len(results), source=bench_id)
     
     today_str = datetime.now().strftime("%Y-%m-%d")
     bench_snapshot = []
+    matches = []
 
-    print(f"Processing {len(results)} entries...")
+    print(f"Processing {len(results)} entries for {bench_id}...")
 
-    for item in results:
-        pubName = item['publisher']
-        modelName = item['model']
+    resolver = ModelResolver(index)
+    with stage("resolve", source=bench_id):
+        for item in results:
+            modelName = item['model']
 
-        pubSlug = slugify(pubName)
-        modelSlug = slugify(clean_model_date(modelName))
-        # Fix the name contradiction
-        if modelSlug in MODEL_TABULAR:
-            modelSlug = MODEL_TABULAR[modelSlug]
+            # Publisher names and naming variants go through aliases.json
+            match = resolver.match(modelName, publisher=item['publisher'])
+            matches.append((modelName, match))
+            if match.ref is None:
+                continue
 
-        modelRef = f"{pubSlug}/{modelSlug}"
+            # Add to snapshot
+            bench_snapshot.append(SnapshotEntry(match.ref, float(item["score"])))
 
-        # Add to snapshot
-        bench_snapshot.append({
-            "modelRef": modelRef,
-            "score": float(item["score"])
-            })
+    report_matches(matches, source=bench_id)
 
-    bench_id = "swe_bash_only"
     bench_file = BENCH_DIR / f"{bench_id}.json"
-    existing_bench_data = load_json_safe(bench_file)
-
-    output_data = {
-            "name": SWE_META["name"],
-            "fullName": SWE_META["fullName"],
-            "publisher": SWE_META["publisher"],
-            "description": SWE_META["description"],
-            "link": SWE_META["link"],
-            "tags": SWE_META["tags"],
-            "lastUpdated": today_str,
-            "metrics": SWE_META["metrics"],
-            "trending": existing_bench_data.get("trending", {"view": 0,"initialWeight": 1000}),
-            "snapshot": sorted(bench_snapshot, key=lambda x:x["score"], reverse=True)
-            }
-
-    def get_core_content(data):
-        cp = data.copy()
-
-        return cp.get("snapshot",None)
-
-    if get_core_content(output_data) == get_core_content(existing_bench_data):
-        output_data["lastUpdated"] = existing_bench_data.get("lastUpdated", today_str)
+    existing_bench_data = index.get_benchmark(bench_id) or {}
+
+    output_data = Benchmark(
+            name=meta["name"],
+            fullName=meta["fullName"],
+            publisher=meta["publisher"],
+            description=meta["description"],
+            link=meta["link"],
+            tags=meta["tags"],
+            lastUpdated=today_str,
+            metrics=meta["metrics"],
+            trending=existing_bench_data.get("trending", {"views": 0,"initialWeight": 1000}),
+            snapshot=sorted(bench_snapshot, key=lambda x:x.score, reverse=True)
+            )
+
+    if output_data.snapshot == existing_bench_data.get("snapshot"):
+        output_data.lastUpdated = existing_bench_data.get("lastUpdated", today_str)
     else:
         print(f"Update occurs for {bench_id}")
 
 
-    save_json(bench_file, output_data)
+    writer.write(bench_file, output_data)
+    index.add_benchmark(bench_id, output_data)
+
+def build_swe_leaderboards(leaderboards, index, writer):
+    # `leaderboards` maps bench ids to their rows, or to the exception that
+    # stopped them loading. Returns how many were built.
+    built = 0
+    for bench_id, rows in leaderboards.items():
+        try:
+            if isinstance(rows, Exception):
+                raise rows
+            build_swe_data(rows, index, writer, bench_id)
+        except Exception as e:
+            # The benchmark keeps its current content
+            print(f"Skipping {bench_id}: {e}")
+            count("leaderboards_failed", source=bench_id)
+            continue
+        built += 1
+    return built
+
+def sync_swe_data(base_url=SWE_BASE_URL, prometheus=None):
+    start_run("sync_swe_data", prometheus)
+    leaderboards = fetch_swe_leaderboards(base_url)
+
+    index = ContentIndex(MODELS_DIR, PUB_DIR, BENCH_DIR)
+    writer = ContentWriter()
+    if not build_swe_leaderboards(leaderboards, index, writer):
+        print("Error: No SWE leaderboard could be synced")
+        sys.exit(1)
+
+    stats = build_model_stats(index, writer)
+    build_search_index(index, stats, writer)
+    build_leaderboard_views(index, writer)
+    with stage("validate"):
+        check_writes(writer, index)
+    with stage("write"):
+        count_files(writer.commit())
+    record_history(index)
+    finish_run()
     print("SWE-bench information sync completed")
     
 if __name__ == "__main__":
-    sync_swe_data()
+    # Same as `benchai.py sync swe`
+    from benchai import main
+
+    sys.exit(main(["sync", "swe", *sys.argv[1:]]))
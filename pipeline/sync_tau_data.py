@@ -1,16 +1,24 @@
-import json
-import os
-import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
-import requests
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+from content_index import ContentIndex
+from content_records import Benchmark, SnapshotEntry
+from content_validator import check_writes
+from content_writer import ContentWriter
+from leaderboard_views import build_leaderboard_views
+from model_resolver import ModelResolver, report_matches
+from model_stats import build_model_stats
+from run_report import count, count_files, finish_run, stage, start_run
+from score_history import record_history
+from scraper import fetch_rows
+from search_index import build_search_index
 
 TAU_URL = "http://taubench.com/#leaderboard"
-HEADERS = { "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}
+# "dom" extracts the rows inside the browser, "soup" parses the page with BeautifulSoup
+EXTRACT_MODE = "dom"
+# Overrides for scraper.DEFAULT_PROFILE
+SCRAPE_PROFILE = {"timeout": 30000, "retries": 2}
 
 CURRENT_SCRIPT_PATH = Path(__file__).resolve()
 AGENT_DIR = CURRENT_SCRIPT_PATH.parent
@@ -30,156 +38,117 @@ TAU_META = {
         "metrics": {"unit": "pass@1(%)", "isBetterHigher": True},
         }
 
-MODEL_TABULAR = {
-        "gemini-3-0-pro": "gemini-3-pro",
-        "claude-sonnet-4-5": "claude-4-5-sonnet",
-        "qwen3-max-thinkingnew": "qwen3-max-thinking",
-        "qwen3-max-thinking-preview": "qwen3-max-thinking"
-        }
-
-def slugify(text):
-    if not text: return "unknown" 
-    text = text.lower()
-    text = re.sub(r'[^a-z0-9]+','-',text)
-    return text.strip('-').strip('.')
-
-def clean_model_date(name):
-    # Clean the date after the model name
-    return re.sub(r'\s*\(\d+(?:-\d+)*\)','',name).strip()
-
-def load_json_safe(path):
-    if path.exists():
-        try:
-            with open(path, "r", encoding='utf-8') as f:
-                return json.load(f)
-        except: return {}
-    return {}
-
-def save_json(path,data):
-    path.parent.mkdir(parents=True, exist_ok = True)
-    with open(path,"w",encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
-
-def fetch_tau_html(url):
+def fetch_tau_rows(url, mode=EXTRACT_MODE, profile=SCRAPE_PROFILE):
     print(f"Fetching Tau information from {url}")
     try:
-        with sync_playwright() as p:
-            # Launch the chromium
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-
-            # Wait the page for <table>
-            page.goto(url, wait_until='domcontentloaded')
-            page.wait_for_selector('table',timeout=60000)
-
-            # Get the HTML with <table>
-            html_content = page.content()
-
-            # Close chromium
-            browser.close()
-
-        return html_content
+        with stage("fetch", source="tau"):
+            return fetch_rows(url, mode, profile)
     except Exception as e:
         print(f"Network Error: {e}")
         sys.exit(1)
 
-def parse_html(html_content):
-    soup = BeautifulSoup(html_content, 'html.parser')
-
-    target_table = soup.find('table')
-    if not target_table:
-        print("Could not find the result table")
-        sys.exit(1)
-
+def parse_rows(rows):
     print("Found target table. Parsing ...")
 
     results = []
 
-    rows = target_table.find('tbody').find_all('tr')
     for row in rows:
-        cols = row.find_all('td')
+        cols = row['cells']
         if not cols: continue
+        if len(cols) < 5:
+            raise ValueError(f"expected model and score columns, found {len(cols)} cells")
 
         # Get model name and socre from <td>'s
-        model = cols[1].get_text(strip=True)
-        score = cols[4].get_text(strip=True).replace('%','')
+        model = cols[1]
+        score = cols[4].replace('%','')
+        try:
+            float(score)
+        except ValueError:
+            raise ValueError(f"score {score!r} of {model!r} is not a number") from None
 
         results.append({
             "model": model,
             "score": score
             })
 
+    if not results:
+        raise ValueError("no leaderboard rows")
     return results
 
-def find_model_vendor(model_name, base_dir):
-    base = Path(base_dir)
-
-    matches = list(base.rglob(f"{model_name}.json"))
-    if matches:
-        path = matches[0]
-        publisher = path.parent.name
-        return publisher
-
-    return None
-
-def sync_tau_data():
-    html_content = fetch_tau_html(TAU_URL)
-    results = parse_html(html_content)
+def build_tau_data(rows, index, writer):
+    bench_id = "τ-bench"
+    with stage("parse", source=bench_id):
+        results = parse_rows(rows)
+    count("rows_parsed", len(results), source=bench_id)
     
     today_str = datetime.now().strftime("%Y-%m-%d")
     bench_snapshot = []
+    matches = []
 
     print(f"Processing {len(results)} entries...")
 
-    for item in results:
-        modelName = item['model']
-
-        modelSlug = slugify(clean_model_date(modelName))
+    resolver = ModelResolver(index)
+    with stage("resolve", source=bench_id):
+        for item in results:
+            modelName = item['model']
 
-        # Fix the name contradiction
-        if modelSlug in MODEL_TABULAR:
-            modelSlug = MODEL_TABULAR[modelSlug]
+            # Naming variants go through aliases.json
+            match = resolver.match(modelName)
+            matches.append((modelName, match))
+            if match.ref is None:
+                continue
 
-        pubSlug = find_model_vendor(modelSlug,MODELS_DIR)
+            # Add to snapshot
+            bench_snapshot.append(SnapshotEntry(match.ref, float(item["score"])))
 
-        modelRef = f"{pubSlug}/{modelSlug}"
+    report_matches(matches, source=bench_id)
 
-        # Add to snapshot
-        bench_snapshot.append({
-            "modelRef": modelRef,
-            "score": float(item["score"])
-            })
-
-    bench_id = "τ-bench"
     bench_file = BENCH_DIR / f"{bench_id}.json"
-    existing_bench_data = load_json_safe(bench_file)
-
-    output_data = {
-            "name": TAU_META["name"],
-            "fullName": TAU_META["fullName"],
-            "publisher": TAU_META["publisher"],
-            "description": TAU_META["description"],
-            "link": TAU_META["link"],
-            "tags": TAU_META["tags"],
-            "lastUpdated": today_str,
-            "metrics": TAU_META["metrics"],
-            "trending": existing_bench_data.get("trending", {"view": 0,"initialWeight": 1000}),
-            "snapshot": sorted(bench_snapshot, key=lambda x:x["score"], reverse=True)
-            }
-
-    def get_core_content(data):
-        cp = data.copy()
-
-        return cp.get("snapshot",None)
-
-    if get_core_content(output_data) == get_core_content(existing_bench_data):
-        output_data["lastUpdated"] = existing_bench_data.get("lastUpdated", today_str)
+    existing_bench_data = index.get_benchmark(bench_id) or {}
+
+    output_data = Benchmark(
+            name=TAU_META["name"],
+            fullName=TAU_META["fullName"],
+            publisher=TAU_META["publisher"],
+            description=TAU_META["description"],
+            link=TAU_META["link"],
+            tags=TAU_META["tags"],
+            lastUpdated=today_str,
+            metrics=TAU_META["metrics"],
+            trending=existing_bench_data.get("trending", {"views": 0,"initialWeight": 1000}),
+            snapshot=sorted(bench_snapshot, key=lambda x:x.score, reverse=True)
+            )
+
+    if output_data.snapshot == existing_bench_data.get("snapshot"):
+        output_data.lastUpdated = existing_bench_data.get("lastUpdated", today_str)
     else:
         print(f"Update occurs for {bench_id}")
 
 
-    save_json(bench_file, output_data)
+    writer.write(bench_file, output_data)
+    index.add_benchmark(bench_id, output_data)
+
+def sync_tau_data(url=TAU_URL, prometheus=None):
+    start_run("sync_tau_data", prometheus)
+    rows = fetch_tau_rows(url)
+
+    index = ContentIndex(MODELS_DIR, PUB_DIR, BENCH_DIR)
+    writer = ContentWriter()
+    build_tau_data(rows, index, writer)
+
+    stats = build_model_stats(index, writer)
+    build_search_index(index, stats, writer)
+    build_leaderboard_views(index, writer)
+    with stage("validate"):
+        check_writes(writer, index)
+    with stage("write"):
+        count_files(writer.commit())
+    record_history(index)
+    finish_run()
     print("τ-bench information sync completed")
     
 if __name__ == "__main__":
-    sync_tau_data()
+    # Same as `benchai.py sync tau`
+    from benchai import main
+
+    sys.exit(main(["sync", "tau", *sys.argv[1:]]))
@@ -0,0 +1,23 @@
+import threading
+
+import pytest
+
+from fixture_server import make_server
+
+
+@pytest.fixture
+def fixture_server():
+    # start(**options) -> base URL of a fixture_server.py on a free port
+    servers = []
+
+    def start(**options):
+        server = make_server(0, **options)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        host, port = server.server_address
+        return f"http://{host}:{port}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
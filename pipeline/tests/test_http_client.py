@@ -0,0 +1,62 @@
+import time
+
+import pytest
+import requests
+
+from fixture_server import FixtureHandler
+from http_cache import ResponseCache, conditional_download
+from http_client import HttpClient
+
+PATH = "/aa/models.json"
+
+
+def test_retries_failed_requests(fixture_server):
+    base_url = fixture_server(fail_every=2)
+    with HttpClient(retries=2, backoff=0) as client:
+        assert client.get(base_url + PATH).status_code == 200
+        # The second request fails and its retry, the third, goes through
+        assert client.get(base_url + PATH).status_code == 200
+    assert FixtureHandler.requests == 3
+
+
+def test_returns_last_failure_when_retries_run_out(fixture_server):
+    base_url = fixture_server(fail_every=1, fail_status=502)
+    with HttpClient(retries=2, backoff=0) as client:
+        assert client.get(base_url + PATH).status_code == 502
+    assert FixtureHandler.requests == 3
+
+
+def test_waits_for_retry_after(fixture_server):
+    base_url = fixture_server(fail_every=2, fail_status=429, retry_after=1)
+    with HttpClient(retries=1, backoff=0) as client:
+        client.get(base_url + PATH)
+        start = time.monotonic()
+        assert client.get(base_url + PATH).status_code == 200
+        assert time.monotonic() - start >= 1
+    assert FixtureHandler.requests == 3
+
+
+def test_conditional_get_keeps_cached_body(fixture_server, tmp_path, capsys):
+    base_url = fixture_server()
+    cache = ResponseCache(tmp_path)
+    with HttpClient(retries=0) as client:
+        path = conditional_download(base_url + PATH, {}, cache, client=client)
+        body = path.read_bytes()
+        etag = cache.load_meta(base_url + PATH)["etag"]
+        assert etag
+
+        assert conditional_download(base_url + PATH, {}, cache, client=client) == path
+        assert "Not modified" in capsys.readouterr().out
+        assert path.read_bytes() == body
+
+        response = client.get(base_url + PATH, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+    assert FixtureHandler.requests == 3
+
+
+def test_retries_timeouts_then_raises(fixture_server):
+    base_url = fixture_server(delay=500)
+    with HttpClient(timeout=(1, 0.1), retries=1, backoff=0) as client:
+        with pytest.raises(requests.Timeout):
+            client.get(base_url + PATH)
+    assert FixtureHandler.requests == 2
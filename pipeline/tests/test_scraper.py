@@ -0,0 +1,166 @@
+import asyncio
+
+import pytest
+
+import sync_swe_data
+import sync_tau_data
+from fixture_server import FixtureHandler
+from scraper import fetch_pool, fetch_rows, open_browser
+
+TAU_PATH = "/tau.html"
+SWE_PATH = "/swe/verified.html"
+
+# Short enough for the failing pages, the fixture rows arrive within a second
+QUICK = {"timeout": 3000, "retries": 0}
+
+TAU_ROWS = [
+    ["1", "Gemini 3.0 Pro", "90.7%", "73.0%", "85.4%"],
+    ["2", "Claude Sonnet 4.5", "86.2%", "70.0%", "84.7%"],
+    ["3", "GPT-5", "81.1%", "62.6%", "80.0%"],
+    ["4", "Qwen3 Max Thinking Preview", "74.6%", "58.0%", "71.2%"],
+]
+
+
+def row(cells, classes=(), tags=""):
+    return {"classes": list(classes), "tags": tags, "cells": cells}
+
+
+@pytest.fixture(scope="module")
+def chromium():
+    # The scraper tests need `uv run playwright install chromium`
+    from playwright.async_api import Error as PlaywrightError
+
+    async def launch():
+        async with open_browser():
+            pass
+
+    try:
+        asyncio.run(launch())
+    except PlaywrightError as e:
+        pytest.skip(f"Chromium does not launch: {e.message.splitlines()[0]}")
+
+
+def test_extracts_rows(fixture_server, chromium):
+    base_url = fixture_server()
+    rows = fetch_rows(base_url + TAU_PATH, "dom", QUICK)
+    assert rows == [row(cells) for cells in TAU_ROWS]
+
+
+def test_soup_mode_extracts_the_same_rows(fixture_server, chromium):
+    base_url = fixture_server()
+    jobs = [(base_url + TAU_PATH, "dom", QUICK), (base_url + TAU_PATH, "soup", QUICK)]
+    dom_rows, soup_rows = fetch_pool(jobs)
+    assert soup_rows == dom_rows
+
+
+def test_waits_for_rows_to_settle(fixture_server, chromium):
+    # The SWE fixture adds its rows two at a time, 300ms apart
+    base_url = fixture_server()
+    rows = fetch_rows(base_url + SWE_PATH, "dom", QUICK)
+    assert rows[0] == row(["No results"], classes=["no-results"])
+    assert len(rows) == 7
+    assert rows[-1] == row(
+        ["6", "Not A Real Model", "5.00"], tags="Org: Unknown Lab, Open: false"
+    )
+
+
+def test_times_out_when_no_rows_show_up(fixture_server, chromium):
+    base_url = fixture_server()
+    with pytest.raises(TimeoutError):
+        fetch_rows(base_url + "/missing.html", "dom", QUICK)
+
+
+def test_retries_failed_renders(fixture_server, chromium, capsys):
+    base_url = fixture_server(fail_every=2)
+    fetch_rows(base_url + TAU_PATH, "dom", QUICK)
+    # The second page load gets a 503 without a table, its retry goes through
+    rows = fetch_rows(base_url + TAU_PATH, "dom", {**QUICK, "retries": 1})
+    assert rows == [row(cells) for cells in TAU_ROWS]
+    assert "Retrying" in capsys.readouterr().out
+    assert FixtureHandler.requests == 3
+
+
+def test_raises_when_retries_run_out(fixture_server, chromium):
+    base_url = fixture_server(fail_every=1)
+    with pytest.raises(TimeoutError):
+        fetch_rows(base_url + TAU_PATH, "dom", {**QUICK, "retries": 1})
+    assert FixtureHandler.requests == 2
+
+
+def test_pool_keeps_job_order_and_failures(fixture_server, chromium):
+    base_url = fixture_server()
+    jobs = [
+        (base_url + "/missing.html", "dom", QUICK),
+        (base_url + TAU_PATH, "dom", QUICK),
+    ]
+    missing, tau = fetch_pool(jobs, size=2, return_exceptions=True)
+    assert isinstance(missing, TimeoutError)
+    assert tau == [row(cells) for cells in TAU_ROWS]
+
+
+def test_parses_scraped_leaderboards(fixture_server, chromium):
+    base_url = fixture_server()
+    tau_job = (base_url + TAU_PATH, sync_tau_data.EXTRACT_MODE, QUICK)
+    swe_jobs = [
+        (url, mode, QUICK)
+        for url, mode, _ in sync_swe_data.swe_jobs(base_url + "/swe/")
+    ]
+    tau_rows, *swe_boards = fetch_pool([tau_job, *swe_jobs])
+
+    assert sync_tau_data.parse_rows(tau_rows)[0] == {
+        "model": "Gemini 3.0 Pro",
+        "score": "85.4",
+    }
+    for rows in swe_boards:
+        results = sync_swe_data.parse_rows(rows)
+        assert len(results) == 6
+        assert results[0]["model"] == "Claude 4.5 Opus medium (20251101)"
+        assert results[0]["publisher"] == "Anthropic"
+
+
+def test_parses_tau_rows():
+    rows = [row(cells) for cells in TAU_ROWS] + [row([])]
+    assert sync_tau_data.parse_rows(rows) == [
+        {"model": "Gemini 3.0 Pro", "score": "85.4"},
+        {"model": "Claude Sonnet 4.5", "score": "84.7"},
+        {"model": "GPT-5", "score": "80.0"},
+        {"model": "Qwen3 Max Thinking Preview", "score": "71.2"},
+    ]
+
+
+@pytest.mark.parametrize(
+    "rows, message",
+    [
+        ([row(["1", "GPT-5", "80.0%"])], "expected model and score columns"),
+        ([row(["1", "GPT-5", "81.1%", "62.6%", "n/a"])], "is not a number"),
+        ([row([])], "no leaderboard rows"),
+    ],
+)
+def test_rejects_bad_tau_rows(rows, message):
+    with pytest.raises(ValueError, match=message):
+        sync_tau_data.parse_rows(rows)
+
+
+def test_parses_swe_rows():
+    rows = [
+        row(["No results"], classes=["no-results"]),
+        row(["1", "Kimi K2 Instruct", "65.80"], tags="Org: Moonshot AI, Open: true"),
+        row(["2", "Mystery Model", "12.50"]),
+    ]
+    assert sync_swe_data.parse_rows(rows) == [
+        {"model": "Kimi K2 Instruct", "publisher": "Moonshot AI", "score": "65.80"},
+        {"model": "Mystery Model", "publisher": None, "score": "12.50"},
+    ]
+
+
+@pytest.mark.parametrize(
+    "rows, message",
+    [
+        ([row(["1", "Kimi K2 Instruct"])], "expected rank, model and score columns"),
+        ([row(["1", "Kimi K2 Instruct", "-"])], "is not a number"),
+        ([row(["No results"], classes=["no-results"])], "no leaderboard rows"),
+    ],
+)
+def test_rejects_bad_swe_rows(rows, message):
+    with pytest.raises(ValueError, match=message):
+        sync_swe_data.parse_rows(rows)
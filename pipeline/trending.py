@@ -0,0 +1,286 @@
+import calendar
+import gzip
+import hashlib
+import json
+import mmap
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from content_index import ContentIndex
+from content_validator import check_writes
+from content_writer import ContentWriter, atomic_write
+from run_report import count, finish_run, stage, start_run
+
+CURRENT_SCRIPT_PATH = Path(__file__).resolve()
+AGENT_DIR = CURRENT_SCRIPT_PATH.parent
+PROJECT_ROOT = AGENT_DIR.parent
+
+MODELS_DIR = PROJECT_ROOT / "src" / "content" / "models"
+BENCH_DIR = PROJECT_ROOT / "src" / "content" / "benchmarks"
+PUB_DIR = PROJECT_ROOT / "src" / "content" / "publishers"
+STATE_FILE = AGENT_DIR / ".cache" / "trending_state.json"
+
+# A view counts half as much after this many days
+HALF_LIFE_DAYS = 7.0
+# Bytes at the start of a log that identify it, so a rotated file is reread.
+# A shorter log is identified by all of it, and the state records how much.
+HEAD_BYTES = 256
+READ_BUFFER = 1 << 20
+
+# Only lines mentioning a benchmark page are parsed at all
+PAGE_MARKER = b"/benchmarks/"
+BENCH_PATH = re.compile(r"^/benchmarks/([^/]+)/?$")
+BOT_AGENT = re.compile(r"bot|crawl|spider|slurp|preview|monitor", re.IGNORECASE)
+# Apache/nginx common and combined log formats
+ACCESS_LINE = re.compile(
+    r'^\S+ \S+ \S+ \[([^\]]+)\] "(\S+) (\S+)[^"]*" (\d{3}) \S+(?: "[^"]*" "([^"]*)")?'
+)
+MONTHS = {
+    name: i
+    for i, name in enumerate(
+        "Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split(), start=1
+    )
+}
+
+
+def parse_time(value):
+    # Epoch seconds from epoch seconds/milliseconds or an ISO 8601 string
+    if isinstance(value, (int, float)):
+        return value / 1000 if value > 1e11 else float(value)
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def parse_json_line(line):
+    # Vercel log drains and similar: the request is either at the top level
+    # or under "proxy" / "request"
+    entry = json.loads(line)
+    request = entry.get("proxy") or entry.get("request") or entry
+    agent = request.get("userAgent") or request.get("user_agent") or ""
+    if isinstance(agent, list):
+        agent = " ".join(agent)
+    return (
+        parse_time(entry.get("timestamp") or request.get("timestamp")),
+        request.get("method", "GET"),
+        request.get("path", ""),
+        int(request.get("statusCode") or request.get("status") or 200),
+        agent,
+    )
+
+
+def access_time(stamp):
+    # Epoch seconds of "10/Oct/2025:13:55:36 +0200". Split by hand, strptime
+    # would take most of the scan.
+    day, month, rest = stamp.split("/", 2)
+    year, hour, minute, rest = rest.split(":", 3)
+    second, zone = rest.split(" ")
+    offset = int(zone[1:3]) * 3600 + int(zone[3:5]) * 60
+    fields = (int(year), MONTHS[month], int(day), int(hour), int(minute), int(second))
+    return calendar.timegm(fields) - (offset if zone[0] == "+" else -offset)
+
+
+def parse_access_line(line):
+    m = ACCESS_LINE.match(line)
+    if not m:
+        return None
+    stamp, method, target, status, agent = m.groups()
+    return (
+        access_time(stamp),
+        method,
+        target,
+        int(status),
+        agent or "",
+    )
+
+
+def page_view(line):
+    # (epoch seconds, benchmark id) of a successful human benchmark page view
+    if PAGE_MARKER not in line:
+        return None
+    try:
+        text = line.decode("utf-8").strip()
+        parsed = (
+            parse_json_line(text) if text.startswith("{") else parse_access_line(text)
+        )
+    except (ValueError, TypeError, AttributeError, KeyError):
+        return None
+    if parsed is None:
+        return None
+
+    timestamp, method, target, status, agent = parsed
+    if method != "GET" or not 200 <= status < 300 or BOT_AGENT.search(agent):
+        return None
+    m = BENCH_PATH.match(urlsplit(target).path)
+    if not m:
+        return None
+    return timestamp, unquote(m.group(1))
+
+
+def log_head(path, size=HEAD_BYTES):
+    # (bytes read, sha1) of the first `size` bytes, fewer if the log is shorter
+    with open_log(path) as f:
+        head = f.read(size)
+    return len(head), hashlib.sha1(head).hexdigest()
+
+
+def same_log(path, saved):
+    # Whether the log still starts with the head saved for it. Only that many
+    # bytes are compared, so a log that was shorter then and grew since is
+    # still the same file.
+    if not saved.get("head"):
+        return False
+    size = saved.get("head_bytes", HEAD_BYTES)
+    return log_head(path, size) == (size, saved["head"])
+
+
+@contextmanager
+def open_log(path, use_mmap=False):
+    # Plain or gzip files, optionally memory-mapped. Offsets always count
+    # uncompressed bytes.
+    path = Path(path)
+    if path.suffix == ".gz":
+        with gzip.open(path, "rb") as f:
+            yield f
+    elif use_mmap and path.stat().st_size:
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as m:
+            yield m
+    else:
+        with open(path, "rb", buffering=READ_BUFFER) as f:
+            yield f
+
+
+def scan_log(path, offset, add, use_mmap=False):
+    # Call add(epoch seconds, benchmark id) for every view from `offset` on and
+    # return the offset reached. A trailing line without a newline is still
+    # being written, so it is left for the next run.
+    with open_log(path, use_mmap) as f:
+        f.seek(offset)
+        for line in iter(f.readline, b""):
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            view = page_view(line)
+            if view is not None:
+                add(*view)
+    return offset
+
+
+def decay(value, seconds, half_life_days):
+    return value * 0.5 ** (max(seconds, 0) / (half_life_days * 86400))
+
+
+def load_state(path=STATE_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def aggregate(
+    logs,
+    known,
+    state=None,
+    now=None,
+    half_life_days=HALF_LIFE_DAYS,
+    use_mmap=False,
+):
+    # Decayed views of the `known` benchmark ids as of `now`, continuing from a
+    # saved state: its totals are decayed to `now` and each log is read from
+    # its saved offset. Memory is one float per benchmark whatever the logs.
+    # Totals decayed with another half-life can't be carried over, so then
+    # every log is read again from the start.
+    now = time.time() if now is None else now
+    state = state or {}
+    if state.get("half_life_days", half_life_days) != half_life_days:
+        print(
+            f"Half-life changed from {state['half_life_days']} to "
+            f"{half_life_days} days, rereading all logs"
+        )
+        state = {}
+    previous = state.get("files", {})
+
+    views = {
+        bench_id: decay(value, now - state["as_of"], half_life_days)
+        for bench_id, value in state.get("views", {}).items()
+        if bench_id in known
+    }
+    files = {}
+
+    for path in logs:
+        key = str(Path(path).resolve())
+        saved = previous.get(key, {})
+        offset = saved.get("offset", 0) if same_log(path, saved) else 0
+        counted = 0
+
+        def add(timestamp, bench_id):
+            nonlocal counted
+            if bench_id in known:
+                views[bench_id] = views.get(bench_id, 0.0) + decay(
+                    1.0, now - timestamp, half_life_days
+                )
+                counted += 1
+
+        offset = scan_log(path, offset, add, use_mmap)
+        count("page_views", counted, source=Path(path).name)
+        head_bytes, head = log_head(path)
+        files[key] = {"offset": offset, "head": head, "head_bytes": head_bytes}
+
+    # Logs not given this time keep their offsets for a later run
+    return {
+        "as_of": now,
+        "half_life_days": half_life_days,
+        "views": views,
+        "files": {**previous, **files},
+    }
+
+
+def apply_trending(index, writer, views):
+    # Write the decayed views into every benchmark's `trending`, keeping its
+    # initialWeight
+    for bench_id, bench in index.benchmarks.items():
+        old = bench.get("trending") or {}
+        trending = {
+            "views": round(views.get(bench_id, 0.0)),
+            "initialWeight": old.get("initialWeight", 0),
+        }
+        if trending != old:
+            bench.trending = trending
+            writer.write(BENCH_DIR / f"{bench_id}.json", bench)
+
+
+def update_trending(
+    logs,
+    full=False,
+    use_mmap=False,
+    half_life_days=HALF_LIFE_DAYS,
+    state_file=STATE_FILE,
+):
+    start_run("trending")
+    index = ContentIndex(MODELS_DIR, PUB_DIR, BENCH_DIR)
+    state = {} if full else load_state(state_file)
+    with stage("trending"):
+        state = aggregate(
+            logs,
+            set(index.benchmarks),
+            state,
+            half_life_days=half_life_days,
+            use_mmap=use_mmap,
+        )
+
+    writer = ContentWriter()
+    apply_trending(index, writer, state["views"])
+    check_writes(writer, index)
+    writer.commit()
+
+    atomic_write(Path(state_file), json.dumps(state, indent=4).encode("utf-8"))
+    top = sorted(state["views"].items(), key=lambda x: -x[1])[:5]
+    print(
+        "Trending: " + ", ".join(f"{bench_id} {value:.0f}" for bench_id, value in top)
+    )
+    finish_run()
@@ -19,16 +19,17 @@ import {
 } from "lucide-react";
 import clsx from "clsx";
 import { BENCH_CATEGORIES } from "../consts";
+import { loadHeadToHead, type HeadToHead } from "../utils/headToHead";
+import { loadScores, type ModelScores } from "../utils/modelCards";
 
 interface ModelData {
   id: string;
+  // Number of the model in model-index.json
+  n: number;
   name: string;
   publisherColor: string;
   publisherName: string;
   publisherLogo: string;
-  averageScore: number;
-  radar: { subject: string; A: number }[];
-  scores: Record<string, number>;
 }
 
 interface BenchmarkMeta {
@@ -47,6 +48,10 @@ export default function ModelComparator({ allModels, benchmarkMeta }: Props) {
   const [selectedIds, setSelectedIds] = useState<string[]>([]);
   const [isPanelOpen, setIsPanelOpen] = useState(false);
   const [searchTerm, setSearchTerm] = useState("");
+  const [headToHead, setHeadToHead] = useState<
+    Map<string, Map<string, HeadToHead>>
+  >(new Map());
+  const [scores, setScores] = useState<Map<number, ModelScores>>(new Map());
 
   // Initialization: Read Props from URL
   useEffect(() => {
@@ -72,6 +77,20 @@ export default function ModelComparator({ allModels, benchmarkMeta }: Props) {
     window.history.replaceState({}, "", url);
   }, [selectedIds]);
 
+  // Precomputed by the pipeline, only the selected models' rows are fetched
+  useEffect(() => {
+    if (selectedIds.length < 2) return;
+    let cancelled = false;
+    loadHeadToHead(selectedIds)
+      .then((rows) => {
+        if (!cancelled) setHeadToHead(rows);
+      })
+      .catch(() => {});
+    return () => {
+      cancelled = true;
+    };
+  }, [selectedIds]);
+
   const toggleModel = (id: string) => {
     if (selectedIds.includes(id)) {
       setSelectedIds((prev) => prev.filter((i) => i !== id));
@@ -86,6 +105,23 @@ export default function ModelComparator({ allModels, benchmarkMeta }: Props) {
     return selectedIds.map((id) => allModels.find((m) => m.id === id)!);
   }, [selectedIds, allModels]);
 
+  // Fetch the scores of the selected models that aren't loaded yet
+  useEffect(() => {
+    const missing = selectedModels
+      .map((m) => m.n)
+      .filter((n) => !scores.has(n));
+    if (missing.length === 0) return;
+    let current = true;
+    loadScores(missing)
+      .then((loaded) => {
+        if (current) setScores((scores) => new Map([...scores, ...loaded]));
+      })
+      .catch((e) => console.error(e));
+    return () => {
+      current = false;
+    };
+  }, [selectedModels, scores]);
+
   // Options based on search
   const filteredOptions = useMemo(() => {
     return allModels.filter(
@@ -106,12 +142,20 @@ export default function ModelComparator({ allModels, benchmarkMeta }: Props) {
     return BENCH_CATEGORIES.map((category) => {
       const point: any = { subject: category, fullMark: 100 };
       selectedModels.forEach((m) => {
-        const item = m.radar.find((r) => r.subject === category);
-        point[m.name] = item ? item.A : 0;
+        point[m.name] = scores.get(m.n)?.categories[category] ?? 0;
       });
       return point;
     });
-  }, [selectedModels]);
+  }, [selectedModels, scores]);
+
+  const pairs = useMemo(() => {
+    return selectedModels.flatMap((a, i) =>
+      selectedModels.slice(i + 1).flatMap((b) => {
+        const result = headToHead.get(a.id)?.get(b.id);
+        return result ? [{ a, b, result }] : [];
+      }),
+    );
+  }, [selectedModels, headToHead]);
 
   const legendTextSize = selectedModels.length > 5 ? "text-[10px]" : "text-xs";
   const legendIconSize = selectedModels.length > 5 ? "w-2 h-2" : "w-3 h-3";
@@ -356,13 +400,15 @@ export default function ModelComparator({ allModels, benchmarkMeta }: Props) {
                           </span>
                         </td>
                         {selectedModels.map((m) => {
-                          const score = m.scores[bench.id];
+                          const score = scores.get(m.n)?.benchmarks[bench.id];
                           // Calculate the maximum
                           const rowScores = selectedModels.map(
-                            (sm) => sm.scores[bench.id] || 0,
+                            (sm) =>
+                              scores.get(sm.n)?.benchmarks[bench.id] || 0,
                           );
                           const maxScore = Math.max(...rowScores);
-                          const isWinner = score === maxScore && score > 0;
+                          const isWinner =
+                            score === maxScore && (score ?? 0) > 0;
 
                           return (
                             <td key={m.id} className="px-6 py-4 text-center">
@@ -389,6 +435,73 @@ export default function ModelComparator({ allModels, benchmarkMeta }: Props) {
                 </table>
               </div>
             </div>
+
+            {/* Head to head */}
+            {pairs.length > 0 && (
+              <div className="bg-white rounded-3xl shadow-sm border border-slate-200 overflow-hidden flex flex-col">
+                <div className="p-6 border-b border-slate-100">
+                  <h3 className="text-lg font-bold text-slate-900">
+                    Head to Head
+                  </h3>
+                </div>
+                <div className="overflow-x-auto">
+                  <table className="min-w-full text-left text-sm whitespace-nowrap">
+                    <thead>
+                      <tr className="bg-slate-50 border-b border-slate-200">
+                        <th className="px-6 py-4 font-black text-slate-500 uppercase tracking-wider">
+                          Matchup
+                        </th>
+                        <th className="px-6 py-4 font-bold text-center">
+                          Shared
+                        </th>
+                        <th className="px-6 py-4 font-bold text-center">
+                          W / T / L
+                        </th>
+                        <th className="px-6 py-4 font-bold text-center">
+                          Mean Δ
+                        </th>
+                      </tr>
+                    </thead>
+                    <tbody className="divide-y divide-slate-100">
+                      {pairs.map(({ a, b, result }) => (
+                        <tr
+                          key={`${a.id}:${b.id}`}
+                          className="hover:bg-slate-50 transition-colors"
+                        >
+                          <td className="px-6 py-4 font-bold text-slate-700">
+                            {a.name}
+                            <span className="text-slate-400 font-normal">
+                              {" vs "}
+                            </span>
+                            {b.name}
+                          </td>
+                          <td className="px-6 py-4 text-center font-mono text-slate-600">
+                            {result.shared}
+                          </td>
+                          <td className="px-6 py-4 text-center font-mono text-slate-600">
+                            {result.shared
+                              ? `${result.wins} / ${result.ties} / ${result.losses}`
+                              : "N/A"}
+                          </td>
+                          <td
+                            className={clsx(
+                              "px-6 py-4 text-center font-mono",
+                              result.delta > 0
+                                ? "text-black font-bold"
+                                : "text-slate-600",
+                            )}
+                          >
+                            {result.shared
+                              ? `${result.delta > 0 ? "+" : ""}${result.delta.toFixed(2)}`
+                              : "N/A"}
+                          </td>
+                        </tr>
+                      ))}
+                    </tbody>
+                  </table>
+                </div>
+              </div>
+            )}
           </>
         )}
       </div>
@@ -1,71 +1,50 @@
 import { useState, useMemo, useEffect } from "react";
 import { BENCH_CATEGORIES } from "../consts";
+import { loadCards, type ModelCard } from "../utils/modelCards";
+import { queryModelNumbers, type SearchIndex } from "../utils/searchIndex";
 
-export interface RadarData {
-  subject: string;
-  A: number;
-  fullMark: 100;
-}
-export interface ModelIndexItem {
-  id: string;
-  name: string;
-  publisher: PublisherInfo;
-  averageScore: number;
-  radarData: RadarData[];
-  releaseDate?: string;
-  params?: string;
-}
 export interface PublisherInfo {
   name: string;
   logo: string;
 }
 
 interface Props {
-  models: ModelIndexItem[];
   publishers: PublisherInfo[];
+  searchIndex: SearchIndex;
+  // [model number, card] of the models on the first page
+  initialCards: (readonly [number, ModelCard])[];
 }
 
-const ITEMS_PER_PAGE = 18;
+export const ITEMS_PER_PAGE = 18;
 
-export default function ModelFilterableList({ models, publishers }: Props) {
+export default function ModelFilterableList({
+  publishers,
+  searchIndex,
+  initialCards,
+}: Props) {
   const [searchTerm, setSearchTerm] = useState("");
   const [selectedPublisher, setSelectedPublisher] = useState("All");
   const [selectedTag, setSelectedTag] = useState("All");
   const [sortType, setSortType] = useState<"score" | "date">("score");
   const [currentPage, setCurrentPage] = useState(1);
+  const [cards, setCards] = useState(() => new Map(initialCards));
 
-  const filteredModels = useMemo(() => {
-    return models
-      .filter((model) => {
-        // Search term filter
-        const matchSearch = model.name
-          .toLowerCase()
-          .includes(searchTerm.toLowerCase());
-        const matchPublisher =
-          selectedPublisher === "All" ||
-          model.publisher.name === selectedPublisher;
-        return matchSearch && matchPublisher;
-      })
-      .sort((a, b) => {
-        if (sortType === "score") {
-          if (selectedTag === "All") {
-            return b.averageScore - a.averageScore;
-          } else {
-            return (
-              (b.radarData.find((r) => r.subject === selectedTag)?.A ?? 0) -
-              (a.radarData.find((r) => r.subject === selectedTag)?.A ?? 0)
-            );
-          }
-        } else {
-          if (!a.releaseDate) return 1;
-          if (!b.releaseDate) return -1;
-          return (
-            new Date(b.releaseDate).getTime() -
-            new Date(a.releaseDate).getTime()
-          );
-        }
-      });
-  }, [models, searchTerm, selectedPublisher, sortType, selectedTag]);
+  const logos = useMemo(
+    () => new Map(publishers.map((p) => [p.name, p.logo])),
+    [publishers],
+  );
+
+  // The prebuilt index answers the query, so nothing is scanned or sorted here
+  const filteredModels = useMemo(
+    () =>
+      queryModelNumbers(searchIndex, {
+        term: searchTerm,
+        publisher: selectedPublisher,
+        sort:
+          sortType === "date" || selectedTag === "All" ? sortType : selectedTag,
+      }),
+    [searchIndex, searchTerm, selectedPublisher, sortType, selectedTag],
+  );
 
   // Back to page 1 when filter condition changes
   useEffect(() => {
@@ -74,11 +53,26 @@ export default function ModelFilterableList({ models, publishers }: Props) {
 
   const totalPages = Math.ceil(filteredModels.length / ITEMS_PER_PAGE);
   const startIndex = (currentPage - 1) * ITEMS_PER_PAGE;
-  const currentModels = filteredModels.slice(
-    startIndex,
-    startIndex + ITEMS_PER_PAGE,
+  const currentModels = useMemo(
+    () => filteredModels.slice(startIndex, startIndex + ITEMS_PER_PAGE),
+    [filteredModels, startIndex],
   );
 
+  // Fetch the cards of the page that aren't loaded yet
+  useEffect(() => {
+    const missing = currentModels.filter((n) => !cards.has(n));
+    if (missing.length === 0) return;
+    let current = true;
+    loadCards(missing)
+      .then((loaded) => {
+        if (current) setCards((cards) => new Map([...cards, ...loaded]));
+      })
+      .catch((e) => console.error(e));
+    return () => {
+      current = false;
+    };
+  }, [currentModels, cards]);
+
   const handlePageChange = (page: number) => {
     setCurrentPage(page);
     document
@@ -196,37 +190,46 @@ export default function ModelFilterableList({ models, publishers }: Props) {
 
       {/** Model list */}
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6 mb-5">
-        {currentModels.map((model) => (
-          <a
-            key={model.id}
-            href={`/models/${model.id}`}
-            className="group block bg-white border border-slate-200 rounded-xl p-3 hover:border-indigo-400 hover:shadow-md transition-all relative overflow-hidden"
-          >
-            <div className="flex justify-between items-start mb-4 relative z-10">
-              <div>
-                <h3 className="font-bold text-lg text-slate-900 group-hover:text-indigo-600 transition-colors">
-                  {model.name}
-                </h3>
-                <div className="inline-flex justify-center bg-slate-100 px-2 py-1 rounded mt-1 gap-1">
-                  <img src={model.publisher.logo} className="w-4 h-4"></img>
-                  <div className="text-xs font-bold text-slate-500 ">
-                    {model.publisher.name}
-                  </div>
+        {currentModels.map((n) => {
+          const card = cards.get(n);
+          return (
+            <a
+              key={searchIndex.ids[n]}
+              href={`/models/${searchIndex.ids[n]}`}
+              className="group block bg-white border border-slate-200 rounded-xl p-3 hover:border-indigo-400 hover:shadow-md transition-all relative overflow-hidden"
+            >
+              <div className="flex justify-between items-start mb-4 relative z-10">
+                <div>
+                  <h3 className="font-bold text-lg text-slate-900 group-hover:text-indigo-600 transition-colors">
+                    {searchIndex.names[n]}
+                  </h3>
+                  {card && (
+                    <div className="inline-flex justify-center bg-slate-100 px-2 py-1 rounded mt-1 gap-1">
+                      <img
+                        src={logos.get(card.publisher)}
+                        className="w-4 h-4"
+                      ></img>
+                      <div className="text-xs font-bold text-slate-500 ">
+                        {card.publisher}
+                      </div>
+                    </div>
+                  )}
+                </div>
+                <div className="bg-indigo-50 text-indigo-700 font-black text-xl px-3 py-2 rounded-lg">
+                  {!card
+                    ? "…"
+                    : selectedTag === "All"
+                      ? card.averageScore
+                      : (card.scores[selectedTag] ?? 0)}
                 </div>
               </div>
-              <div className="bg-indigo-50 text-indigo-700 font-black text-xl px-3 py-2 rounded-lg">
-                {selectedTag === "All"
-                  ? model.averageScore
-                  : (model.radarData.find((r) => r.subject === selectedTag)
-                      ?.A ?? 0)}
+              <div className="flex justify-between items-center text-xs font-mono text-slate-400 mt-4 relative z-10">
+                <span>{card?.params || "N/A"}</span>
+                <span>{card?.releaseDate || "N/A"}</span>
               </div>
-            </div>
-            <div className="flex justify-between items-center text-xs font-mono text-slate-400 mt-4 relative z-10">
-              <span>{model.params || "N/A"}</span>
-              <span>{model.releaseDate || "N/A"}</span>
-            </div>
-          </a>
-        ))}
+            </a>
+          );
+        })}
       </div>
       {filteredModels.length === 0 && (
         <div className="col-span-full text-center py-20 text-slate-400">
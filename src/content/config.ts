@@ -1,5 +1,5 @@
 import { defineCollection, reference } from "astro:content";
-import { glob } from 'astro/loaders';
+import { file, glob } from 'astro/loaders';
 import { z } from "astro/zod";
 
 const benchmarks = defineCollection({
@@ -51,6 +51,49 @@ const publishers = defineCollection({
   })
 });
 
+// Precomputed by pipeline/model_stats.py after every sync, keyed by model id
+const modelStats = defineCollection({
+  loader: file("./src/content/model-stats.json"),
+  schema: z.object({
+    totalBenchmarks: z.number(),
+    averageScore: z.number(),
+    rank: z.number().nullable(),
+    radarData: z.array(z.object({
+      subject: z.string(),
+      A: z.number(),
+      fullMark: z.literal(100),
+    })),
+    participatedBenchmarks: z.array(z.object({
+      id: z.string(),
+      name: z.string(),
+      score: z.number(),
+      tags: z.array(z.string()),
+      rank: z.number(),
+    })),
+  }),
+});
+
+// Precomputed by pipeline/leaderboard_views.py, one joined leaderboard per
+// benchmark id, best first
+const leaderboards = defineCollection({
+  loader: glob({ pattern: "*.json", base: "./src/content/leaderboards" }),
+  schema: z.object({
+    inputs: z.string(),
+    rows: z.array(z.object({
+      rank: z.number(),
+      modelId: z.string(),
+      model: z.string(),
+      score: z.number(),
+      releaseDate: z.string().optional(),
+      publisherInfo: z.object({
+        name: z.string(),
+        color: z.string(),
+        logo: z.string(),
+      }).nullable(),
+    })),
+  }),
+});
+
 const benchmarkDocs = defineCollection({
     loader: glob({ pattern: "**/*.{md,mdx}", base: "./src/content/benchmark-docs" }),
 })
@@ -59,5 +102,7 @@ export const collections = {
   'benchmarks': benchmarks,
   'models': models,
   'publishers': publishers,
+  'model-stats': modelStats,
+  'leaderboards': leaderboards,
   'benchmark-docs': benchmarkDocs,
 }
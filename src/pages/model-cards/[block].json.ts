@@ -0,0 +1,22 @@
+import type { APIRoute } from "astro";
+import { getModelCard } from "../../utils/analytics";
+import { CARD_BLOCK } from "../../utils/modelCards";
+// Written by pipeline/search_index.py with model-stats.json
+import searchIndex from "../../content/model-index.json";
+
+// One file per CARD_BLOCK models of the index, in index order
+export async function getStaticPaths() {
+  const blocks = Math.ceil(searchIndex.ids.length / CARD_BLOCK);
+  return Array.from({ length: blocks }, (_, block) => ({
+    params: { block: String(block) },
+  }));
+}
+
+export const GET: APIRoute = async ({ params }) => {
+  const start = Number(params.block) * CARD_BLOCK;
+  const ids = searchIndex.ids.slice(start, start + CARD_BLOCK);
+  const cards = await Promise.all(ids.map(getModelCard));
+  return new Response(JSON.stringify(cards), {
+    headers: { "Content-Type": "application/json" },
+  });
+};
@@ -1,5 +1,6 @@
-import { getCollection } from "astro:content";
+import { getEntry } from "astro:content";
 import { BENCH_CATEGORIES } from "../consts";
+import type { ModelCard, ModelScores } from "./modelCards";
 
 export interface RadarDataPoint {
   subject: string;
@@ -11,89 +12,72 @@ export interface ModelStats {
   modelId: string;
   totalBenchmarks: number;
   averageScore: number;
+  // Rank by average score among models with results, null when it has none
+  rank: number | null;
   radarData: RadarDataPoint[];
   participatedBenchmarks: Array<{
     id: string;
     name: string;
     score: number;
     tags: string[];
+    rank: number;
   }>;
 }
 
 export async function getModelStats(
   targetModelId: string,
 ): Promise<ModelStats> {
-  // Get all benchmarks
-  const allBenchmarks = await getCollection("benchmarks");
+  // Stats are precomputed by the pipeline (pipeline/model_stats.py), so this is
+  // a single lookup instead of a scan over every benchmark snapshot
+  const entry = await getEntry("model-stats", targetModelId);
 
-  // Store the score with respect to benchmarks like {"Reasoning": [80,90], "Coding": [70]}
-  const categoryScores: Record<string, number[]> = {};
-  for (const cat of BENCH_CATEGORIES) {
-    categoryScores[cat] = [];
-  }
-
-  const participatedBenchmarks: ModelStats["participatedBenchmarks"] = [];
-
-  let totalScoreSum = 0;
-  let count = 0;
-
-  for (const bench of allBenchmarks) {
-    // Try to find the score for the model in `bench`
-    const result = bench.data.snapshot.find(
-      (r) => r.modelRef.id === targetModelId,
-    );
-
-    if (result) {
-      const score = result.score;
-
-      // Record the score
-      totalScoreSum += score;
-      count++;
-
-      // Record the benchmark for model
-      participatedBenchmarks.push({
-        id: bench.id,
-        name: bench.data.name,
-        score: score,
-        tags: bench.data.tags,
-      });
-
-      // Record the score with respect to tag
-      for (const tag of bench.data.tags) {
-        if (tag in categoryScores) {
-          categoryScores[tag].push(score);
-        }
-      }
-    }
+  if (!entry) {
+    return {
+      modelId: targetModelId,
+      totalBenchmarks: 0,
+      averageScore: 0,
+      rank: null,
+      radarData: BENCH_CATEGORIES.map((category) => ({
+        subject: category,
+        A: 0,
+        fullMark: 100,
+      })),
+      participatedBenchmarks: [],
+    };
   }
 
-  // Compute average score for tag
-  // Turn { "Reasoning": [80,90] } into { subject: "Math", A:85, fullMark: 100 }
-  const radarData: RadarDataPoint[] = BENCH_CATEGORIES.map((category) => {
-    const scores = categoryScores[category];
+  return {
+    modelId: targetModelId,
+    ...entry.data,
+  };
+}
 
-    let avg = 0;
-    if (scores.length > 0) {
-      const sum = scores.reduce((a, b) => a + b, 0);
-      avg = Math.round(sum / scores.length);
-    }
+// A model as the model list shows it, see utils/modelCards.ts
+export async function getModelCard(modelId: string): Promise<ModelCard> {
+  const model = await getEntry("models", modelId);
+  if (!model) throw new Error(`Unknown model: ${modelId}`);
+  const stats = await getModelStats(modelId);
+  const publisher = await getEntry(model.data.publisher);
 
-    return {
-      subject: category,
-      A: avg,
-      fullMark: 100,
-    };
-  });
+  return {
+    publisher: publisher.data.name,
+    averageScore: stats.averageScore,
+    scores: Object.fromEntries(stats.radarData.map((r) => [r.subject, r.A])),
+    params: model.data.params,
+    releaseDate: model.data.releaseDate,
+  };
+}
 
-  const globalAverage = count > 0 ? Math.round(totalScoreSum / count) : 0;
+// A model as the Model Arena compares it, see utils/modelCards.ts
+export async function getModelScores(modelId: string): Promise<ModelScores> {
+  const stats = await getModelStats(modelId);
 
   return {
-    modelId: targetModelId,
-    totalBenchmarks: count,
-    averageScore: globalAverage,
-    radarData: radarData,
-    participatedBenchmarks: participatedBenchmarks.sort(
-      (a, b) => b.score - a.score,
-    ), // Sort the benchmark by score
+    categories: Object.fromEntries(
+      stats.radarData.map((r) => [r.subject, r.A]),
+    ),
+    benchmarks: Object.fromEntries(
+      stats.participatedBenchmarks.map((b) => [b.id, b.score]),
+    ),
   };
 }
@@ -0,0 +1,103 @@
+// Rows of the head-to-head matrix in public/head-to-head, built from the
+// content by `benchai.py head-to-head` when the site builds. Only the rows of
+// the selected models are fetched, with a Range request each.
+
+const BASE = "/head-to-head";
+
+interface Header {
+  models: string[];
+  rowBytes: number;
+  sections: { name: string; type: string; offset: number }[];
+}
+
+export interface HeadToHead {
+  shared: number;
+  wins: number;
+  losses: number;
+  ties: number;
+  // Mean score difference over the shared benchmarks, positive favours the row
+  delta: number;
+}
+
+let header: Promise<Header> | null = null;
+const rows = new Map<string, Promise<Map<string, HeadToHead>>>();
+// The first row request; the others wait for it to learn whether the server
+// honours Range
+let firstRow: Promise<ArrayBuffer> | null = null;
+// All of rows.bin, once a server has sent it in place of a range
+let whole: Promise<ArrayBuffer> | null = null;
+
+function loadHeader(): Promise<Header> {
+  header ??= fetch(`${BASE}/models.json`).then((r) => r.json());
+  return header;
+}
+
+async function fetchRow(start: number, length: number): Promise<ArrayBuffer> {
+  if (firstRow) await firstRow.catch(() => {});
+  if (whole) return (await whole).slice(start, start + length);
+
+  const request = fetch(`${BASE}/rows.bin`, {
+    headers: { Range: `bytes=${start}-${start + length - 1}` },
+  }).then(async (response) => {
+    if (!response.ok) {
+      throw new Error(`head-to-head row: HTTP ${response.status}`);
+    }
+    if (response.status === 206) return response.arrayBuffer();
+    // A server without range support sends the whole file, which is kept
+    // for the other rows instead of being downloaded again
+    whole = response.arrayBuffer();
+    whole.catch(() => (whole = null));
+    return (await whole).slice(start, start + length);
+  });
+  firstRow ??= request;
+  return request;
+}
+
+async function loadRow(id: string): Promise<Map<string, HeadToHead>> {
+  const { models, rowBytes, sections } = await loadHeader();
+  const i = models.indexOf(id);
+  const row = new Map<string, HeadToHead>();
+  if (i < 0) return row;
+
+  const buffer = await fetchRow(i * rowBytes, rowBytes);
+
+  const n = models.length;
+  const at = (name: string) => sections.find((s) => s.name === name)!.offset;
+  const delta = new Float32Array(buffer, at("delta"), n);
+  const shared = new Uint16Array(buffer, at("shared"), n);
+  const wins = new Uint16Array(buffer, at("wins"), n);
+  const losses = new Uint16Array(buffer, at("losses"), n);
+
+  models.forEach((other, k) => {
+    row.set(other, {
+      shared: shared[k],
+      wins: wins[k],
+      losses: losses[k],
+      ties: shared[k] - wins[k] - losses[k],
+      delta: delta[k],
+    });
+  });
+  return row;
+}
+
+// Each selected model against the others: result.get(a)?.get(b)
+export async function loadHeadToHead(
+  ids: string[],
+): Promise<Map<string, Map<string, HeadToHead>>> {
+  const loaded = await Promise.all(
+    ids.map((id) => {
+      if (!rows.has(id)) {
+        // Forget failures, so a later selection tries again
+        rows.set(
+          id,
+          loadRow(id).catch((e) => {
+            rows.delete(id);
+            throw e;
+          }),
+        );
+      }
+      return rows.get(id)!;
+    }),
+  );
+  return new Map(ids.map((id, i) => [id, loaded[i]]));
+}
@@ -0,0 +1,77 @@
+// Per-model data the pages fetch on demand, beyond the names in
+// model-index.json. src/pages/model-cards/[block].json.ts and
+// src/pages/model-scores/[block].json.ts serve it in blocks of CARD_BLOCK
+// models, numbered as in the index, and a page fetches only the blocks of the
+// models it shows.
+
+export const CARD_BLOCK = 64;
+
+// What the model list shows on a card
+export interface ModelCard {
+  publisher: string;
+  averageScore: number;
+  // Category -> score
+  scores: Record<string, number>;
+  params?: string;
+  releaseDate?: string;
+}
+
+// What the Model Arena compares
+export interface ModelScores {
+  // Category -> score, as on the radar chart
+  categories: Record<string, number>;
+  // Benchmark id -> score, only the benchmarks the model has one for
+  benchmarks: Record<string, number>;
+}
+
+const blocks = new Map<string, Promise<unknown[]>>();
+
+function loadBlock(kind: string, block: number): Promise<unknown[]> {
+  const url = `/${kind}/${block}.json`;
+  if (!blocks.has(url)) {
+    blocks.set(
+      url,
+      fetch(url)
+        .then((response) => {
+          if (!response.ok) {
+            throw new Error(`${kind}: HTTP ${response.status}`);
+          }
+          return response.json();
+        })
+        .catch((e) => {
+          // Forget failures, so the next page tries again
+          blocks.delete(url);
+          throw e;
+        }),
+    );
+  }
+  return blocks.get(url)!;
+}
+
+async function loadModels<T>(
+  kind: string,
+  numbers: number[],
+): Promise<Map<number, T>> {
+  const block = (n: number) => Math.floor(n / CARD_BLOCK);
+  const needed = [...new Set(numbers.map(block))];
+  const loaded = new Map(
+    await Promise.all(
+      needed.map(async (b) => [b, await loadBlock(kind, b)] as const),
+    ),
+  );
+  return new Map(
+    numbers.map((n) => [n, loaded.get(block(n))![n % CARD_BLOCK] as T]),
+  );
+}
+
+// The cards of the given model numbers
+export function loadCards(numbers: number[]): Promise<Map<number, ModelCard>> {
+  return loadModels<ModelCard>("model-cards", numbers);
+}
+
+// The scores of the given model numbers
+export function loadScores(
+  numbers: number[],
+): Promise<Map<number, ModelScores>> {
+  return loadModels<ModelScores>("model-scores", numbers);
+}
@@ -0,0 +1,88 @@
+// Queries over src/content/model-index.json, built by pipeline/search_index.py
+// after every sync. Models are numbered by their position in `ids`.
+
+export interface SearchIndex {
+  gram: number;
+  ids: string[];
+  names: string[];
+  // Lowercase substring -> model numbers, each stored as the gap to the last
+  grams: Record<string, number[]>;
+  // Publisher name -> bitset of its models, in 32-bit words
+  publishers: Record<string, number[]>;
+  // "score", "date" and every category -> model numbers, best first
+  order: Record<string, number[]>;
+}
+
+export interface ModelQuery {
+  term: string;
+  publisher: string; // "All" for every publisher
+  sort: string; // a key of `order`
+}
+
+function allBits(size: number): Uint32Array {
+  const bits = new Uint32Array(Math.ceil(size / 32)).fill(0xffffffff);
+  if (size % 32) bits[bits.length - 1] = (1 << size % 32) - 1;
+  return bits;
+}
+
+function postingBits(gaps: number[] | undefined, size: number): Uint32Array {
+  const bits = new Uint32Array(Math.ceil(size / 32));
+  let n = 0;
+  for (const gap of gaps ?? []) {
+    n += gap;
+    bits[n >> 5] |= 1 << (n & 31);
+  }
+  return bits;
+}
+
+function intersect(bits: Uint32Array, other: ArrayLike<number>) {
+  for (let i = 0; i < bits.length; i++) bits[i] &= other[i];
+}
+
+function has(bits: Uint32Array, n: number): boolean {
+  return (bits[n >> 5] & (1 << (n & 31))) !== 0;
+}
+
+function searchBits(index: SearchIndex, term: string): Uint32Array {
+  const size = index.ids.length;
+  const query = term.toLowerCase();
+  if (!query) return allBits(size);
+  // Every substring this short is in the index, so its postings are exact
+  if (query.length <= index.gram) return postingBits(index.grams[query], size);
+
+  const bits = allBits(size);
+  for (let i = 0; i + index.gram <= query.length; i++) {
+    const gram = query.slice(i, i + index.gram);
+    intersect(bits, postingBits(index.grams[gram], size));
+  }
+  // Sharing every gram doesn't make it a substring, check the candidates
+  for (let n = 0; n < size; n++) {
+    if (!has(bits, n)) continue;
+    const slug = index.ids[n].split("/").pop() ?? "";
+    if (
+      !index.names[n].toLowerCase().includes(query) &&
+      !slug.toLowerCase().includes(query)
+    ) {
+      bits[n >> 5] &= ~(1 << (n & 31));
+    }
+  }
+  return bits;
+}
+
+// Numbers of the matching models in the order asked for
+export function queryModelNumbers(
+  index: SearchIndex,
+  query: ModelQuery,
+): number[] {
+  const bits = searchBits(index, query.term);
+  if (query.publisher !== "All") {
+    intersect(bits, index.publishers[query.publisher] ?? []);
+  }
+  const order = index.order[query.sort] ?? index.order.score;
+  return order.filter((n) => has(bits, n));
+}
+
+// Ids of the matching models in the order asked for
+export function queryModels(index: SearchIndex, query: ModelQuery): string[] {
+  return queryModelNumbers(index, query).map((n) => index.ids[n]);
+}